@@ -0,0 +1,49 @@
+"""
+Import-time budget check for the selenium MCP server.
+
+Run from the project root:
+    python benchmarks/check_import_time.py
+    python benchmarks/check_import_time.py --budget 0.8 --runs 5
+
+Imports `mcp_server_selenium` in fresh interpreters and exits with status 1 if
+the best import time exceeds the budget, or if importing the package loaded a
+module that must only be imported on first use (selenium,
+undetected_chromedriver, websocket-client). tests/test_import_time.py runs
+the deferred-module check (not the time budget) under pytest, using the same
+probe (benchmarks/import_probe.py).
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from import_probe import deferred_modules_loaded, measure_once  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=float, default=1.0, help="Maximum import time in seconds (default: 1.0)")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to try; the best run counts (default: 3)")
+    args = parser.parse_args()
+
+    runs = [measure_once() for _ in range(args.runs)]
+    best = min(run["seconds"] for run in runs)
+    loaded = deferred_modules_loaded(module for run in runs for module in run["modules"])
+
+    print(f"import mcp_server_selenium: best {best:.3f}s over {args.runs} runs (budget {args.budget:.3f}s)")
+    failed = False
+    if loaded:
+        print(f"FAIL: modules that should be imported on first use were loaded at startup: {', '.join(loaded)}")
+        failed = True
+    if best > args.budget:
+        print(f"FAIL: import time {best:.3f}s exceeds the budget of {args.budget:.3f}s")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+Synthetic pages for the tool benchmarks, served from a local HTTP server.
+
+Every page shares the same small set of landmark elements (a heading, a
+button, an input, a few list items and a localStorage-friendly origin) so one
+list of tool invocations can run against all of them; the pages differ in
+what surrounds those landmarks:
+
+- small:          just the landmarks
+- dom_10k:        landmarks plus ~10,000 extra DOM nodes
+- dom_100k:       landmarks plus ~100,000 extra DOM nodes
+- iframes:        landmarks plus three iframes with their own button
+- heavy_css:      landmarks plus 2,000 CSS rules with shadows, filters and gradients
+- chatty_network: landmarks plus 200 fetch() calls and console messages after load
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Tuple
+
+LANDMARKS = """
+<h1 id="title" class="heading">Benchmark fixture</h1>
+<button id="go" class="btn primary" onclick="document.getElementById('title').textContent='clicked'">Click me</button>
+<input id="name" name="name" type="text" placeholder="Your name">
+<ul id="items">
+  <li class="item">Item one</li>
+  <li class="item">Item two</li>
+  <li class="item">Item three</li>
+</ul>
+"""
+
+
+def _page(body: str, head: str = "") -> str:
+    return f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>fixture</title>{head}</head><body>{LANDMARKS}{body}</body></html>"
+
+
+def _grid(nodes: int) -> str:
+    """Rows of one div and nine spans, i.e. ten nodes per row."""
+    row = "<div class='row'>" + "".join(f"<span class='cell c{i}'>{i}</span>" for i in range(9)) + "</div>"
+    return "<div id='grid'>" + row * (nodes // 10) + "</div>"
+
+
+def small() -> str:
+    return _page("")
+
+
+def dom_10k() -> str:
+    return _page(_grid(10_000))
+
+
+def dom_100k() -> str:
+    return _page(_grid(100_000))
+
+
+def iframes() -> str:
+    frames = "".join(
+        f"<iframe id='frame{i}' name='frame{i}' src='/frame?i={i}' width='400' height='200'></iframe>"
+        for i in range(1, 4)
+    )
+    return _page(frames)
+
+
+def frame() -> str:
+    return "<!DOCTYPE html><html><body><p class='inner'>Inside frame</p><button id='inner-go'>Inner button</button></body></html>"
+
+
+def heavy_css() -> str:
+    rules = "\n".join(
+        f".styled-{i} {{ box-shadow: 0 {i % 7}px {i % 13}px rgba(0,0,0,.{i % 9 + 1}); "
+        f"filter: blur({i % 3}px) saturate({100 + i % 50}%); "
+        f"background: linear-gradient({i % 360}deg, #{i % 4096:03x}, #fff); "
+        f"transform: rotate({i % 5}deg); border-radius: {i % 20}px; }}"
+        for i in range(2000)
+    )
+    elements = "".join(f"<div class='styled-{i}'>styled {i}</div>" for i in range(2000))
+    return _page(elements, head=f"<style>{rules}\n.btn {{ padding: 8px 16px; color: #fff; background: #36c; }}</style>")
+
+
+def chatty_network() -> str:
+    script = """
+<script>
+  for (let i = 0; i < 200; i++) {
+    fetch('/api/ping?i=' + i).then(r => r.json()).then(d => console.log('ping', d.i));
+  }
+  console.warn('chatty page loaded');
+  console.error('synthetic error for log filtering');
+</script>
+"""
+    return _page(script)
+
+
+PAGES: Dict[str, Callable[[], str]] = {
+    "small": small,
+    "dom_10k": dom_10k,
+    "dom_100k": dom_100k,
+    "iframes": iframes,
+    "heavy_css": heavy_css,
+    "chatty_network": chatty_network,
+}
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    # Pages are generated once per server and reused for every request
+    cache: Dict[str, bytes] = {}
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        name = path.strip("/")
+        if name == "api/ping":
+            self._send(b'{"i": "%s"}' % query.partition("=")[2].encode(), "application/json")
+        elif name == "frame":
+            self._send(frame().encode(), "text/html")
+        elif name in PAGES:
+            if name not in self.cache:
+                self.cache[name] = PAGES[name]().encode()
+            self._send(self.cache[name], "text/html")
+        else:
+            self.send_error(404)
+
+    def _send(self, body: bytes, content_type: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output readable
+
+
+def serve_fixtures(host: str = "127.0.0.1") -> Tuple[ThreadingHTTPServer, str]:
+    """Start the fixture server on a free port and return it with its base URL."""
+    server = ThreadingHTTPServer((host, 0), _FixtureHandler)
+    threading.Thread(target=server.serve_forever, name="fixture-server", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
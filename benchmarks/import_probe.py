@@ -0,0 +1,45 @@
+"""
+Fresh-interpreter import probe shared by benchmarks/check_import_time.py and
+tests/test_import_time.py.
+
+`measure_once()` imports `mcp_server_selenium` in a new interpreter (so
+nothing is cached from the caller) and reports how long the import took and
+which modules it loaded.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from typing import Iterable, List
+
+# Modules that tools and drivers import lazily; none may be loaded at startup
+DEFERRED_MODULES = ("selenium", "undetected_chromedriver", "websocket")
+
+PROBE = """
+import json, sys, time, warnings
+warnings.simplefilter("ignore")
+start = time.perf_counter()
+import mcp_server_selenium
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def measure_once() -> dict:
+    """Import the package in a fresh interpreter and return its timing and loaded modules."""
+    env = os.environ.copy()
+    src_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+    env["PYTHONPATH"] = src_dir + os.pathsep + env.get("PYTHONPATH", "")
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE], capture_output=True, text=True, env=env, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def deferred_modules_loaded(modules: Iterable[str]) -> List[str]:
+    """Return the DEFERRED_MODULES (and their submodules) found in modules."""
+    return sorted({
+        module for module in modules
+        if any(module == name or module.startswith(name + ".") for name in DEFERRED_MODULES)
+    })
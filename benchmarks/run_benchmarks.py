@@ -0,0 +1,265 @@
+"""
+Tool latency benchmarks for the selenium MCP server.
+
+Run from the project root (needs Chrome and network access for the first
+chromedriver download):
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --runs 10 --cases small,dom_100k --output report.json
+    python benchmarks/run_benchmarks.py --baseline previous.json
+
+Serves the synthetic pages from fixtures.py on a local HTTP server, starts a
+headless Chrome on a throwaway profile and lets the server's driver attach to
+it, then calls every tool in `tools/` against every page (the iframes page
+also gets the in_iframe_id / in_iframe_name variants). For each
+(page, tool) pair the report records wall-clock latency and the number of
+WebDriver HTTP commands per call. With --baseline, the mean latency and
+command count of each pair are compared against an earlier report.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import PAGES, serve_fixtures  # noqa: E402
+
+# (label, tool name, arguments); "{url}" in an argument is replaced by the page URL
+TOOL_CALLS = [
+    ("navigate", "navigate", {"url": "{url}"}),
+    ("check_page_ready", "check_page_ready", {}),
+    ("take_screenshot", "take_screenshot", {"save_path": "{tmp}/screenshot.png"}),
+    ("get_an_element/id", "get_an_element", {"id": "title"}),
+    ("get_an_element/text", "get_an_element", {"text": "Click me", "element_type": "button"}),
+    ("get_an_element/xpath", "get_an_element", {"xpath": "//ul[@id='items']/li[2]"}),
+    ("get_elements/class", "get_elements", {"class_name": "item", "page_size": 3}),
+    ("get_direct_children", "get_direct_children", {"id": "items"}),
+    ("click_to_element", "click_to_element", {"id": "go"}),
+    ("set_value_to_input_element", "set_value_to_input_element", {"id": "name", "input_value": "benchmark"}),
+    ("get_style_an_element", "get_style_an_element", {"id": "go", "all_styles": False}),
+    ("run_javascript_in_console", "run_javascript_in_console", {"javascript_code": "return document.querySelectorAll('*').length"}),
+    ("run_javascript_and_get_console_output", "run_javascript_and_get_console_output", {"javascript_code": "console.log('bench')"}),
+    ("run_cdp_command", "run_cdp_command", {"method": "Performance.getMetrics"}),
+    ("get_console_logs", "get_console_logs", {}),
+    ("get_network_logs", "get_network_logs", {}),
+    ("local_storage_add", "local_storage_add", {"key": "bench", "string_value": "value"}),
+    ("local_storage_read", "local_storage_read", {"key": "bench"}),
+    ("local_storage_read_all", "local_storage_read_all", {}),
+    ("local_storage_remove", "local_storage_remove", {"key": "bench"}),
+    ("local_storage_remove_all", "local_storage_remove_all", {}),
+    ("run_batch", "run_batch", {"steps": [
+        {"tool": "check_page_ready"},
+        {"tool": "get_an_element", "args": {"id": "title"}},
+        {"tool": "get_console_logs"},
+    ]}),
+    ("get_browser_status", "get_browser_status", {}),
+    ("get_browser_resources", "get_browser_resources", {}),
+    ("list_sessions", "list_sessions", {}),
+    ("get_server_stats", "get_server_stats", {}),
+]
+
+# Extra calls for pages whose elements only some pages have, keyed by case
+CASE_TOOL_CALLS = {
+    "iframes": [
+        ("get_an_element/in_iframe_id", "get_an_element", {"id": "inner-go", "in_iframe_id": "frame2"}),
+        ("get_an_element/in_iframe_name", "get_an_element", {"id": "inner-go", "in_iframe_name": "frame3"}),
+        ("get_elements/in_iframe_id", "get_elements", {"class_name": "inner", "in_iframe_id": "frame1"}),
+        ("click_to_element/in_iframe_id", "click_to_element", {"id": "inner-go", "in_iframe_id": "frame1"}),
+        ("click_to_element/in_iframe_name", "click_to_element", {"id": "inner-go", "in_iframe_name": "frame2"}),
+        ("get_style_an_element/in_iframe_name", "get_style_an_element",
+         {"id": "inner-go", "in_iframe_name": "frame3", "all_styles": False}),
+    ],
+}
+
+# Tools needing arguments that only exist at runtime are measured elsewhere
+SKIPPED_TOOLS = {"get_response", "close_session"}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_headless_chrome(chrome: str, user_data_dir: str) -> tuple:
+    """Start headless Chrome with remote debugging and record its port for the driver."""
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            chrome,
+            "--headless=new",
+            f"--remote-debugging-port={port}",
+            f"--user-data-dir={user_data_dir}",
+            "--remote-allow-origins=*",
+            "--no-first-run",
+            "--no-default-browser-check",
+            "--window-size=1280,1024",
+            "about:blank",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=1) as resp:
+                version = json.loads(resp.read()).get("Browser", "")
+            break
+        except OSError:
+            time.sleep(0.2)
+    else:
+        process.kill()
+        raise RuntimeError(f"Chrome did not open its debug port {port} within 30s")
+
+    # NormalChromeDriver attaches to the Chrome recorded in this file
+    with open(os.path.join(user_data_dir, ".selenium_debug_port"), "w") as f:
+        f.write(str(port))
+    return process, version
+
+
+def call_tool(tool_functions: dict, name: str, args: dict):
+    import asyncio
+    import inspect
+
+    fn = tool_functions[name]
+    if inspect.iscoroutinefunction(fn):
+        return asyncio.run(fn(**args))
+    return fn(**args)
+
+
+def fill(value, url: str, tmp: str):
+    if isinstance(value, str):
+        return value.replace("{url}", url).replace("{tmp}", tmp)
+    if isinstance(value, dict):
+        return {k: fill(v, url, tmp) for k, v in value.items()}
+    if isinstance(value, list):
+        return [fill(v, url, tmp) for v in value]
+    return value
+
+
+def benchmark_case(tool_functions: dict, metrics, case: str, url: str, tmp: str, runs: int) -> dict:
+    """Run every tool call (plus the calls specific to case) `runs` times against one page."""
+    results = {}
+    for label, name, args in TOOL_CALLS + CASE_TOOL_CALLS.get(case, []):
+        # Each repetition starts from a freshly loaded page so clicks and
+        # storage writes of earlier runs do not skew later ones
+        latencies, commands, cdp_commands, errors = [], [], [], 0
+        for _ in range(runs):
+            call_tool(tool_functions, "navigate", {"url": url})
+            before = metrics.webdriver_commands_total
+            cdp_before = metrics.cdp_commands_total
+            start = time.perf_counter()
+            try:
+                result = call_tool(tool_functions, name, fill(args, url, tmp))
+                if isinstance(result, str) and result.startswith(("Error", "Failed")):
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+            commands.append(metrics.webdriver_commands_total - before)
+            cdp_commands.append(metrics.cdp_commands_total - cdp_before)
+        results[label] = {
+            "mean_ms": round(statistics.mean(latencies) * 1000, 2),
+            "median_ms": round(statistics.median(latencies) * 1000, 2),
+            "min_ms": round(min(latencies) * 1000, 2),
+            "max_ms": round(max(latencies) * 1000, 2),
+            "webdriver_commands": round(statistics.mean(commands), 2),
+            "cdp_commands": round(statistics.mean(cdp_commands), 2),
+            "errors": errors,
+        }
+        print(f"  {label:<40} {results[label]['mean_ms']:>10.1f} ms {results[label]['webdriver_commands']:>6} cmds"
+              f" {results[label]['cdp_commands']:>6} cdp"
+              + (f"  ({errors} errors)" if errors else ""))
+    return results
+
+
+def compare(report: dict, baseline: dict) -> None:
+    """Print the change in mean latency and command count against a baseline report."""
+    print(f"\nCompared with baseline from {baseline.get('created_at', '?')}:")
+    for case, tools in report["cases"].items():
+        for label, stats in tools.items():
+            old = baseline.get("cases", {}).get(case, {}).get(label)
+            if not old:
+                continue
+            delta = (stats["mean_ms"] - old["mean_ms"]) / old["mean_ms"] * 100 if old["mean_ms"] else 0.0
+            cmd_delta = stats["webdriver_commands"] - old["webdriver_commands"]
+            cdp_delta = stats.get("cdp_commands", 0) - old.get("cdp_commands", 0)
+            if abs(delta) >= 10 or cmd_delta or cdp_delta:
+                print(f"  {case}/{label}: {old['mean_ms']:.1f} -> {stats['mean_ms']:.1f} ms ({delta:+.0f}%), "
+                      f"commands {old['webdriver_commands']} -> {stats['webdriver_commands']}, "
+                      f"CDP commands {old.get('cdp_commands', 0)} -> {stats.get('cdp_commands', 0)}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Calls per tool and page (default: 5)")
+    parser.add_argument("--cases", default=",".join(PAGES), help=f"Comma-separated pages to run (default: {','.join(PAGES)})")
+    parser.add_argument("--chrome", default="google-chrome-stable", help="Chrome executable (default: google-chrome-stable)")
+    parser.add_argument("--output", default="benchmark-report.json", help="Where to write the JSON report (default: benchmark-report.json)")
+    parser.add_argument("--baseline", help="Earlier report to compare against")
+    args = parser.parse_args()
+
+    cases = [c for c in args.cases.split(",") if c]
+    unknown = [c for c in cases if c not in PAGES]
+    if unknown:
+        parser.error(f"Unknown cases: {', '.join(unknown)}")
+
+    import mcp_server_selenium  # noqa: F401  (registers the tools)
+    from mcp_server_selenium import server
+    from mcp_server_selenium.metrics import metrics
+
+    missing = sorted(set(server.tool_functions) - {name for _, name, _ in TOOL_CALLS} - SKIPPED_TOOLS)
+    if missing:
+        print(f"Warning: tools without a benchmark: {', '.join(missing)}")
+
+    tmp = tempfile.mkdtemp(prefix="selenium-mcp-bench-")
+    user_data_dir = os.path.join(tmp, "profile")
+    os.makedirs(user_data_dir)
+    fixture_server, base_url = serve_fixtures()
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": args.runs,
+        "cases": {},
+    }
+    chrome = None
+    try:
+        chrome, report["chrome"] = start_headless_chrome(args.chrome, user_data_dir)
+        server.user_data_dir = user_data_dir
+        server.initialize_driver_instance().ensure_driver_initialized()
+        for case in cases:
+            print(f"{case}:")
+            report["cases"][case] = benchmark_case(server.tool_functions, metrics, case, f"{base_url}/{case}", tmp, args.runs)
+    finally:
+        server.quit_driver()
+        if chrome is not None:
+            os.killpg(chrome.pid, signal.SIGTERM)  # Chrome runs in its own process group
+        fixture_server.shutdown()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(report, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,6 +14,9 @@ from .tools import local_storage
 from .tools import element_interaction
 from .tools import script
 from .tools import style
+from .tools import sessions
+from .tools import stats
+from .tools import batch
 
 dictConfig(LOGGING_CONFIG)
 
@@ -21,13 +24,42 @@ logger = logging.getLogger(__name__)
 
 @click.command()
 @click.option("--user_data_dir", "user_data_dir_param", help="Chrome user data directory (default: /tmp/chrome-debug-{timestamp})")
-@click.option("--port", "port_param", type=int, help="Port for Chrome remote debugging (default: 9222)")
+@click.option("--port", "port_param", type=int, help="Port to launch the default Chrome on for remote debugging (default: a free port is reserved)")
 @click.option("--driver", "driver_param", default="normal_chromedriver", 
-              type=click.Choice(["normal_chromedriver", "undetected_chrome_driver"]),
-              help="Type of Chrome driver to use (default: normal_chromedriver)")
+              type=click.Choice(["normal_chromedriver", "cdp_chromedriver", "undetected_chrome_driver"]),
+              help="Type of Chrome driver to use; cdp_chromedriver talks to Chrome over DevTools directly and attaches chromedriver only for element commands (default: normal_chromedriver)")
 @click.option("--profile", "profile_param", default="Default", help="Chrome profile to use (default: Default)")
+@click.option("--health-check-interval", "health_check_interval", default=10.0, type=float, help="Seconds a passed window-health check is trusted before the next tool call probes the window again, 0 probes on every call (default: 10)")
+@click.option("--launch-profile", "launch_profile", default="default", type=click.Choice(["default", "lean"]), help="Chrome flag set for browsers the server launches: default (maximized window, DevTools open) or lean (headless, fixed window size, no background throttling) (default: default)")
+@click.option("--window-size", "window_size", default="", help="Chrome window size as WIDTH,HEIGHT (default: maximized, or 1920,1080 with --launch-profile lean)")
+@click.option("--chrome-arg", "chrome_args", multiple=True, help="Extra flag passed to Chrome at launch, e.g. --chrome-arg=--disable-gpu (repeatable)")
+@click.option("--profile-template", "profile_template_dir", default="", help="Template user data dir cloned into every new user data dir the server creates; built on first use if it does not exist")
+@click.option("--profile-template-url", "profile_template_urls", multiple=True, help="Page loaded while building the --profile-template dir to warm its cache (repeatable)")
+@click.option("--max-browser-rss", "max_browser_rss", default=0, type=int, help="Recycle the browser when its process tree uses more than this many MB of RSS, 0 disables (default: 0)")
+@click.option("--max-browser-cpu", "max_browser_cpu", default=0.0, type=float, help="Recycle the browser when its process tree averages more than this CPU percent over a check interval, 0 disables (default: 0)")
+@click.option("--recycle-action", "recycle_action", default="tab", type=click.Choice(["tab", "restart"]), help="How to recycle a browser over its limits: tab replaces all tabs with a fresh one (restarting Chrome if that is not enough), restart restarts Chrome; the current URL is reopened either way (default: tab)")
+@click.option("--resource-check-interval", "resource_check_interval", default=15.0, type=float, help="Seconds between resource checks of each browser (default: 15)")
+@click.option("--standby-browser", "standby_browser", is_flag=True, help="Keep a pre-launched spare browser that replaces the default browser immediately if it crashes")
+@click.option("--pool-min-size", "pool_min_size", default=0, type=int, help="Named browser sessions kept warm in the session pool (default: 0)")
+@click.option("--pool-max-size", "pool_max_size", default=4, type=int, help="Maximum number of named browser sessions (default: 4)")
+@click.option("--pool-idle-timeout", "pool_idle_timeout", default=600.0, type=float, help="Seconds before an idle named session is closed, 0 disables eviction (default: 600)")
+@click.option("--workers", "workers", default=8, type=int, help="Threads running blocking tool calls (default: 8)")
+@click.option("--lane-queue-depth", "lane_queue_depth", default=16, type=int, help="Tool calls a browser session may have running or queued before new ones are rejected (default: 16)")
+@click.option("--tool-limit", "tool_limits", multiple=True, help="Maximum running calls of one tool across sessions as NAME=N, e.g. take_screenshot=2 (repeatable)")
+@click.option("--transport", "transport", default="stdio", type=click.Choice(["stdio", "http"]),
+              help="MCP transport: stdio for a single client, http (streamable HTTP) for many concurrent clients (default: stdio)")
+@click.option("--host", "host", default="127.0.0.1", help="Address to listen on with --transport http (default: 127.0.0.1)")
+@click.option("--http-port", "http_port", default=8000, type=int, help="Port to listen on with --transport http (default: 8000)")
+@click.option("--max-connections", "max_connections", default=64, type=int, help="Concurrent HTTP connections before new ones get 503 (default: 64)")
+@click.option("--client-affinity", "client_affinity", is_flag=True, help="With --transport http, give each client that omits session_id its own pooled browser")
+@click.option("--startup", "startup", default="blocking", type=click.Choice(["blocking", "background"]),
+              help="blocking: start the browser before serving MCP; background: serve immediately and launch the browser on a background thread (default: blocking)")
+@click.option("--startup-timeout", "startup_timeout", default=60.0, type=float, help="Seconds a tool waits for a background browser launch to finish (default: 60)")
+@click.option("--metrics-file", "metrics_file", help="Write Prometheus text metrics to this file every 15 seconds")
+@click.option("--profile-calls", "profile_dir", help="Profile each tool call with cProfile and write a .prof file plus a JSON summary per call to this directory (also: SELENIUM_MCP_PROFILE_DIR)")
+@click.option("--profile-tool", "profile_tools", multiple=True, help="With --profile-calls, only profile this tool (repeatable)")
 @click.option("-v", "--verbose", count=True)
-def main(user_data_dir_param: str, port_param: int, driver_param: str, profile_param: str, verbose: int) -> None:
+def main(user_data_dir_param: str, port_param: int, driver_param: str, profile_param: str, health_check_interval: float, launch_profile: str, window_size: str, chrome_args: tuple, profile_template_dir: str, profile_template_urls: tuple, max_browser_rss: int, max_browser_cpu: float, recycle_action: str, resource_check_interval: float, standby_browser: bool, pool_min_size: int, pool_max_size: int, pool_idle_timeout: float, workers: int, lane_queue_depth: int, tool_limits: tuple, transport: str, host: str, http_port: int, max_connections: int, client_affinity: bool, startup: str, startup_timeout: float, metrics_file: str, profile_dir: str, profile_tools: tuple, verbose: int) -> None:
     """Selenium MCP Server - Synchronous version"""
     # Import server module to access global variables
     from . import server
@@ -43,11 +75,9 @@ def main(user_data_dir_param: str, port_param: int, driver_param: str, profile_p
         server.user_data_dir = user_data_dir_param
         
     # Set global debug_port from command line argument
+    # 0 lets the driver reserve a free port when it launches Chrome
     if port_param:
         server.debug_port = port_param
-    elif server.debug_port == 0:
-        server.debug_port = server.find_available_port()
-        logger.info(f"Auto-detected available port: {server.debug_port}")
         
     # Set global driver_type from command line argument
     server.driver_type = driver_param
@@ -55,6 +85,18 @@ def main(user_data_dir_param: str, port_param: int, driver_param: str, profile_p
     # Set global profile from command line argument
     server.profile = profile_param
     
+    server.health_check_interval = health_check_interval
+    
+    server.launch_profile = launch_profile
+    server.window_size = window_size
+    server.chrome_args = list(chrome_args)
+    
+    # New user data dirs are cloned from the template (built on first use)
+    server.profile_template.configure(profile_template_dir, profile_template_urls, factory=server.create_template_builder)
+    
+    from .resources import resource_governor
+    resource_governor.configure(max_browser_rss, max_browser_cpu, resource_check_interval, recycle_action)
+    
     # Validate driver availability early
     try:
         server.get_driver_factory(driver_param)
@@ -62,23 +104,61 @@ def main(user_data_dir_param: str, port_param: int, driver_param: str, profile_p
         logger.error(f"Driver validation failed: {str(e)}")
         raise e
     
-    logger.info(f"Running MCP Selenium server with {driver_param} configured at 127.0.0.1:{server.debug_port}, user data dir: {server.user_data_dir}, profile: {server.profile}")
+    # Configure the worker pool for blocking tool calls
+    limits = {}
+    for item in tool_limits:
+        name, _, value = item.partition("=")
+        if not name or not value.isdigit():
+            raise click.BadParameter(f"Expected NAME=N, got {item!r}", param_hint="--tool-limit")
+        limits[name] = int(value)
+    server.tool_executor.configure(workers, lane_queue_depth, limits)
     
-    # Initialize driver and start browser
-    try:
-        logger.info("Initializing driver and starting browser...")
-        driver_instance = server.initialize_driver_instance()
-        # Ensure the actual selenium driver is initialized (this starts the browser)
-        driver_instance.ensure_driver_initialized()
-        logger.info("Driver initialized and browser started successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize driver: {str(e)}")
-        raise e
+    server.client_affinity = client_affinity
+    
+    # Configure the pool of named browser sessions
+    server.session_pool.configure(pool_min_size, pool_max_size, pool_idle_timeout, server.user_data_dir)
+    
+    logger.info(f"Running MCP Selenium server with {driver_param} configured at 127.0.0.1:{server.debug_port or 'auto'}, user data dir: {server.user_data_dir}, profile: {server.profile}")
+    
+    server.warmup_timeout = startup_timeout
+    
+    if startup == "background":
+        # Answer the MCP handshake right away; tools wait for the browser
+        logger.info("Starting browser in the background...")
+        server.start_browser_warmup()
+    else:
+        # Initialize driver and start browser
+        try:
+            logger.info("Initializing driver and starting browser...")
+            driver_instance = server.initialize_driver_instance()
+            # Ensure the actual selenium driver is initialized (this starts the browser)
+            driver_instance.ensure_driver_initialized()
+            logger.info("Driver initialized and browser started successfully")
+        except Exception as e:
+            logger.error(f"Failed to initialize driver: {str(e)}")
+            raise e
+    
+    server.session_pool.start()
+    
+    server.standby_browser.configure(standby_browser, server.user_data_dir)
+    server.standby_browser.start()
+    
+    if metrics_file:
+        from .metrics import metrics
+        metrics.start_file_writer(metrics_file)
+    
+    if profile_dir:
+        from .profiling import profiler
+        profiler.configure(profile_dir, profile_tools)
     
     try:
         # Run the MCP server
-        logger.info("Starting MCP Selenium server")
-        mcp.run(transport='stdio')
+        if transport == "http":
+            logger.info(f"Starting MCP Selenium server on http://{host}:{http_port}{mcp.settings.streamable_http_path}")
+            mcp.run_http(host, http_port, max_connections)
+        else:
+            logger.info("Starting MCP Selenium server")
+            mcp.run(transport='stdio')
         
     except Exception as e:
         logger.error(f"Error starting server: {str(e)}")
@@ -86,6 +166,7 @@ def main(user_data_dir_param: str, port_param: int, driver_param: str, profile_p
     finally:
         # Clean up the WebDriver when done
         quit_driver()
+        server.tool_executor.shutdown()
 
 
 if __name__ == "__main__":
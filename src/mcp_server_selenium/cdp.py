@@ -0,0 +1,229 @@
+"""Long-lived DevTools protocol connection to a Chrome browser.
+
+One WebSocket to the browser endpoint from ``/json/version`` carries the
+commands and events of every target: ``session(target_id)`` attaches to a
+target with ``Target.attachToTarget(flatten=True)`` once and caches the
+resulting session, so tools can send CDP commands to a tab without opening a
+connection per call. Commands may be issued from any thread; their responses
+are matched by request id on a single reader thread, which also dispatches
+events to the callbacks registered with ``subscribe()``.
+
+Event callbacks run on the reader thread and must not wait for CDP responses
+themselves (that thread is the one delivering them).
+"""
+
+import itertools
+import json
+import logging
+import threading
+import urllib.request
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+EventCallback = Callable[[str, dict], None]
+
+
+class CDPError(RuntimeError):
+    """A CDP command returned an error."""
+
+
+class CDPConnectionClosed(CDPError):
+    """The browser connection or the target session is gone."""
+
+
+class CDPSession:
+    """Flattened session attached to one target (tab, worker, ...)."""
+
+    def __init__(self, connection: "CDPConnection", target_id: str, session_id: str):
+        self.connection = connection
+        self.target_id = target_id
+        self.session_id = session_id
+        self.detached = False
+
+    def call(self, method: str, params: Optional[dict] = None, timeout: Optional[float] = 30.0) -> dict:
+        if self.detached:
+            raise CDPConnectionClosed(f"Target {self.target_id} is closed")
+        return self.connection.call(method, params, session_id=self.session_id, timeout=timeout)
+
+    def subscribe(self, method: str, callback: EventCallback) -> Callable[[], None]:
+        return self.connection.subscribe(method, callback, session_id=self.session_id)
+
+    def detach(self) -> None:
+        """Detach from the target; the tab itself stays open."""
+        self.connection._forget_session(self)
+        if not self.detached and not self.connection.closed:
+            self.detached = True
+            try:
+                self.connection.call("Target.detachFromTarget", {"sessionId": self.session_id}, timeout=5)
+            except CDPError as e:
+                logger.debug(f"Detaching from target {self.target_id} failed: {e}")
+
+
+class CDPConnection:
+    """Thread-safe CDP client for one browser with request-id multiplexing and event subscription."""
+
+    def __init__(self, ws_url: str, origin: str = ""):
+        from websocket import create_connection  # websocket-client, installed with selenium
+
+        self.ws_url = ws_url
+        # Chrome checks the Origin header against --remote-allow-origins
+        self._ws = create_connection(ws_url, timeout=5, origin=origin) if origin else create_connection(ws_url, timeout=5)
+        self._ws.settimeout(None)
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, Future] = {}
+        self._subscribers: Dict[Tuple[str, str], List[EventCallback]] = {}
+        self._sessions: Dict[str, CDPSession] = {}
+        self._closed = False
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._reader = threading.Thread(target=self._read_loop, name="cdp-reader", daemon=True)
+        self._reader.start()
+        self.subscribe("Target.detachedFromTarget", self._on_detached)
+        self.subscribe("Target.targetDestroyed", self._on_target_destroyed)
+        self.call("Target.setDiscoverTargets", {"discover": True})
+
+    @classmethod
+    def for_port(cls, port: int, host: str = "127.0.0.1") -> "CDPConnection":
+        """Connect to the browser endpoint of the Chrome listening on port."""
+        with urllib.request.urlopen(f"http://{host}:{port}/json/version", timeout=2) as resp:
+            ws_url = json.loads(resp.read()).get("webSocketDebuggerUrl")
+        if not ws_url:
+            raise CDPError(f"Browser webSocketDebuggerUrl missing from /json/version on port {port}")
+        return cls(ws_url, origin=f"http://{host}:{port}")
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def call(self, method: str, params: Optional[dict] = None, session_id: str = "",
+             timeout: Optional[float] = 30.0) -> dict:
+        """Send a command (to a target when session_id is given) and wait for its result.
+
+        Raises:
+            CDPConnectionClosed: If the connection closes before the response arrives.
+            CDPError: If Chrome answers with an error.
+            TimeoutError: If no response arrives within timeout seconds.
+        """
+        message = {"method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise CDPConnectionClosed("DevTools connection is closed")
+            message["id"] = message_id = next(self._ids)
+            self._pending[message_id] = future
+        try:
+            with self._send_lock:
+                self._ws.send(json.dumps(message))
+        except Exception as e:
+            with self._lock:
+                self._pending.pop(message_id, None)
+            raise CDPConnectionClosed(f"DevTools connection lost: {e}")
+        metrics.count_cdp_command()
+        try:
+            response = future.result(timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self._pending.pop(message_id, None)
+            raise TimeoutError(f"{method} did not answer within {timeout}s")
+        if "error" in response:
+            error = response["error"]
+            raise CDPError(f"{method} failed: {error.get('message', error)}")
+        return response.get("result", {})
+
+    def subscribe(self, method: str, callback: EventCallback, session_id: str = "") -> Callable[[], None]:
+        """Call callback(method, params) for each event of method ("*" for all) from session_id.
+
+        An empty session_id selects browser-level events. Returns a function
+        that removes the subscription.
+        """
+        key = (method, session_id)
+        with self._lock:
+            self._subscribers.setdefault(key, []).append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                callbacks = self._subscribers.get(key, [])
+                if callback in callbacks:
+                    callbacks.remove(callback)
+                if not callbacks:
+                    self._subscribers.pop(key, None)
+        return unsubscribe
+
+    def session(self, target_id: str) -> CDPSession:
+        """Return the flattened session for target_id, attaching on first use."""
+        with self._lock:
+            existing = next((s for s in self._sessions.values() if s.target_id == target_id), None)
+        if existing is not None:
+            return existing
+        result = self.call("Target.attachToTarget", {"targetId": target_id, "flatten": True})
+        session = CDPSession(self, target_id, result["sessionId"])
+        with self._lock:
+            self._sessions[session.session_id] = session
+        return session
+
+    def _forget_session(self, session: CDPSession) -> None:
+        with self._lock:
+            self._sessions.pop(session.session_id, None)
+            for key in [key for key in self._subscribers if key[1] == session.session_id]:
+                del self._subscribers[key]
+
+    def _on_detached(self, method: str, params: dict) -> None:
+        with self._lock:
+            session = self._sessions.get(params.get("sessionId", ""))
+        if session is not None:
+            session.detached = True
+            self._forget_session(session)
+
+    def _on_target_destroyed(self, method: str, params: dict) -> None:
+        with self._lock:
+            sessions = [s for s in self._sessions.values() if s.target_id == params.get("targetId")]
+        for session in sessions:
+            session.detached = True
+            self._forget_session(session)
+
+    def _dispatch(self, method: str, params: dict, session_id: str) -> None:
+        with self._lock:
+            callbacks = self._subscribers.get((method, session_id), []) + self._subscribers.get(("*", session_id), [])
+        for callback in callbacks:
+            try:
+                callback(method, params)
+            except Exception:
+                logger.exception(f"Error handling DevTools event {method}")
+
+    def _read_loop(self) -> None:
+        try:
+            while True:
+                message = json.loads(self._ws.recv())
+                if "id" in message:
+                    with self._lock:
+                        future = self._pending.pop(message["id"], None)
+                    if future is not None:
+                        future.set_result(message)
+                elif "method" in message:
+                    self._dispatch(message["method"], message.get("params", {}), message.get("sessionId", ""))
+        except Exception as e:
+            if not self._closed:
+                logger.info(f"DevTools connection closed: {e}")
+        finally:
+            with self._lock:
+                self._closed = True
+                pending, self._pending = self._pending, {}
+                sessions, self._sessions = list(self._sessions.values()), {}
+            for session in sessions:
+                session.detached = True
+            for future in pending.values():
+                future.set_exception(CDPConnectionClosed("DevTools connection lost"))
+
+    def close(self) -> None:
+        self._closed = True
+        try:
+            self._ws.close()
+        except Exception:
+            pass
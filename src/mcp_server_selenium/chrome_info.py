@@ -0,0 +1,155 @@
+"""On-disk cache of the installed Chrome binary, its version and its chromedrivers.
+
+Running ``chrome --version`` takes 100-300 ms per binary tried, and it used to
+happen on every driver start. The results are kept in
+``~/.cache/selenium-mcp/chrome-info.json``, keyed by the resolved binary path
+and validated against its mtime and size, so a restart only runs the
+subprocess again after Chrome has been upgraded (or the cache was deleted).
+The chromedriver matching that Chrome and the undetected-chromedriver launch
+strategy that worked for it are recorded in the same entry, so they are
+forgotten together when Chrome changes.
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+from typing import List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "selenium-mcp")
+CACHE_PATH = os.path.join(CACHE_DIR, "chrome-info.json")
+
+_cache_lock = threading.Lock()
+
+
+class ChromeInfo(NamedTuple):
+    """An installed Chrome binary and its full version string (e.g. "130.0.6723.91")."""
+
+    binary: str
+    version: str
+
+    @property
+    def major(self) -> int:
+        return int(self.version.split(".")[0])
+
+
+def chrome_candidates() -> List[str]:
+    """Chrome commands to try, in order of preference."""
+    candidates = ["google-chrome-stable", "google-chrome", "chromium-browser", "chromium"]
+    if sys.platform == "darwin":
+        candidates.insert(0, "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome")
+    return candidates
+
+
+def _load() -> dict:
+    try:
+        with open(CACHE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _store(cache: dict) -> None:
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        tmp_path = f"{CACHE_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(cache, f, indent=2)
+        os.replace(tmp_path, CACHE_PATH)
+    except OSError as e:
+        logger.debug(f"Could not write Chrome info cache: {e}")
+
+
+def _fingerprint(path: str) -> Optional[dict]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def _resolve(command: str) -> Optional[str]:
+    found = command if os.path.isabs(command) and os.path.isfile(command) else shutil.which(command)
+    return os.path.realpath(found) if found else None
+
+
+def _cached_entry(cache: dict, binary: str) -> Optional[dict]:
+    entry = cache.get(binary)
+    fingerprint = _fingerprint(binary)
+    if entry and fingerprint and all(entry.get(k) == v for k, v in fingerprint.items()):
+        return entry
+    return None
+
+
+def get_chrome_info(candidates: Optional[List[str]] = None) -> Optional[ChromeInfo]:
+    """Return the first installed Chrome and its version, from the cache when it is current."""
+    with _cache_lock:
+        cache = _load()
+        for command in candidates or chrome_candidates():
+            binary = _resolve(command)
+            if not binary:
+                continue
+            entry = _cached_entry(cache, binary)
+            if entry:
+                logger.debug(f"Chrome {entry['version']} at {binary} (cached)")
+                return ChromeInfo(binary, entry["version"])
+            try:
+                out = subprocess.run([command, "--version"], capture_output=True, text=True, timeout=3).stdout
+            except Exception:
+                continue
+            match = re.search(r"(\d+\.\d+\.\d+\.\d+)", out)
+            if not match:
+                continue
+            cache[binary] = dict(_fingerprint(binary) or {}, version=match.group(1))
+            _store(cache)
+            return ChromeInfo(binary, match.group(1))
+    return None
+
+
+def cached_chromedriver(info: ChromeInfo) -> Optional[str]:
+    """Return the chromedriver recorded for this Chrome, if it still exists."""
+    with _cache_lock:
+        entry = _cached_entry(_load(), info.binary)
+    path = entry.get("chromedriver") if entry else None
+    return path if path and os.path.isfile(path) else None
+
+
+def record_chromedriver(info: ChromeInfo, chromedriver_path: str) -> None:
+    """Remember the chromedriver that matches this Chrome."""
+    with _cache_lock:
+        cache = _load()
+        entry = _cached_entry(cache, info.binary)
+        if entry is None:
+            entry = cache[info.binary] = dict(_fingerprint(info.binary) or {}, version=info.version)
+        entry["chromedriver"] = chromedriver_path
+        _store(cache)
+
+
+def cached_uc_launch(info: ChromeInfo) -> Optional[dict]:
+    """Return the undetected-chromedriver launch recorded for this Chrome ({"strategy", "chromedriver"})."""
+    with _cache_lock:
+        entry = _cached_entry(_load(), info.binary)
+    launch = entry.get("uc_launch") if entry else None
+    if launch and os.path.isfile(launch.get("chromedriver", "")):
+        return launch
+    return None
+
+
+def record_uc_launch(info: ChromeInfo, strategy: Optional[str], chromedriver_path: str = "") -> None:
+    """Remember the undetected-chromedriver strategy and patched chromedriver that worked; None forgets them."""
+    with _cache_lock:
+        cache = _load()
+        entry = _cached_entry(cache, info.binary)
+        if entry is None:
+            entry = cache[info.binary] = dict(_fingerprint(info.binary) or {}, version=info.version)
+        if strategy is None:
+            entry.pop("uc_launch", None)
+        else:
+            entry["uc_launch"] = {"strategy": strategy, "chromedriver": chromedriver_path}
+        _store(cache)
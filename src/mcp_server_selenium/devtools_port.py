@@ -0,0 +1,134 @@
+"""Wait for a freshly launched Chrome to open its DevTools port.
+
+Chrome writes ``<user-data-dir>/DevToolsActivePort`` (port on the first line)
+the moment its DevTools server is listening. On Linux the directory is watched
+with inotify, so the wait ends within milliseconds of that write; elsewhere,
+or if inotify is unavailable, the file is checked every 50 ms. The DevTools
+HTTP endpoint is still probed every ``poll_interval`` as a fallback, and the
+wait ends early if the Chrome process exits.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import sys
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_PORT_FILE = "DevToolsActivePort"
+
+# inotify constants from <sys/inotify.h>
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+
+# Interval for checking the file when inotify is not available
+_FILE_CHECK_INTERVAL = 0.05
+
+
+def read_devtools_active_port(user_data_dir: str) -> Optional[int]:
+    """Return the port recorded in DevToolsActivePort, or None if absent or incomplete."""
+    try:
+        with open(os.path.join(user_data_dir, ACTIVE_PORT_FILE)) as f:
+            first_line = f.readline().strip()
+    except OSError:
+        return None
+    return int(first_line) if first_line.isdigit() else None
+
+
+def remove_stale_devtools_active_port(user_data_dir: str) -> None:
+    """Delete a DevToolsActivePort left behind by an earlier Chrome so it is not mistaken for readiness."""
+    try:
+        os.remove(os.path.join(user_data_dir, ACTIVE_PORT_FILE))
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.debug(f"Could not remove stale {ACTIVE_PORT_FILE}: {e}")
+
+
+class _DirectoryWatch:
+    """inotify watch on one directory; wait() returns when an entry is written or moved in."""
+
+    def __init__(self, directory: str):
+        self.fd = -1
+        if sys.platform != "linux":
+            return
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+            if fd < 0:
+                return
+            mask = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+            if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+                os.close(fd)
+                return
+            self.fd = fd
+        except (OSError, AttributeError) as e:
+            logger.debug(f"inotify unavailable, checking {ACTIVE_PORT_FILE} by polling: {e}")
+
+    def wait(self, timeout: float) -> None:
+        if self.fd < 0:
+            time.sleep(min(timeout, _FILE_CHECK_INTERVAL))
+            return
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if readable:
+            try:
+                # Drain the queued events; the caller re-reads the file anyway
+                os.read(self.fd, 4096)
+            except BlockingIOError:
+                pass
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def wait_for_devtools_active_port(user_data_dir: str, expected_port: int, timeout: float,
+                                  process=None, poll_interval: float = 0.5,
+                                  fallback_check: Optional[Callable[[], bool]] = None) -> bool:
+    """Block until Chrome reports its DevTools server is listening on expected_port.
+
+    Args:
+        user_data_dir: The --user-data-dir Chrome was started with (must exist).
+        expected_port: The --remote-debugging-port Chrome was started with.
+        timeout: Seconds to wait in total.
+        process: The Chrome Popen object; the wait fails early if it exits.
+        poll_interval: Seconds between fallback_check calls.
+        fallback_check: Probe of the DevTools HTTP endpoint, used to confirm the
+            file signal and as a fallback when the file never appears.
+
+    Returns:
+        True once Chrome is ready, False on timeout or if Chrome exited.
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+    next_poll = start + poll_interval
+    watch = _DirectoryWatch(user_data_dir)
+    try:
+        while True:
+            port = read_devtools_active_port(user_data_dir)
+            if port == expected_port and (fallback_check is None or fallback_check()):
+                logger.info(f"DevTools ready on port {port} after {time.monotonic() - start:.3f}s")
+                return True
+
+            now = time.monotonic()
+            if now >= next_poll:
+                next_poll = now + poll_interval
+                if fallback_check is not None and fallback_check():
+                    logger.info(f"DevTools port {expected_port} answered after {now - start:.3f}s")
+                    return True
+                if process is not None and process.poll() is not None:
+                    logger.error(f"Chrome exited with code {process.returncode} before opening its DevTools port")
+                    return False
+            if now >= deadline:
+                return False
+            watch.wait(max(0.0, min(deadline, next_poll) - now))
+    finally:
+        watch.close()
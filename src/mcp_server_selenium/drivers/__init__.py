@@ -1,6 +1,18 @@
 """Chrome driver modules for selenium MCP server."""
 
-from .normal_chrome import NormalChromeDriver
-from .undetected_chrome import UndetectedChromeDriver
+__all__ = ["CDPChromeDriver", "NormalChromeDriver", "UndetectedChromeDriver"]
 
-__all__ = ["NormalChromeDriver", "UndetectedChromeDriver"]
\ No newline at end of file
+
+def __getattr__(name):
+    # Import driver classes on first access: importing selenium and
+    # undetected_chromedriver dominates server startup time.
+    if name == "NormalChromeDriver":
+        from .normal_chrome import NormalChromeDriver
+        return NormalChromeDriver
+    if name == "CDPChromeDriver":
+        from .cdp_chrome import CDPChromeDriver
+        return CDPChromeDriver
+    if name == "UndetectedChromeDriver":
+        from .undetected_chrome import UndetectedChromeDriver
+        return UndetectedChromeDriver
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,375 @@
+"""Chrome driver that speaks the DevTools protocol directly.
+
+With ``--driver cdp_chromedriver`` tool calls skip the Python → HTTP →
+chromedriver → CDP → Chrome chain for the operations most tools need: script
+evaluation, navigation, screenshots, browser/performance logs and raw CDP
+commands go over a flattened session on the driver's shared DevTools
+connection (see ``cdp.py``).
+
+Element lookups, frame switching and other WebDriver-only commands are still
+served by chromedriver, which is attached to the same Chrome (and switched to
+the same tab) the first time a tool needs one of them.
+
+Chrome itself is located or launched exactly as for ``normal_chromedriver``.
+"""
+
+import base64
+import json
+import logging
+import threading
+import time
+import urllib.request
+from collections import deque
+from typing import Callable, List, Optional
+
+from selenium import webdriver
+from selenium.common.exceptions import JavascriptException, NoSuchWindowException, TimeoutException, WebDriverException
+
+from ..cdp import CDPConnectionClosed, CDPError, CDPSession
+from ..metrics import metrics
+from ..resources import resource_governor
+from ..timeline import StartupTimeline
+from .normal_chrome import NormalChromeDriver
+
+logger = logging.getLogger(__name__)
+
+# Log entries kept per type until get_log() drains them
+MAX_BUFFERED_LOG_ENTRIES = 10000
+
+# Event domains recorded in the "performance" log, as chromedriver does
+_PERFORMANCE_DOMAINS = ("Network.", "Page.")
+
+_CONSOLE_LEVELS = {"error": "SEVERE", "assert": "SEVERE", "warning": "WARNING", "debug": "DEBUG"}
+_LOG_LEVELS = {"error": "SEVERE", "warning": "WARNING", "verbose": "DEBUG"}
+
+_TARGET_CLOSED = "no such window: target window already closed"
+
+
+class CDPPage:
+    """The object tools receive as ``driver`` when the CDP driver is selected.
+
+    Implements the subset of the selenium ``webdriver.Chrome`` API the tools use
+    for pages over CDP; any other attribute (find_element, window_handles,
+    ...) is looked up on a chromedriver session attached on first use.
+
+    Scripts run with ``Runtime.evaluate`` and results are returned by value,
+    so a script returning DOM nodes gets ``{}`` for each node. While the
+    chromedriver session is switched into a frame, scripts run there instead,
+    since ``Runtime.evaluate`` only reaches the top-level document.
+    """
+
+    # Not a chromedriver session; CDP commands are counted in CDPConnection.call
+    command_executor = None
+
+    def __init__(self, owner: "CDPChromeDriver"):
+        self._owner = owner
+        self._session: Optional[CDPSession] = None
+        self._unsubscribe: Optional[Callable[[], None]] = None
+        self._webdriver: Optional[webdriver.Chrome] = None
+        self._webdriver_lock = threading.Lock()
+        self._in_frame = False
+        self.target_id = ""
+        self.page_load_timeout = 120.0
+        self.script_timeout = 120.0
+        self._browser_log: deque = deque(maxlen=MAX_BUFFERED_LOG_ENTRIES)
+        self._performance_log: deque = deque(maxlen=MAX_BUFFERED_LOG_ENTRIES)
+        self._loaded = deque(maxlen=32)
+        self._load_condition = threading.Condition()
+
+    def attach(self, target_id: str) -> None:
+        """Switch to a page target, replacing the current session."""
+        self._detach()
+        self._session = self._owner.cdp().session(target_id)
+        self._unsubscribe = self._session.subscribe("*", self._on_event)
+        self.target_id = target_id
+        self._in_frame = False
+        for method in ("Page.enable", "Runtime.enable", "Log.enable", "Network.enable"):
+            self._call(method, timeout=30)
+        self._call("Page.setLifecycleEventsEnabled", {"enabled": True}, timeout=30)
+        if self._webdriver is not None:
+            try:
+                self._webdriver.switch_to.window(target_id)
+            except Exception as e:
+                logger.warning(f"Could not switch chromedriver to tab {target_id}: {e}")
+        logger.info(f"Attached to DevTools page target {target_id}")
+
+    def _detach(self) -> None:
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        if self._session is not None:
+            self._session.detach()
+            self._session = None
+
+    def _on_event(self, method: str, params: dict) -> None:
+        timestamp = int(time.time() * 1000)
+        if method.startswith(_PERFORMANCE_DOMAINS):
+            self._performance_log.append({
+                "level": "INFO",
+                "message": json.dumps({"message": {"method": method, "params": params}, "webview": self.target_id}),
+                "timestamp": timestamp,
+            })
+        if method == "Page.lifecycleEvent" and params.get("name") == "load":
+            with self._load_condition:
+                self._loaded.append(params.get("loaderId"))
+                self._load_condition.notify_all()
+        elif method == "Runtime.consoleAPICalled":
+            text = " ".join(_describe(arg) for arg in params.get("args", []))
+            self._browser_log.append({
+                "level": _CONSOLE_LEVELS.get(params.get("type"), "INFO"),
+                "message": text,
+                "source": "console-api",
+                "timestamp": int(params.get("timestamp", timestamp)),
+            })
+        elif method == "Log.entryAdded":
+            entry = params.get("entry", {})
+            self._browser_log.append({
+                "level": _LOG_LEVELS.get(entry.get("level"), "INFO"),
+                "message": f"{entry['url']} - {entry.get('text', '')}" if entry.get("url") else entry.get("text", ""),
+                "source": entry.get("source", "other"),
+                "timestamp": int(entry.get("timestamp", timestamp)),
+            })
+        elif method == "Runtime.exceptionThrown":
+            details = params.get("exceptionDetails", {})
+            exception = details.get("exception", {})
+            self._browser_log.append({
+                "level": "SEVERE",
+                "message": exception.get("description") or details.get("text", ""),
+                "source": "javascript",
+                "timestamp": int(params.get("timestamp", timestamp)),
+            })
+
+    def _call(self, method: str, params: Optional[dict] = None, timeout: Optional[float] = None) -> dict:
+        if self._session is None:
+            raise NoSuchWindowException(_TARGET_CLOSED)
+        try:
+            return self._session.call(method, params, timeout)
+        except CDPConnectionClosed as e:
+            self._owner.mark_window_unhealthy()
+            raise NoSuchWindowException(f"{_TARGET_CLOSED} ({e})")
+        except CDPError as e:
+            raise WebDriverException(str(e))
+        except TimeoutError as e:
+            raise TimeoutException(f"timeout: {e}")
+
+    def execute_cdp_cmd(self, cmd: str, cmd_args: Optional[dict] = None) -> dict:
+        """Run a CDP command on the page target and return its result."""
+        return self._call(cmd, cmd_args, timeout=self.script_timeout)
+
+    def execute_script(self, script: str, *args):
+        """Run script as a function body with ``arguments``, like WebDriver's execute_script."""
+        if self._in_frame:
+            return self._get_webdriver().execute_script(script, *args)
+        try:
+            encoded_args = json.dumps(list(args))
+        except TypeError:
+            # WebElement arguments only exist in the chromedriver session
+            return self._get_webdriver().execute_script(script, *args)
+        return self._evaluate(script, encoded_args)
+
+    def _evaluate(self, script: str, encoded_args: str = "[]"):
+        """Run script in the tab's top-level document over CDP."""
+        response = self._call("Runtime.evaluate", {
+            "expression": f"(function(){{{script}\n}}).apply(window, {encoded_args})",
+            "returnByValue": True,
+            "userGesture": True,
+        }, timeout=self.script_timeout)
+        details = response.get("exceptionDetails")
+        if details:
+            exception = details.get("exception", {})
+            raise JavascriptException(f"javascript error: {exception.get('description') or details.get('text')}")
+        return response.get("result", {}).get("value")
+
+    def get(self, url: str) -> None:
+        """Navigate and wait for the load event, raising TimeoutException after page_load_timeout.
+
+        page_load_timeout covers both steps together, as it does for chromedriver.
+        """
+        deadline = time.monotonic() + self.page_load_timeout
+        result = self._call("Page.navigate", {"url": url}, timeout=self.page_load_timeout)
+        if result.get("errorText"):
+            raise WebDriverException(f"unknown error: {result['errorText']}")
+        loader_id = result.get("loaderId")
+        if not loader_id:
+            return  # Same-document navigation, nothing to load
+        with self._load_condition:
+            if not self._load_condition.wait_for(lambda: loader_id in self._loaded,
+                                                 max(0.0, deadline - time.monotonic())):
+                raise TimeoutException(
+                    f"timeout: Timed out receiving message from renderer: {self.page_load_timeout:.3f}"
+                )
+
+    @property
+    def current_url(self) -> str:
+        return self._evaluate("return location.href")
+
+    @property
+    def title(self) -> str:
+        return self._evaluate("return document.title")
+
+    @property
+    def switch_to(self) -> "_FrameTrackingSwitchTo":
+        return _FrameTrackingSwitchTo(self, self._get_webdriver().switch_to)
+
+    def set_page_load_timeout(self, time_to_wait: float) -> None:
+        self.page_load_timeout = float(time_to_wait)
+
+    def set_script_timeout(self, time_to_wait: float) -> None:
+        self.script_timeout = float(time_to_wait)
+
+    def get_screenshot_as_base64(self) -> str:
+        return self._call("Page.captureScreenshot", {"format": "png"}, timeout=self.script_timeout)["data"]
+
+    def get_screenshot_as_png(self) -> bytes:
+        return base64.b64decode(self.get_screenshot_as_base64())
+
+    def save_screenshot(self, filename: str) -> bool:
+        with open(filename, "wb") as f:
+            f.write(self.get_screenshot_as_png())
+        return True
+
+    def get_log(self, log_type: str) -> List[dict]:
+        """Return and clear the buffered "browser" or "performance" log entries."""
+        buffers = {"browser": self._browser_log, "performance": self._performance_log}
+        if log_type not in buffers:
+            raise WebDriverException(f"invalid argument: log type '{log_type}' not found")
+        buffer = buffers[log_type]
+        entries = []
+        while buffer:
+            entries.append(buffer.popleft())
+        return entries
+
+    def _get_webdriver(self) -> webdriver.Chrome:
+        with self._webdriver_lock:
+            if self._webdriver is None:
+                self._webdriver = self._owner._attach_webdriver(self.target_id)
+            return self._webdriver
+
+    def __getattr__(self, name: str):
+        # Only reached for attributes CDPPage does not implement
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._get_webdriver(), name)
+
+    def quit(self) -> None:
+        """Detach from the tab and close any chromedriver session; Chrome keeps running."""
+        self._detach()
+        if self._webdriver is not None:
+            self._webdriver.quit()
+            self._webdriver = None
+
+
+class _FrameTrackingSwitchTo:
+    """chromedriver's ``switch_to`` that tells the CDPPage whether a frame is selected."""
+
+    def __init__(self, page: CDPPage, switch_to):
+        self._page = page
+        self._switch_to = switch_to
+
+    def frame(self, frame_reference) -> None:
+        self._switch_to.frame(frame_reference)
+        self._page._in_frame = True
+
+    def parent_frame(self) -> None:
+        # chromedriver does not report the depth; stay on chromedriver until default_content()
+        self._switch_to.parent_frame()
+
+    def default_content(self) -> None:
+        self._switch_to.default_content()
+        self._page._in_frame = False
+
+    def window(self, window_name: str) -> None:
+        self._switch_to.window(window_name)
+        self._page._in_frame = False
+
+    def __getattr__(self, name: str):
+        return getattr(self._switch_to, name)
+
+
+def _describe(remote_object: dict) -> str:
+    """Text of a console.* argument as the console shows it."""
+    if "value" in remote_object:
+        value = remote_object["value"]
+        return value if isinstance(value, str) else json.dumps(value)
+    return remote_object.get("description") or remote_object.get("type", "")
+
+
+class CDPChromeDriver(NormalChromeDriver):
+    """NormalChromeDriver whose ``driver`` is a CDPPage instead of a chromedriver session."""
+
+    def _page_target(self) -> str:
+        """Return the target id of the first regular tab."""
+        with urllib.request.urlopen(f"http://127.0.0.1:{self.debug_port}/json", timeout=2) as resp:
+            targets = json.loads(resp.read())
+        for target in targets:
+            if target.get("type") == "page" and not target.get("url", "").startswith("devtools://"):
+                return target["id"]
+        raise NoSuchWindowException("no such window: Chrome has no open tab to attach to")
+
+    def initialize_driver(self, custom_user_data_dir: str = "") -> CDPPage:
+        """Locate or launch Chrome and connect to one of its tabs over CDP."""
+        if custom_user_data_dir:
+            self.user_data_dir = custom_user_data_dir
+
+        timeline = StartupTimeline(f"CDP driver ({self.user_data_dir or 'new profile'})")
+        with timeline.phase("find chrome"):
+            self._resolve_debug_port()
+            running = self.check_chrome_debugger_port()
+        if not running:
+            with timeline.phase("launch chrome"):
+                self._launch_chrome()
+        else:
+            logger.info(f"Chrome already running with remote debugging port {self.debug_port}")
+
+        with timeline.phase("ensure page target"):
+            self._ensure_page_target_exists()
+        with timeline.phase("connect devtools"):
+            page = CDPPage(self)
+            page.attach(self._page_target())
+        timeline.log()
+
+        self.driver = page
+        self._mark_window_healthy()
+        resource_governor.watch(self)
+        return page
+
+    def current_target_id(self) -> str:
+        return self.driver.target_id
+
+    def _switch_to_target(self, target_id: str) -> None:
+        self.driver.attach(target_id)
+
+    def _attach_webdriver(self, target_id: str) -> webdriver.Chrome:
+        """Start a chromedriver session on our Chrome for commands CDPPage does not implement."""
+        logger.info(f"Attaching chromedriver to Chrome on port {self.debug_port} for WebDriver commands")
+        timeline = StartupTimeline(f"chromedriver fallback ({self.user_data_dir})")
+        service = self._start_chromedriver_service(timeline)
+        with timeline.phase("attach webdriver"):
+            driver = webdriver.Chrome(service=service, options=self._chrome_options())
+            driver.set_page_load_timeout(120)
+            driver.set_script_timeout(120)
+            if target_id in driver.window_handles:
+                driver.switch_to.window(target_id)
+        timeline.log()
+        self._watch_window_failures(driver)
+        metrics.instrument_driver(driver)
+        return driver
+
+    def _recover_window_handle(self) -> None:
+        """Reconnect to an open tab if ours was closed, or restart the driver if Chrome is gone."""
+        try:
+            _ = self.driver.title
+        except Exception:
+            try:
+                self._ensure_page_target_exists()
+                self.driver.attach(self._page_target())
+                logger.info(f"Recovered from stale tab — connected to target {self.driver.target_id}")
+            except Exception as e:
+                logger.warning(f"Tab recovery failed ({e}), reinitializing driver")
+                try:
+                    self.driver.quit()
+                except Exception:
+                    pass
+                self.driver = None
+                self.driver = self.initialize_driver(custom_user_data_dir=self.user_data_dir)
+        self._mark_window_healthy()
@@ -2,26 +2,76 @@ import json
 import logging
 import os
 import platform
-import re
 import shutil
 import signal
 import socket
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 import urllib.request
 import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from selenium import webdriver
-from selenium.common.exceptions import NoSuchWindowException, WebDriverException
+from selenium.common.exceptions import InvalidSessionIdException, NoSuchWindowException, TimeoutException, WebDriverException
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.remote.command import Command
+
+from ..cdp import CDPConnection
+from ..chrome_info import cached_chromedriver, get_chrome_info, record_chromedriver
+from ..devtools_port import remove_stale_devtools_active_port, wait_for_devtools_active_port
+from ..launch_profiles import launch_flags
+from ..ports import port_allocator
+from ..process_index import process_index
+from ..profile_template import profile_template
+from ..resources import resource_governor
+from ..timeline import StartupTimeline
 
 logger = logging.getLogger(__name__)
 
+# Resolves and spawns chromedriver while Chrome boots
+_chromedriver_starter = ThreadPoolExecutor(max_workers=4, thread_name_prefix="chromedriver-start")
+
+
+class _PrestartedChromeService(ChromeService):
+    """ChromeService that may be started ahead of webdriver.Chrome().
+
+    webdriver.Chrome() always calls service.start(); once the process is
+    already running that call is a no-op instead of spawning a second one.
+    """
+
+    def start(self) -> None:
+        process = getattr(self, "process", None)
+        if process is not None and process.poll() is None:
+            return
+        super().start()
+
+
+def _stop_service(future: Future) -> None:
+    """Stop a chromedriver started for a Chrome launch that failed."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    try:
+        future.result().stop()
+    except Exception as e:
+        logger.warning(f"Error stopping unused chromedriver: {str(e)}")
+
+
+def _is_window_failure(error: Exception) -> bool:
+    """Check if a WebDriver command failed because the window or session is gone."""
+    if isinstance(error, (NoSuchWindowException, InvalidSessionIdException)):
+        return True
+    if not isinstance(error, WebDriverException):
+        # A dead chromedriver raises raw urllib3/http.client errors
+        return True
+    msg = str(error)
+    return "target window already closed" in msg or "disconnected" in msg or "session deleted" in msg
+
 
 class NormalChromeDriver:
     """Normal Chrome WebDriver implementation."""
@@ -31,6 +81,28 @@ class NormalChromeDriver:
         self.debug_port = 0
         self.profile = profile
         self.driver: Optional[webdriver.Chrome] = None
+        # Seconds a successful window-health check stays valid (0 = check on every call)
+        self.health_check_interval = 10.0
+        self._healthy_until = 0.0
+        # Target id of the tab the driver was on when the window was last found
+        # healthy; read by the DevTools event thread (see _on_target_gone)
+        self._healthy_target_id = ""
+        # Port reserved in the host-wide registry for a Chrome we launched
+        self._reserved_port = 0
+        # Port to launch Chrome on, given with --port (0 = reserve a free one)
+        self.requested_debug_port = 0
+        # Chrome flags used when this driver launches Chrome (see launch_profiles)
+        self.launch_profile = "default"
+        self.window_size = ""
+        self.extra_chrome_args: List[str] = []
+        # Browser-level DevTools connection shared by tools (see cdp())
+        self._cdp: Optional[CDPConnection] = None
+        self._cdp_lock = threading.Lock()
+        # Latest sample of the Chrome process tree and pending recycle (see resources)
+        self.resource_usage: Optional[dict] = None
+        self.last_recycle = ""
+        self.recycles = 0
+        self._recycle_request = ""
     
     @staticmethod
     def _get_chromedriver_path() -> Optional[str]:
@@ -55,24 +127,17 @@ class NormalChromeDriver:
             return None
         _exe = "chromedriver.exe" if sys.platform == "win32" else "chromedriver"
 
-        # Detect installed Chrome version
-        _chrome_cmds = ["google-chrome-stable", "google-chrome", "chromium-browser", "chromium"]
-        if sys.platform == "darwin":
-            _chrome_cmds.insert(0, "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome")
-        _chrome_version = None
-        for _cmd in _chrome_cmds:
-            try:
-                _out = subprocess.run([_cmd, "--version"], capture_output=True, text=True, timeout=3).stdout
-                _m = re.search(r"(\d+\.\d+\.\d+\.\d+)", _out)
-                if _m:
-                    _chrome_version = _m.group(1)
-                    break
-            except Exception:
-                continue
-
-        if not _chrome_version:
+        # Detect installed Chrome version (cached on disk until the binary changes)
+        _chrome = get_chrome_info()
+        if not _chrome:
             logger.warning("Could not detect Chrome version; falling back to selenium manager")
             return None
+        _chrome_version = _chrome.version
+
+        _known = cached_chromedriver(_chrome)
+        if _known:
+            logger.debug(f"Using chromedriver {_chrome_version} recorded for {_chrome.binary}: {_known}")
+            return _known
 
         # Cache path: ~/.cache/selenium/chromedriver/{platform}/{version}/{exe}
         # This is the same path selenium manager uses on all OSes
@@ -83,6 +148,7 @@ class NormalChromeDriver:
 
         if os.path.isfile(_cache_path):
             logger.debug(f"Using cached chromedriver {_chrome_version} from {_cache_path}")
+            record_chromedriver(_chrome, _cache_path)
             return _cache_path
 
         # Not cached — download it ourselves
@@ -145,6 +211,7 @@ class NormalChromeDriver:
             _done = f"chromedriver {_chrome_version} saved to {_cache_path}"
             logger.info(_done)
             print(_done, flush=True)
+            record_chromedriver(_chrome, _cache_path)
             return _cache_path
 
         except Exception as dl_err:
@@ -182,28 +249,9 @@ class NormalChromeDriver:
         if not check_user_data_dir or not self.user_data_dir:
             return True
 
-        port_flag = f"--remote-debugging-port={port}"
-        dir_flag = f"--user-data-dir={self.user_data_dir}"
         try:
-            if sys.platform == "linux":
-                for entry in os.listdir("/proc"):
-                    if not entry.isdigit():
-                        continue
-                    try:
-                        with open(f"/proc/{entry}/cmdline", "rb") as f:
-                            cmdline = f.read().decode("utf-8", errors="replace")
-                        if port_flag in cmdline and dir_flag in cmdline:
-                            return True
-                    except (PermissionError, FileNotFoundError, ProcessLookupError):
-                        continue
-            else:
-                # macOS / Windows: use ps or trust the DevTools check
-                result = subprocess.run(
-                    ["ps", "aux"], capture_output=True, text=True, timeout=3
-                )
-                for line in result.stdout.splitlines():
-                    if port_flag in line and dir_flag in line:
-                        return True
+            if port in process_index.debug_ports(self.user_data_dir):
+                return True
         except Exception:
             return True  # If process inspection fails, trust the DevTools check
 
@@ -213,41 +261,15 @@ class NormalChromeDriver:
     def _find_chrome_port_by_user_data_dir(self) -> Optional[int]:
         """Find the debug port of a running Chrome that uses self.user_data_dir.
 
-        Scans process command lines for --user-data-dir=<our dir> and extracts
-        --remote-debugging-port=<N>.  Returns the port if found and DevTools
-        responds on it, otherwise None.
+        Looks up processes started with --user-data-dir=<our dir> in the
+        process index and takes their --remote-debugging-port=<N>.  Returns
+        the port if found and DevTools responds on it, otherwise None.
         """
         if not self.user_data_dir:
             return None
 
-        dir_flag = f"--user-data-dir={self.user_data_dir}"
-        port_re = re.compile(r"--remote-debugging-port=(\d+)")
-
-        candidates: list[int] = []
         try:
-            if sys.platform == "linux":
-                for entry in os.listdir("/proc"):
-                    if not entry.isdigit():
-                        continue
-                    try:
-                        with open(f"/proc/{entry}/cmdline", "rb") as f:
-                            cmdline = f.read().decode("utf-8", errors="replace")
-                        if dir_flag not in cmdline:
-                            continue
-                        m = port_re.search(cmdline)
-                        if m:
-                            candidates.append(int(m.group(1)))
-                    except (PermissionError, FileNotFoundError, ProcessLookupError):
-                        continue
-            else:
-                result = subprocess.run(
-                    ["ps", "aux"], capture_output=True, text=True, timeout=3
-                )
-                for line in result.stdout.splitlines():
-                    if dir_flag in line:
-                        m = port_re.search(line)
-                        if m:
-                            candidates.append(int(m.group(1)))
+            candidates = process_index.debug_ports(self.user_data_dir)
         except Exception:
             return None
 
@@ -272,30 +294,8 @@ class NormalChromeDriver:
         if not self.user_data_dir:
             return False
 
-        dir_flag = f"--user-data-dir={self.user_data_dir}"
-        pids: list[int] = []
-
         try:
-            if sys.platform == "linux":
-                for entry in os.listdir("/proc"):
-                    if not entry.isdigit():
-                        continue
-                    try:
-                        with open(f"/proc/{entry}/cmdline", "rb") as f:
-                            cmdline = f.read().decode("utf-8", errors="replace")
-                        if dir_flag in cmdline and ("chrome" in cmdline.lower() or "chromium" in cmdline.lower()):
-                            pids.append(int(entry))
-                    except (PermissionError, FileNotFoundError, ProcessLookupError):
-                        continue
-            else:
-                result = subprocess.run(
-                    ["ps", "aux"], capture_output=True, text=True, timeout=3
-                )
-                for line in result.stdout.splitlines():
-                    if dir_flag in line and ("chrome" in line.lower() or "chromium" in line.lower()):
-                        parts = line.split()
-                        if len(parts) > 1 and parts[1].isdigit():
-                            pids.append(int(parts[1]))
+            pids = [p.pid for p in process_index.by_user_data_dir(self.user_data_dir) if p.is_chrome]
         except Exception:
             return False
 
@@ -338,6 +338,7 @@ class NormalChromeDriver:
                     pass
             time.sleep(1)
 
+        process_index.invalidate()
         logger.info("Killed Chrome process(es) that were blocking the user data dir")
         return True
 
@@ -372,14 +373,30 @@ class NormalChromeDriver:
         """
         return self._is_chrome_on_port(self.debug_port)
 
-    def _wait_for_debug_port(self, timeout: float = 20.0, interval: float = 0.5) -> bool:
-        """Poll the DevTools port until it responds or timeout elapses."""
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            if self.check_chrome_debugger_port():
-                return True
-            time.sleep(interval)
-        return False
+    def _wait_for_debug_port(self, timeout: float = 20.0, interval: float = 0.5, process=None) -> bool:
+        """Wait until the DevTools port responds, Chrome exits, or timeout elapses.
+
+        Watches for the DevToolsActivePort file Chrome writes once it is
+        listening; the DevTools endpoint is polled every interval as a fallback.
+        """
+        if not self.user_data_dir:
+            deadline = time.time() + timeout
+            while time.time() < deadline:
+                if self.check_chrome_debugger_port():
+                    return True
+                time.sleep(interval)
+            return False
+        return wait_for_devtools_active_port(
+            self.user_data_dir, self.debug_port, timeout,
+            process=process, poll_interval=interval,
+            fallback_check=self.check_chrome_debugger_port,
+        )
+
+    def _prepare_user_data_dir(self) -> None:
+        """Create the user data dir (cloned from --profile-template when new) and drop a stale DevToolsActivePort."""
+        profile_template.clone_into(self.user_data_dir)
+        os.makedirs(self.user_data_dir, exist_ok=True)
+        remove_stale_devtools_active_port(self.user_data_dir)
 
     def _detect_linux_display(self) -> Optional[str]:
         """Detect an active X display by scanning /tmp/.X11-unix sockets."""
@@ -523,39 +540,8 @@ class NormalChromeDriver:
         # Requires Chrome to have been started with --remote-allow-origins=*
         # (or matching origin), which we now do for chrome instances we launch.
         try:
-            with urllib.request.urlopen(
-                f"http://127.0.0.1:{self.debug_port}/json/version", timeout=2
-            ) as resp:
-                version_info = json.loads(resp.read())
-            ws_url = version_info.get("webSocketDebuggerUrl")
-            if not ws_url:
-                logger.error("Browser webSocketDebuggerUrl missing from /json/version")
-                return
-
-            try:
-                from websocket import create_connection  # websocket-client
-            except ImportError:
-                logger.error(
-                    "websocket-client not installed; cannot create page target. "
-                    "Manually open a tab in Chrome and retry."
-                )
-                return
-
-            ws = create_connection(
-                ws_url,
-                timeout=5,
-                origin=f"http://127.0.0.1:{self.debug_port}",
-            )
-            try:
-                ws.send(json.dumps({
-                    "id": 1,
-                    "method": "Target.createTarget",
-                    "params": {"url": "about:blank"},
-                }))
-                resp_msg = ws.recv()
-                logger.debug(f"Target.createTarget response: {resp_msg}")
-            finally:
-                ws.close()
+            result = self.cdp().call("Target.createTarget", {"url": "about:blank"}, timeout=5)
+            logger.debug(f"Target.createTarget response: {result}")
 
             # Give Chrome a moment to register the new target
             for _ in range(20):
@@ -578,58 +564,33 @@ class NormalChromeDriver:
         except Exception as e:
             logger.error(f"Failed to create page target: {e}")
 
+    def _chrome_command(self) -> list:
+        """Chrome command line for self.debug_port, self.user_data_dir and the launch profile."""
+        return [
+            "google-chrome-stable",
+            f"--remote-debugging-port={self.debug_port}",
+            f"--user-data-dir={self.user_data_dir}",
+            f"--profile-directory={self.profile}",
+            "--remote-allow-origins=*",  # Allow our DevTools WS reconnects
+            "--no-first-run",
+            "--no-default-browser-check",
+            "--enable-logging",  # Enable logging
+            *launch_flags(self.launch_profile, self.window_size, self.extra_chrome_args),
+        ]
+
     def start_chrome(self, custom_user_data_dir: str = "") -> bool:
         """Start Chrome with remote debugging enabled on specified port"""
+        if custom_user_data_dir:
+            self.user_data_dir = custom_user_data_dir
         try:
-            if custom_user_data_dir:
-                self.user_data_dir = custom_user_data_dir
-            elif not self.user_data_dir:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                self.user_data_dir = f"/tmp/chrome-debug-{timestamp}"
-            
-            logger.info(f"Starting Chrome with debugging port {self.debug_port} and user data dir {self.user_data_dir}")
-            
-            # Start Chrome as a subprocess
-            cmd = [
-                "google-chrome-stable",
-                f"--remote-debugging-port={self.debug_port}",
-                f"--user-data-dir={self.user_data_dir}",
-                f"--profile-directory={self.profile}",
-                "--remote-allow-origins=*",  # Allow our DevTools WS reconnects
-                "--no-first-run",
-                "--no-default-browser-check",
-                "--start-maximized",  # Start Chrome maximized
-                "--auto-open-devtools-for-tabs"  # Auto-open DevTools for new tabs
-            ]
-            
-            stderr_log = self._open_chrome_stderr_log()
-            process = subprocess.Popen(
-                cmd, 
-                stdout=subprocess.DEVNULL, 
-                stderr=stderr_log,
-                start_new_session=True,  # Detach from the parent process
-                env=self._chrome_env(),
-            )
-            
-            # Poll for the DevTools port — Chrome may take several seconds to
-            # bind (cold start, slow disk, --auto-open-devtools-for-tabs, etc.)
-            if self._wait_for_debug_port(timeout=20.0):
-                logger.info(f"Chrome started successfully on port {self.debug_port}")
-                self._save_port()
-                return True
-            self._log_chrome_failure(process, stderr_log)
-            return False
+            self._launch_chrome()
+            return True
         except Exception as e:
             logger.error(f"Error starting Chrome: {str(e)}")
             return False
 
-    def initialize_driver(self, custom_user_data_dir: str = "") -> webdriver.Chrome:
-        """Initialize and return a WebDriver instance based on browser choice"""
-        
-        # Set user_data_dir if provided
-        if custom_user_data_dir:
-            self.user_data_dir = custom_user_data_dir
-        
+    def _resolve_debug_port(self) -> None:
+        """Set self.debug_port to our running Chrome's port, or reserve a new one."""
         # Auto-detect port: saved file -> process scan -> allocate new
         saved = self._read_saved_port()
         if saved:
@@ -646,58 +607,60 @@ class NormalChromeDriver:
                 # No Chrome with debug port found — kill any non-debug Chrome
                 # that locks our user_data_dir before starting a fresh one
                 self._kill_chrome_with_user_data_dir()
-                from mcp_server_selenium.server import find_available_port
-                self.debug_port = find_available_port()
-                logger.info(f"Auto-detected available port: {self.debug_port}")
-        
-        # Check if Chrome is already running with remote debugging
-        if not self.check_chrome_debugger_port():
-            logger.info(f"Chrome not detected on port {self.debug_port}, attempting to start a new instance")
-            
-            # Start Chrome with DevTools auto-open
-            if not self.user_data_dir:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                self.user_data_dir = f"/tmp/chrome-debug-{timestamp}"
-            
-            logger.info(f"Starting Chrome with debugging port {self.debug_port} and user data dir {self.user_data_dir}")
-            
-            # Start Chrome as a subprocess with DevTools auto-open
-            cmd = [
-                "google-chrome-stable",
-                f"--remote-debugging-port={self.debug_port}",
-                f"--user-data-dir={self.user_data_dir}",
-                f"--profile-directory={self.profile}",
-                "--remote-allow-origins=*",  # Allow our DevTools WS reconnects
-                "--no-first-run",
-                "--no-default-browser-check",
-                "--enable-logging",  # Enable logging
-                "--start-maximized",  # Start Chrome maximized
-                "--auto-open-devtools-for-tabs"  # Auto-open DevTools for new tabs
-            ]
-            
-            stderr_log = self._open_chrome_stderr_log()
-            process = subprocess.Popen(
-                cmd, 
-                stdout=subprocess.DEVNULL, 
-                stderr=stderr_log,
-                start_new_session=True,  # Detach from the parent process
-                env=self._chrome_env(),
-            )
-            
-            # Poll for the DevTools port — Chrome may take several seconds to
-            # bind (cold start, slow disk, --auto-open-devtools-for-tabs, etc.)
-            if not self._wait_for_debug_port(timeout=20.0):
-                self._log_chrome_failure(process, stderr_log)
-                raise RuntimeError("Failed to start Chrome browser")
-            self._save_port()
-        else:
-            logger.info(f"Chrome already running with remote debugging port {self.debug_port}")
+                if self.requested_debug_port:
+                    self.debug_port = self.requested_debug_port
+                    logger.info(f"Using requested debug port: {self.debug_port}")
+                else:
+                    self.debug_port = port_allocator.reserve(owner=self.user_data_dir)
+                    self._reserved_port = self.debug_port
+                    logger.info(f"Auto-detected available port: {self.debug_port}")
 
-        # Ensure at least one normal page exists; otherwise chromedriver fails
-        # with "unable to discover open pages" (e.g. when only extension
-        # service workers / DevTools windows are open).
-        self._ensure_page_target_exists()
+    def _launch_chrome(self) -> None:
+        """Start Chrome on self.debug_port and wait until its DevTools port is up."""
+        logger.info(f"Chrome not detected on port {self.debug_port}, attempting to start a new instance")
+        
+        if not self.user_data_dir:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self.user_data_dir = f"/tmp/chrome-debug-{timestamp}"
+
+        logger.info(f"Starting Chrome with debugging port {self.debug_port} and user data dir {self.user_data_dir}")
+
+        # Start Chrome as a subprocess with the flags of the launch profile
+        cmd = self._chrome_command()
+
+        self._prepare_user_data_dir()
+        stderr_log = self._open_chrome_stderr_log()
+        process = subprocess.Popen(
+            cmd, 
+            stdout=subprocess.DEVNULL, 
+            stderr=stderr_log,
+            start_new_session=True,  # Detach from the parent process
+            env=self._chrome_env(),
+        )
 
+        # Wait for the DevTools port — Chrome may take several seconds to
+        # bind (cold start, slow disk, --auto-open-devtools-for-tabs, etc.)
+        if not self._wait_for_debug_port(timeout=20.0, process=process):
+            self._log_chrome_failure(process, stderr_log)
+            raise RuntimeError("Failed to start Chrome browser")
+        process_index.invalidate()
+        self._save_port()
+
+    def _start_chromedriver_service(self, timeline: StartupTimeline) -> ChromeService:
+        """Resolve chromedriver and spawn it; runs in parallel with the Chrome launch."""
+        with timeline.phase("resolve chromedriver"):
+            # Resolve chromedriver from cache (downloading if needed) to bypass selenium manager
+            _driver_path = self._get_chromedriver_path()
+        if not _driver_path:
+            # selenium manager locates the driver when webdriver.Chrome starts the service
+            return _PrestartedChromeService()
+        service = _PrestartedChromeService(executable_path=_driver_path)
+        with timeline.phase("spawn chromedriver"):
+            service.start()
+        return service
+
+    def _chrome_options(self) -> ChromeOptions:
+        """Options that attach chromedriver to our Chrome with browser and performance logging."""
         # Setup capabilities to enable browser logging
         options = ChromeOptions()
         options.debugger_address = f"127.0.0.1:{self.debug_port}"
@@ -707,26 +670,128 @@ class NormalChromeDriver:
             'browser': 'ALL',
             'performance': 'ALL'
         })
+        return options
+
+    def initialize_driver(self, custom_user_data_dir: str = "") -> webdriver.Chrome:
+        """Initialize and return a WebDriver instance based on browser choice
         
-        # Resolve chromedriver from cache (downloading if needed) to bypass selenium manager
-        _driver_path = self._get_chromedriver_path()
-        service = ChromeService(executable_path=_driver_path) if _driver_path else ChromeService()
+        chromedriver is resolved and spawned on a background thread while Chrome
+        is located or launched; the two are joined when the driver attaches, and
+        the duration of every phase is logged.
+        """
         
-        # Create the driver
-        self.driver = webdriver.Chrome(service=service, options=options)
+        # Set user_data_dir if provided
+        if custom_user_data_dir:
+            self.user_data_dir = custom_user_data_dir
         
-        # Maximize the window
+        timeline = StartupTimeline(f"Chrome driver ({self.user_data_dir or 'new profile'})")
+        service_future = _chromedriver_starter.submit(self._start_chromedriver_service, timeline)
         try:
-            self.driver.maximize_window()
-        except Exception:
-            pass  # Already maximized or window state not changeable
-        
-        # Set longer page load timeout
-        self.driver.set_page_load_timeout(120)
-        self.driver.set_script_timeout(120)
+            with timeline.phase("find chrome"):
+                self._resolve_debug_port()
+                running = self.check_chrome_debugger_port()
+            
+            # Check if Chrome is already running with remote debugging
+            if not running:
+                with timeline.phase("launch chrome"):
+                    self._launch_chrome()
+            else:
+                logger.info(f"Chrome already running with remote debugging port {self.debug_port}")
+
+            # Ensure at least one normal page exists; otherwise chromedriver fails
+            # with "unable to discover open pages" (e.g. when only extension
+            # service workers / DevTools windows are open).
+            with timeline.phase("ensure page target"):
+                self._ensure_page_target_exists()
+            
+            with timeline.phase("wait for chromedriver"):
+                service = service_future.result(timeout=120)
+        except BaseException:
+            # Do not leave a chromedriver behind when Chrome could not be started
+            service_future.add_done_callback(_stop_service)
+            raise
+
+        with timeline.phase("attach webdriver"):
+            # Create the driver
+            self.driver = webdriver.Chrome(service=service, options=self._chrome_options())
+            
+            # Maximize the window (the launch profile sets the size otherwise)
+            if self.launch_profile == "default" and not self.window_size:
+                try:
+                    self.driver.maximize_window()
+                except Exception:
+                    pass  # Already maximized or window state not changeable
+            
+            # Set longer page load timeout
+            self.driver.set_page_load_timeout(120)
+            self.driver.set_script_timeout(120)
+        timeline.log()
         
+        self._watch_window_failures(self.driver)
+        self._mark_window_healthy()
+        try:
+            self.cdp()
+        except Exception as e:
+            logger.warning(f"No DevTools connection to Chrome on port {self.debug_port}: {e}")
+        resource_governor.watch(self)
         return self.driver
 
+    def cdp(self) -> CDPConnection:
+        """Return the DevTools connection to our Chrome, connecting (again) if needed.
+
+        Runs alongside the chromedriver session; tools use it for CDP commands
+        and events without a connection per call.
+        """
+        with self._cdp_lock:
+            if self._cdp is None or self._cdp.closed:
+                self._cdp = CDPConnection.for_port(self.debug_port)
+                # A closed or crashed tab makes the cached window health stale
+                self._cdp.subscribe("Target.targetDestroyed", self._on_target_gone)
+                self._cdp.subscribe("Target.targetCrashed", self._on_target_gone)
+            return self._cdp
+
+    def _on_target_gone(self, method: str, params: dict) -> None:
+        # Runs on the event thread: compare with the cached id instead of asking chromedriver
+        if params.get("targetId") == self._healthy_target_id:
+            self.mark_window_unhealthy()
+
+    def current_target_id(self) -> str:
+        """DevTools target id of the tab the driver is on."""
+        # chromedriver window handles are the DevTools target ids
+        return self.driver.current_window_handle
+
+    def _mark_window_healthy(self) -> None:
+        try:
+            self._healthy_target_id = self.current_target_id()
+        except Exception:
+            # Without a known tab no event can vouch for it; check on the next call
+            self._healthy_target_id = ""
+            self._healthy_until = 0.0
+            return
+        self._healthy_until = time.monotonic() + self.health_check_interval
+
+    def mark_window_unhealthy(self) -> None:
+        """Force a window-health check on the next ensure_driver_initialized() call."""
+        self._healthy_until = 0.0
+
+    def _watch_window_failures(self, driver: webdriver.Chrome) -> None:
+        """Invalidate the cached window health whenever a WebDriver command hits a dead window or session."""
+        execute = driver.execute
+
+        def checked_execute(driver_command, params=None):
+            try:
+                result = execute(driver_command, params)
+            except Exception as e:
+                if _is_window_failure(e):
+                    self.mark_window_unhealthy()
+                raise
+            if driver_command == Command.SWITCH_TO_WINDOW and params:
+                # Follow tab switches so target events are matched against the right tab
+                self._healthy_target_id = params.get("handle", self._healthy_target_id)
+            return result
+
+        driver.execute = checked_execute
+
     def _recover_window_handle(self) -> None:
         """Switch to a valid window if the current one was closed by the user.
 
@@ -763,6 +828,7 @@ class NormalChromeDriver:
                     pass
                 self.driver = None
                 self.driver = self.initialize_driver(custom_user_data_dir=self.user_data_dir)
+        self._mark_window_healthy()
 
     def ensure_driver_initialized(self) -> webdriver.Chrome:
         """Ensure that the WebDriver is initialized.
@@ -784,15 +850,92 @@ class NormalChromeDriver:
             except Exception as e:
                 logger.error(f"Failed to initialize WebDriver: {str(e)}")
                 raise RuntimeError(f"Failed to initialize WebDriver: {str(e)}")
-        else:
+        elif time.monotonic() >= self._healthy_until:
             # Driver exists — verify current window is still valid.
-            # User may have closed the tab manually in Chrome.
+            # User may have closed the tab manually in Chrome. The check is
+            # skipped while a recent one passed and no command has failed since.
             self._recover_window_handle()
+        if self._recycle_request:
+            self._recycle()
         return self.driver
+
+    def request_recycle(self, action: str, reason: str) -> None:
+        """Recycle the tabs ("tab") or restart Chrome ("restart") before the next tool call."""
+        if self._recycle_request != action:
+            logger.warning(f"Chrome for {self.user_data_dir} is over its resource limits ({reason}), {action} recycle scheduled")
+        self._recycle_request = action
+
+    def _recycle(self) -> None:
+        action, self._recycle_request = self._recycle_request, ""
+        try:
+            url = self.driver.current_url
+        except Exception:
+            url = ""
+        start = time.monotonic()
+        if action == "tab":
+            try:
+                self._recycle_tabs(url)
+            except Exception as e:
+                logger.warning(f"Tab recycle failed ({e}), restarting Chrome instead")
+                action = "restart"
+        if action == "restart":
+            self._restart_browser(url)
+        self.last_recycle = action
+        self.recycles += 1
+        logger.info(f"Recycled Chrome for {self.user_data_dir} ({action}) in {time.monotonic() - start:.1f}s")
+
+    def _recycle_tabs(self, url: str) -> None:
+        """Replace every tab with one new tab on url, dropping the renderers and DevTools windows of the old ones."""
+        cdp = self.cdp()
+        new_target = cdp.call("Target.createTarget", {"url": url or "about:blank"})["targetId"]
+        for target in cdp.call("Target.getTargets")["targetInfos"]:
+            if target["type"] == "page" and target["targetId"] != new_target:
+                cdp.call("Target.closeTarget", {"targetId": target["targetId"]})
+        self._switch_to_target(new_target)
+        self._mark_window_healthy()
+
+    def _switch_to_target(self, target_id: str) -> None:
+        self.driver.switch_to.window(target_id)
+
+    def _restart_browser(self, url: str) -> None:
+        """Close Chrome, start it again on the same user data dir and reopen url."""
+        self.close_browser()
+        self.driver = self.initialize_driver(custom_user_data_dir=self.user_data_dir)
+        if url and not url.startswith(("about:", "data:", "chrome:")):
+            try:
+                self.driver.get(url)
+            except TimeoutException:
+                logger.info(f"Reopening {url} after restart is still loading")
+
+    def close_browser(self, timeout: float = 10.0) -> None:
+        """Close Chrome cleanly so the profile is flushed to disk, killing it after timeout."""
+        try:
+            self.cdp().call("Browser.close", timeout=timeout)
+        except Exception as e:
+            # The connection usually drops before Chrome answers
+            logger.debug(f"Browser.close: {e}")
+        try:
+            self.quit()
+        except Exception as e:
+            logger.debug(f"Error disconnecting from closed Chrome: {e}")
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            process_index.invalidate()
+            if not any(p.is_chrome for p in process_index.by_user_data_dir(self.user_data_dir)):
+                return
+            time.sleep(0.2)
+        self._kill_chrome_with_user_data_dir()
     
     def quit(self):
-        """Quit the WebDriver instance."""
+        """Quit the WebDriver instance and release the reserved debug port."""
+        resource_governor.unwatch(self)
         if self.driver is not None:
             logger.info("Disconnecting from Chrome instance (but leaving browser open)")
             self.driver.quit()
-            self.driver = None
\ No newline at end of file
+            self.driver = None
+        if self._cdp is not None:
+            self._cdp.close()
+            self._cdp = None
+        if self._reserved_port:
+            port_allocator.release(self._reserved_port)
+            self._reserved_port = 0
\ No newline at end of file
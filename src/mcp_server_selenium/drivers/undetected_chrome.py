@@ -1,24 +1,62 @@
 import logging
 import os
+import shutil
 import signal
-import subprocess
+import threading
 import time
-from typing import Optional, Any
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, List, Optional, Tuple
+
+from ..chrome_info import CACHE_DIR, cached_uc_launch, get_chrome_info, record_uc_launch
+from ..resources import chrome_tree_pids
 
 logger = logging.getLogger(__name__)
 
 class TimeoutException(Exception):
     pass
 
+# uc.Chrome construction strategies in the order they are tried:
+# name -> (use the bundled chromedriver, pin version_main, patcher_force_close)
+LAUNCH_STRATEGIES = {
+    "local-versioned": (True, True, False),
+    "system-versioned": (False, True, False),
+    "local-offline": (True, True, True),
+    "system-unpinned": (False, False, True),
+}
+
+# Patched chromedriver binaries kept per Chrome version
+UC_DRIVER_CACHE_DIR = os.path.join(CACHE_DIR, "uc-chromedriver")
+
+# Seconds all launch strategies together may take (network operations included)
+INIT_TIMEOUT = 30.0
+
+
+def _kill_chrome_tree(user_data_dir: str) -> None:
+    """Kill the Chrome of a timed-out launch so the blocked uc.Chrome call fails fast."""
+    for pid in chrome_tree_pids(user_data_dir):
+        try:
+            os.kill(pid, signal.SIGKILL)
+            logger.warning(f"Killed PID {pid} of a timed-out undetected Chrome launch")
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+def _quit_late_driver(future: Future) -> None:
+    """Quit a driver whose launch finished after the caller gave up on it."""
+    if future.exception() is None:
+        try:
+            future.result().quit()
+        except Exception as e:
+            logger.warning(f"Error quitting late undetected Chrome driver: {e}")
+
 def get_chrome_version():
-    """Get Chrome version from the system."""
+    """Get the major version of the installed Chrome (cached on disk until Chrome changes)."""
     try:
-        result = subprocess.run(['google-chrome', '--version'], 
-                              capture_output=True, text=True, timeout=3)
-        if result.returncode == 0:
-            version = result.stdout.strip().split()[-1]
-            return int(version.split('.')[0])
-    except:
+        info = get_chrome_info()
+        if info is not None:
+            return info.major
+    except Exception:
         pass
     return 130
 
@@ -53,14 +91,8 @@ if UC_AVAILABLE:
             logger.warning("start_chrome not yet implemented for UndetectedChromeDriver")
             return False
 
-        def create_fast_driver(self, user_data_dir: str):
-            """Create undetected_chromedriver with optimizations and local ChromeDriver"""
-            
-            # Get the path to the chromedriver binary
-            script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            chromedriver_path = os.path.join(script_dir, "src", "mcp_server_selenium", "drivers", "chromedriver")
-            
-            # Setup Chrome options
+        def _chrome_options(self, user_data_dir: str):
+            """uc.ChromeOptions with the user data dir, profile and fast startup flags."""
             opts = uc.ChromeOptions()
             opts.add_argument(f'--user-data-dir={user_data_dir}')
             opts.add_argument(f'--profile-directory={self.profile}')
@@ -87,85 +119,111 @@ if UC_AVAILABLE:
             
             for flag in fast_flags:
                 opts.add_argument(flag)
+            return opts
+
+        def create_fast_driver(self, user_data_dir: str):
+            """Create undetected_chromedriver with optimizations and local ChromeDriver"""
+            
+            # Get the path to the chromedriver binary
+            script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            chromedriver_path = os.path.join(script_dir, "src", "mcp_server_selenium", "drivers", "chromedriver")
             
             # Get Chrome version for better compatibility
-            chrome_version = get_chrome_version()
+            chrome_info = get_chrome_info()
+            chrome_version = chrome_info.major if chrome_info is not None else 130
             logger.info(f"Detected Chrome version: {chrome_version}")
             
-            # Setup timeout protection
-            def alarm_handler(signum, frame):
-                raise TimeoutException("Driver initialization timeout!")
+            attempts = self._launch_attempts(chromedriver_path, chrome_info)
             
-            signal.signal(signal.SIGALRM, alarm_handler)
-            signal.alarm(30)  # Increased timeout to 30 seconds for network operations
+            # uc.Chrome runs on a launch thread; the caller waits for it with a
+            # timeout, which works on any thread (unlike SIGALRM, main thread only)
+            cancelled = threading.Event()
+            future: Future = Future()
             
-            try:
-                logger.info("Attempting to create undetected Chrome driver...")
-                
-                # Method 1: Try with local ChromeDriver and detected version
-                if os.path.exists(chromedriver_path):
-                    logger.info(f"Using local ChromeDriver at: {chromedriver_path}")
-                    try:
-                        driver = uc.Chrome(
-                            options=opts,
-                            driver_executable_path=chromedriver_path,
-                            use_subprocess=False,
-                            version_main=chrome_version
-                        )
-                        signal.alarm(0)
-                        logger.info("Successfully created driver with local ChromeDriver and detected version")
-                        return driver
-                    except Exception as e:
-                        logger.warning(f"Failed with local ChromeDriver and detected version: {e}")
-                
-                # Method 2: Try with system ChromeDriver and detected version
-                logger.info("Trying with system ChromeDriver and detected version...")
+            def launch():
                 try:
-                    driver = uc.Chrome(
-                        options=opts,
-                        use_subprocess=False,
-                        version_main=chrome_version
-                    )
-                    signal.alarm(0)
-                    logger.info("Successfully created driver with system ChromeDriver and detected version")
-                    return driver
-                except Exception as e:
-                    logger.warning(f"Failed with system ChromeDriver and detected version: {e}")
-                
-                # Method 3: Try with local ChromeDriver, no version detection (offline mode)
-                if os.path.exists(chromedriver_path):
-                    logger.info("Trying with local ChromeDriver in offline mode...")
-                    try:
-                        driver = uc.Chrome(
-                            options=opts,
-                            driver_executable_path=chromedriver_path,
-                            use_subprocess=False,
-                            version_main=chrome_version,
-                            patcher_force_close=True  # Force close to avoid network calls
-                        )
-                        signal.alarm(0)
-                        logger.info("Successfully created driver with local ChromeDriver in offline mode")
-                        return driver
-                    except Exception as e:
-                        logger.warning(f"Failed with local ChromeDriver in offline mode: {e}")
-                
-                # Method 4: Last resort - system ChromeDriver with no version detection
-                logger.info("Last resort: trying with system ChromeDriver, no version detection...")
-                driver = uc.Chrome(
-                    options=opts,
-                    use_subprocess=False,
-                    patcher_force_close=True
-                )
-                signal.alarm(0)
-                logger.info("Successfully created driver with system ChromeDriver as last resort")
-                return driver
-                
+                    future.set_result(self._launch_with_strategies(attempts, user_data_dir, chrome_info, chrome_version, cancelled))
+                except BaseException as e:
+                    future.set_exception(e)
+            
+            logger.info("Attempting to create undetected Chrome driver...")
+            threading.Thread(target=launch, name="uc-launch", daemon=True).start()
+            try:
+                return future.result(timeout=INIT_TIMEOUT)
+            except FutureTimeoutError:
+                cancelled.set()
+                future.add_done_callback(_quit_late_driver)
+                _kill_chrome_tree(user_data_dir)
+                logger.error(f"All driver creation methods failed: Driver initialization timeout after {INIT_TIMEOUT:.0f}s")
+                raise RuntimeError(f"Failed to create undetected Chrome driver: Driver initialization timeout after {INIT_TIMEOUT:.0f}s")
             except Exception as e:
-                signal.alarm(0)  # Cancel alarm
                 logger.error(f"All driver creation methods failed: {e}")
                 raise RuntimeError(f"Failed to create undetected Chrome driver: {e}")
-            finally:
-                signal.alarm(0)  # Ensure alarm is always cancelled
+
+        def _launch_with_strategies(self, attempts: List[Tuple[str, str, bool]], user_data_dir: str,
+                                    chrome_info, chrome_version: int, cancelled: threading.Event):
+            """Try the launch strategies in order until one returns a driver."""
+            opts = self._chrome_options(user_data_dir)
+            last_error: Optional[Exception] = None
+            for strategy, driver_path, cached in attempts:
+                if cancelled.is_set():
+                    raise TimeoutException("Driver initialization timeout!")
+                _, pin_version, force_close = LAUNCH_STRATEGIES[strategy]
+                logger.info(f"Trying {'cached ' if cached else ''}launch strategy '{strategy}'...")
+                kwargs = {"options": opts, "use_subprocess": False}
+                if driver_path:
+                    kwargs["driver_executable_path"] = driver_path
+                if pin_version:
+                    kwargs["version_main"] = chrome_version
+                if force_close:
+                    kwargs["patcher_force_close"] = True  # Force close to avoid network calls
+                try:
+                    driver = uc.Chrome(**kwargs)
+                except Exception as e:
+                    last_error = e
+                    logger.warning(f"Launch strategy '{strategy}' failed: {e}")
+                    if cached and chrome_info is not None:
+                        record_uc_launch(chrome_info, None)
+                    # Options cannot be reused by uc.Chrome once they were passed to it
+                    opts = self._chrome_options(user_data_dir)
+                    continue
+                logger.info(f"Successfully created driver with launch strategy '{strategy}'")
+                if not cached and chrome_info is not None:
+                    self._remember_launch(chrome_info, strategy, driver)
+                return driver
+            raise last_error or RuntimeError("No launch strategy available")
+
+        @staticmethod
+        def _launch_attempts(chromedriver_path: str, chrome_info) -> List[Tuple[str, str, bool]]:
+            """(strategy, chromedriver path, from cache) to try in order; the recorded winner goes first."""
+            has_local = os.path.exists(chromedriver_path)
+            attempts = [
+                (name, chromedriver_path if use_local else "", False)
+                for name, (use_local, _, _) in LAUNCH_STRATEGIES.items()
+                if has_local or not use_local
+            ]
+            cached = cached_uc_launch(chrome_info) if chrome_info is not None else None
+            if cached and cached["strategy"] in LAUNCH_STRATEGIES:
+                logger.info(f"Using cached launch strategy '{cached['strategy']}' for Chrome {chrome_info.version}")
+                attempts.insert(0, (cached["strategy"], cached["chromedriver"], True))
+            return attempts
+
+        @staticmethod
+        def _remember_launch(chrome_info, strategy: str, driver) -> None:
+            """Keep a copy of the patched chromedriver and record the strategy for the next launch."""
+            patched = getattr(getattr(driver, "patcher", None), "executable_path", None)
+            if not patched or not os.path.isfile(patched):
+                return
+            target = os.path.join(UC_DRIVER_CACHE_DIR, f"chromedriver-{chrome_info.version}")
+            try:
+                os.makedirs(UC_DRIVER_CACHE_DIR, exist_ok=True)
+                if os.path.realpath(patched) != os.path.realpath(target):
+                    shutil.copy2(patched, f"{target}.tmp")
+                    os.replace(f"{target}.tmp", target)
+                record_uc_launch(chrome_info, strategy, target)
+                logger.info(f"Cached launch strategy '{strategy}' and patched chromedriver at {target}")
+            except OSError as e:
+                logger.warning(f"Could not cache patched chromedriver: {e}")
 
         def initialize_driver(self, custom_user_data_dir: str = ""):
             """Initialize and return an undetected Chrome WebDriver instance"""
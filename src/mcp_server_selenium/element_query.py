@@ -0,0 +1,265 @@
+"""In-page element query engine used by the element lookup tools.
+
+``query_elements()`` evaluates an XPath and serializes one page of its
+matches (tag, id, class, truncated text, unique XPath and optionally the
+HTML) inside a single ``execute_script``. Reading the same fields through
+WebElement getters costs a WebDriver round trip per field and element.
+
+The script runs in the frame the driver is currently switched to, so the
+iframe handling of the tools is unchanged.
+
+Every serialized element also gets a short ``ref`` ("e1", "e2", ...) that
+action tools accept instead of selection criteria. The driver's
+``ElementRefs`` keeps the WebElement returned by the query for each ref, so
+using a ref skips the lookup. The page keeps the referenced nodes in a
+registry on ``window``: a MutationObserver drops nodes removed from the
+document, and navigating away discards the registry with the window, so a
+stale ref is detected with one small script instead of a re-query.
+"""
+
+import itertools
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Length of the "text" field before it is truncated with "..."
+MAX_TEXT_LENGTH = 50
+
+# Refs remembered per driver; the least recently used ones are forgotten first
+MAX_ELEMENT_REFS = 500
+
+# Page-side registry of referenced nodes, created on first use in each document
+_REGISTRY_SCRIPT = """
+var registry = window.__seleniumMcpRefs;
+if (!registry || registry.document !== document) {
+    registry = window.__seleniumMcpRefs = {
+        document: document,
+        token: Math.random().toString(36).slice(2),
+        nextId: 1,
+        nodes: new Map()
+    };
+    new MutationObserver(function (records) {
+        for (var i = 0; i < records.length; i++) {
+            if (records[i].removedNodes.length) {
+                registry.nodes.forEach(function (node, id) {
+                    if (!node.isConnected)
+                        registry.nodes.delete(id);
+                });
+                return;
+            }
+        }
+    }).observe(document, {childList: true, subtree: true});
+}
+"""
+
+# arguments: xpath, offset, limit, return_html, max_text_length, max_refs, refs_only_if_unique
+_QUERY_SCRIPT = _REGISTRY_SCRIPT + """
+var xpath = arguments[0], offset = arguments[1], limit = arguments[2];
+var returnHtml = arguments[3], maxText = arguments[4], maxRefs = arguments[5];
+
+function getPathTo(element) {
+    if (element.id !== '')
+        return '//*[@id="' + element.id + '"]';
+    if (element === document.body)
+        return '/html/body';
+
+    var ix = 0;
+    var siblings = element.parentNode.childNodes;
+    for (var i = 0; i < siblings.length; i++) {
+        var sibling = siblings[i];
+        if (sibling === element)
+            return getPathTo(element.parentNode) + '/' + element.tagName.toLowerCase() + '[' + (ix + 1) + ']';
+        if (sibling.nodeType === 1 && sibling.tagName === element.tagName)
+            ix++;
+    }
+}
+
+// Rendered text, as WebElement.text reports it: empty for hidden elements
+function visibleText(element) {
+    var box = element.closest('select') || element;
+    if (box.getClientRects().length === 0)
+        return '';
+    var text = element.innerText !== undefined ? element.innerText : element.textContent;
+    text = (text || '').trim();
+    var chars = Array.from(text);
+    return chars.length > maxText ? chars.slice(0, maxText).join('') + '...' : text;
+}
+
+var snapshot = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var total = snapshot.snapshotLength;
+var register = !arguments[6] || total === 1;
+var elements = [], nodes = [], ids = [], tags = [];
+for (var i = offset; i < Math.min(offset + limit, total); i++) {
+    var element = snapshot.snapshotItem(i);
+    if (element.nodeType !== 1)
+        throw new Error('The result of the xpath expression "' + xpath + '" is: ' + element + '. It should be an element.');
+    var uniqueXPath;
+    try {
+        uniqueXPath = getPathTo(element);
+    } catch (e) {
+        uniqueXPath = '(' + xpath + ')[' + (i + 1) + ']';
+    }
+    if (register) {
+        var nodeId = registry.nextId++;
+        registry.nodes.set(nodeId, element);
+        nodes.push(element);
+        ids.push(nodeId);
+        tags.push(element.tagName.toLowerCase());
+    }
+    if (returnHtml) {
+        elements.push({innerHTML: element.innerHTML, outerHTML: element.outerHTML, uniqueXPath: uniqueXPath});
+    } else {
+        elements.push({
+            tag_name: element.tagName.toLowerCase(),
+            id: element.getAttribute('id') || 'no-id',
+            'class': element.getAttribute('class') || 'no-class',
+            text: visibleText(element),
+            uniqueXPath: uniqueXPath
+        });
+    }
+}
+// Forget the oldest nodes the server no longer has refs for
+while (registry.nodes.size > maxRefs)
+    registry.nodes.delete(registry.nodes.keys().next().value);
+return {total: total, elements: elements, nodes: nodes, ids: ids, tags: tags, token: registry.token};
+"""
+
+# arguments: registry token, node id; returns why the node is stale, or ""
+_CHECK_REF_SCRIPT = """
+var registry = window.__seleniumMcpRefs;
+if (!registry || registry.document !== document || registry.token !== arguments[0])
+    return 'the page was navigated or reloaded, or another tab or frame is selected';
+if (!registry.nodes.has(arguments[1]))
+    return 'the element was removed from the page';
+return '';
+"""
+
+
+class StaleElementRef(ValueError):
+    """An element ref is unknown or no longer points to an element in the page."""
+
+
+class ElementRef(NamedTuple):
+    """What a ref points to: the node in the page registry and its WebElement."""
+
+    token: str
+    node_id: int
+    element: Any  # WebElement, or None until first resolved (CDP driver)
+    unique_xpath: str
+    tag_name: str
+    in_iframe_id: str
+    in_iframe_name: str
+
+
+class ElementRefs:
+    """Refs handed out by the query tools for one driver."""
+
+    def __init__(self):
+        self._refs: "OrderedDict[str, ElementRef]" = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def add(self, entry: ElementRef) -> str:
+        with self._lock:
+            ref = f"e{next(self._ids)}"
+            self._refs[ref] = entry
+            while len(self._refs) > MAX_ELEMENT_REFS:
+                self._refs.popitem(last=False)
+        return ref
+
+    def get(self, ref: str) -> ElementRef:
+        with self._lock:
+            entry = self._refs.get(ref)
+            if entry is None:
+                raise StaleElementRef(f"Unknown element ref '{ref}'; find the element again")
+            self._refs.move_to_end(ref)
+        return entry
+
+    def discard(self, ref: str) -> None:
+        with self._lock:
+            self._refs.pop(ref, None)
+
+    def update(self, ref: str, entry: ElementRef) -> None:
+        with self._lock:
+            if ref in self._refs:
+                self._refs[ref] = entry
+
+
+_refs_by_driver: "weakref.WeakKeyDictionary[Any, ElementRefs]" = weakref.WeakKeyDictionary()
+_refs_lock = threading.Lock()
+
+
+def element_refs(driver: Any) -> ElementRefs:
+    """Return the ref table of a driver; a new driver starts with an empty one."""
+    with _refs_lock:
+        refs = _refs_by_driver.get(driver)
+        if refs is None:
+            refs = _refs_by_driver[driver] = ElementRefs()
+        return refs
+
+
+def query_elements(driver: Any, xpath: str, offset: int = 0, limit: int = 1, return_html: bool = False,
+                   in_iframe_id: str = "", in_iframe_name: str = "",
+                   refs_only_if_unique: bool = False) -> Dict[str, Any]:
+    """Evaluate xpath in the current frame and serialize matches [offset, offset + limit).
+
+    in_iframe_id/in_iframe_name name the frame the driver is switched to; they
+    are recorded with the refs so action tools can switch back to it. With
+    refs_only_if_unique, refs are only handed out when xpath matches exactly
+    one element; otherwise the elements are returned without a ref.
+
+    Returns:
+        {"total": <number of matches>, "elements": [...]}; each element has
+        tag_name, id, class, text, uniqueXPath and ref, or innerHTML,
+        outerHTML, uniqueXPath and ref when return_html is True.
+
+    Raises:
+        WebDriverException: If the XPath is invalid or selects non-element nodes.
+    """
+    from selenium.webdriver.remote.webelement import WebElement
+
+    result = driver.execute_script(_QUERY_SCRIPT, xpath, offset, limit, return_html, MAX_TEXT_LENGTH,
+                                   MAX_ELEMENT_REFS, refs_only_if_unique)
+    elements: List[Dict[str, Any]] = result.get("elements", [])
+    refs = element_refs(driver)
+    for info, node, node_id, tag_name in zip(elements, result["nodes"], result["ids"], result["tags"]):
+        info["ref"] = refs.add(ElementRef(
+            token=result["token"],
+            node_id=node_id,
+            # Scripts evaluated over CDP return nodes by value, not as WebElements
+            element=node if isinstance(node, WebElement) else None,
+            unique_xpath=info["uniqueXPath"],
+            tag_name=tag_name,
+            in_iframe_id=in_iframe_id,
+            in_iframe_name=in_iframe_name,
+        ))
+    logger.debug(f"XPath {xpath} matched {result.get('total', 0)} elements, serialized {len(elements)}")
+    return {"total": int(result.get("total", 0)), "elements": elements}
+
+
+def resolve_ref(driver: Any, ref: str) -> Tuple[ElementRef, Any]:
+    """Return the entry and WebElement of ref, checking in the page that the node is still there.
+
+    The driver must already be switched to the entry's frame.
+
+    Raises:
+        StaleElementRef: If the ref is unknown or its element is gone.
+    """
+    from selenium.webdriver.common.by import By
+
+    refs = element_refs(driver)
+    entry = refs.get(ref)
+    reason = driver.execute_script(_CHECK_REF_SCRIPT, entry.token, entry.node_id)
+    if reason:
+        refs.discard(ref)
+        raise StaleElementRef(f"Element ref '{ref}' is stale: {reason}; find the element again")
+    element: Optional[Any] = entry.element
+    if element is None:
+        # The node has not moved since the query, so its unique XPath still selects it
+        element = driver.find_element(By.XPATH, entry.unique_xpath)
+        refs.update(ref, entry._replace(element=element))
+    return entry, element
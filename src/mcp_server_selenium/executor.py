@@ -0,0 +1,148 @@
+"""Worker pool that runs blocking tool bodies off the FastMCP event loop.
+
+FastMCP calls synchronous tools directly on its event loop, so one slow
+``driver.get()`` would stall every other request. ``ToolExecutor`` runs them
+on a bounded thread pool instead:
+
+- Each browser session gets its own lane. Calls in a lane run one at a time,
+  in arrival order, so a session never has two tool bodies racing on the same
+  browser, while different sessions run in parallel.
+- A lane accepts at most ``max_queue_depth`` calls (running + waiting). Beyond
+  that, new calls are rejected right away with ``ToolBusyError`` instead of
+  piling up.
+- ``tool_limits`` caps how many calls of one tool run at the same time across
+  all lanes. A call that reaches the front of its lane while its tool is at
+  the cap waits for a running one to finish; a call submitted while the tool
+  is at the cap is rejected with ``ToolBusyError``.
+"""
+
+import asyncio
+import collections
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ToolBusyError(RuntimeError):
+    """Raised when a tool call is rejected because its lane or tool is saturated."""
+
+
+class _Lane:
+    """FIFO of pending calls for one browser session."""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.queue: Deque[tuple] = collections.deque()
+        self.running = False
+
+
+class ToolExecutor:
+    """Runs tool calls on a thread pool with one serial lane per browser session."""
+
+    def __init__(self, max_workers: int = 8, max_queue_depth: int = 16,
+                 tool_limits: Optional[Dict[str, int]] = None):
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.tool_limits: Dict[str, int] = dict(tool_limits or {})
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lanes: Dict[str, _Lane] = {}
+        # Calls per tool that are running right now (not the queued ones)
+        self._running: collections.Counter = collections.Counter()
+        self._lock = threading.Lock()
+        self._call_finished = threading.Condition(self._lock)
+
+    def configure(self, max_workers: int, max_queue_depth: int, tool_limits: Dict[str, int]) -> None:
+        """Apply settings from the command line (before the first call is submitted)."""
+        if max_workers < 1:
+            raise ValueError("The worker pool needs at least one thread")
+        if max_queue_depth < 1:
+            raise ValueError("The lane queue depth must be at least 1")
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.tool_limits = dict(tool_limits)
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="mcp-tool")
+        return self._pool
+
+    def submit(self, lane_key: str, tool_name: str, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Queue fn on the lane for lane_key and return a future for its result.
+
+        Raises:
+            ToolBusyError: If the lane queue is full or tool_name already runs as many calls as its cap.
+        """
+        future: Future = Future()
+        with self._lock:
+            lane = self._lanes.get(lane_key)
+            if lane is None:
+                lane = self._lanes[lane_key] = _Lane(lane_key)
+            depth = len(lane.queue) + int(lane.running)
+            if depth >= self.max_queue_depth:
+                raise ToolBusyError(
+                    f"Session '{lane_key or 'default'}' already has {depth} tool calls queued; retry later"
+                )
+            limit = self.tool_limits.get(tool_name)
+            if limit is not None and self._running[tool_name] >= limit:
+                raise ToolBusyError(
+                    f"Tool {tool_name} is at its concurrency limit ({limit}); retry later"
+                )
+            lane.queue.append((future, tool_name, fn, args, kwargs))
+            if not lane.running:
+                lane.running = True
+                self._get_pool().submit(self._drain, lane)
+        return future
+
+    def _drain(self, lane: _Lane) -> None:
+        """Run the calls of one lane until its queue is empty."""
+        while True:
+            with self._lock:
+                if not lane.queue:
+                    lane.running = False
+                    # Drop idle lanes so closed sessions do not accumulate
+                    if self._lanes.get(lane.key) is lane:
+                        del self._lanes[lane.key]
+                    return
+                future, tool_name, fn, args, kwargs = lane.queue.popleft()
+                # Hold the lane until the tool is under its cap; its order is kept
+                limit = self.tool_limits.get(tool_name)
+                while limit is not None and self._running[tool_name] >= limit:
+                    self._call_finished.wait()
+                self._running[tool_name] += 1
+            try:
+                # Skip calls whose client gave up while they were queued
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(fn(*args, **kwargs))
+                    except BaseException as e:
+                        future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._running[tool_name] -= 1
+                    self._call_finished.notify_all()
+
+    async def run(self, lane_key: str, tool_name: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run fn on its lane and await the result from the event loop."""
+        return await asyncio.wrap_future(self.submit(lane_key, tool_name, fn, *args, **kwargs))
+
+    def stats(self) -> dict:
+        """Queue depth per lane and running calls per tool."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue_depth": self.max_queue_depth,
+                "tool_limits": dict(self.tool_limits),
+                "lanes": {
+                    key or "default": len(lane.queue) + int(lane.running)
+                    for key, lane in self._lanes.items()
+                },
+                "inflight": {name: count for name, count in self._running.items() if count},
+            }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,225 @@
+"""Per-tool latency and WebDriver round-trip metrics.
+
+``auto_recover_stale_window`` wraps every browser tool call in
+``metrics.track(tool_name)``; each WebDriver HTTP command issued while a call
+is active is counted against it (and against any tool that called it).
+Commands sent over the DevTools connection (``cdp.py``) are counted
+separately as CDP commands, so the two kinds of round trip can be compared. The
+numbers are exposed through the ``get_server_stats`` tool, the ``/metrics``
+route of the HTTP transport and, optionally, a Prometheus text file.
+"""
+
+import collections
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the Prometheus latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Number of recent latencies kept per tool for percentile estimates
+LATENCY_SAMPLES = 1024
+
+
+class ToolStats:
+    """Counters and latency samples for one tool."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.stale_retries = 0
+        self.webdriver_commands = 0
+        self.cdp_commands = 0
+        self.total_seconds = 0.0
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+        self.samples: Deque[float] = collections.deque(maxlen=LATENCY_SAMPLES)
+
+    def observe(self, seconds: float, failed: bool, commands: int, cdp_commands: int = 0) -> None:
+        self.calls += 1
+        self.errors += int(failed)
+        self.webdriver_commands += commands
+        self.cdp_commands += cdp_commands
+        self.total_seconds += seconds
+        self.samples.append(seconds)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.bucket_counts[i] += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Nearest-rank percentile (0-100) over the recent samples."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = max(0, min(len(ordered) - 1, int(round(q / 100.0 * len(ordered))) - 1))
+        return ordered[index]
+
+
+class _Call:
+    """A tool call in progress on the current thread."""
+
+    def __init__(self, tool_name: str):
+        self.tool_name = tool_name
+        self.webdriver_commands = 0
+        self.cdp_commands = 0
+        self.stale_retries = 0
+
+    def stale_retry(self) -> None:
+        self.stale_retries += 1
+
+
+class MetricsRegistry:
+    """Thread-safe collection of ToolStats keyed by tool name."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._tools: Dict[str, ToolStats] = collections.defaultdict(ToolStats)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.webdriver_commands_total = 0
+        self.cdp_commands_total = 0
+
+    def _stack(self) -> List[_Call]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def track(self, tool_name: str):
+        """Time the enclosed tool call and count its errors and WebDriver commands."""
+        call = _Call(tool_name)
+        stack = self._stack()
+        stack.append(call)
+        start = time.perf_counter()
+        failed = False
+        try:
+            yield call
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            with self._lock:
+                stats = self._tools[tool_name]
+                stats.observe(elapsed, failed, call.webdriver_commands, call.cdp_commands)
+                stats.stale_retries += call.stale_retries
+
+    def count_webdriver_command(self) -> None:
+        """Attribute one WebDriver HTTP command to every tool call active on this thread."""
+        for call in self._stack():
+            call.webdriver_commands += 1
+        with self._lock:
+            self.webdriver_commands_total += 1
+
+    def count_cdp_command(self) -> None:
+        """Attribute one DevTools protocol command to every tool call active on this thread."""
+        for call in self._stack():
+            call.cdp_commands += 1
+        with self._lock:
+            self.cdp_commands_total += 1
+
+    def instrument_driver(self, driver) -> None:
+        """Count the HTTP commands a selenium driver sends to chromedriver.
+
+        Wraps ``driver.command_executor.execute`` on the instance; calling this
+        again for an already instrumented driver is a no-op.
+        """
+        executor = getattr(driver, "command_executor", None)
+        if executor is None or getattr(executor, "_mcp_metrics_instrumented", False):
+            return
+        execute = executor.execute
+
+        def counted_execute(command, params):
+            self.count_webdriver_command()
+            return execute(command, params)
+
+        executor.execute = counted_execute
+        executor._mcp_metrics_instrumented = True
+
+    def snapshot(self) -> dict:
+        """Return all counters and p50/p95/p99 latencies as a JSON-serializable dict."""
+        tools = {}
+        with self._lock:
+            for name, stats in sorted(self._tools.items()):
+                tools[name] = {
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "stale_window_retries": stats.stale_retries,
+                    "webdriver_commands": stats.webdriver_commands,
+                    "cdp_commands": stats.cdp_commands,
+                    "mean_ms": round(stats.total_seconds / stats.calls * 1000, 2) if stats.calls else None,
+                    "p50_ms": _ms(stats.percentile(50)),
+                    "p95_ms": _ms(stats.percentile(95)),
+                    "p99_ms": _ms(stats.percentile(99)),
+                }
+            total_commands = self.webdriver_commands_total
+            total_cdp_commands = self.cdp_commands_total
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "webdriver_commands_total": total_commands,
+            "cdp_commands_total": total_cdp_commands,
+            "tools": tools,
+        }
+
+    def prometheus_text(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            items = sorted(self._tools.items())
+            counters = [
+                ("selenium_mcp_tool_calls_total", "Tool calls.", lambda s: s.calls),
+                ("selenium_mcp_tool_errors_total", "Tool calls that raised an error.", lambda s: s.errors),
+                ("selenium_mcp_tool_stale_window_retries_total", "Tool calls retried after a stale window.", lambda s: s.stale_retries),
+                ("selenium_mcp_webdriver_commands_total", "WebDriver HTTP commands issued by tool calls.", lambda s: s.webdriver_commands),
+                ("selenium_mcp_cdp_commands_total", "DevTools protocol commands issued by tool calls.", lambda s: s.cdp_commands),
+            ]
+            for metric, help_text, value in counters:
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} counter")
+                for name, stats in items:
+                    lines.append(f'{metric}{{tool="{name}"}} {value(stats)}')
+
+            metric = "selenium_mcp_tool_duration_seconds"
+            lines.append(f"# HELP {metric} Tool call latency.")
+            lines.append(f"# TYPE {metric} histogram")
+            for name, stats in items:
+                for bound, count in zip(LATENCY_BUCKETS, stats.bucket_counts):
+                    lines.append(f'{metric}_bucket{{tool="{name}",le="{bound}"}} {count}')
+                lines.append(f'{metric}_bucket{{tool="{name}",le="+Inf"}} {stats.calls}')
+                lines.append(f'{metric}_sum{{tool="{name}"}} {stats.total_seconds:.6f}')
+                lines.append(f'{metric}_count{{tool="{name}"}} {stats.calls}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus_file(self, path: str) -> None:
+        """Atomically write prometheus_text() to path (for node_exporter's textfile collector)."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+    def start_file_writer(self, path: str, interval: float = 15.0) -> None:
+        """Rewrite the Prometheus text file every interval seconds on a daemon thread."""
+        def loop():
+            while True:
+                try:
+                    self.write_prometheus_file(path)
+                except OSError as e:
+                    logger.error(f"Failed to write metrics file {path}: {str(e)}")
+                time.sleep(interval)
+
+        threading.Thread(target=loop, name="metrics-file-writer", daemon=True).start()
+        logger.info(f"Writing Prometheus metrics to {path} every {interval:.0f}s")
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+# Process-wide registry used by the server and tools
+metrics = MetricsRegistry()
@@ -0,0 +1,113 @@
+"""Debug-port allocation shared by all selenium MCP servers on a host.
+
+A port is obtained from the OS by binding to port 0, which is instant and
+only returns ports nothing is listening on. Between picking a port and Chrome
+binding it, another server could be handed the same number, so every
+reservation is also recorded in a JSON registry in the temp directory,
+guarded by an ``fcntl`` lock file. Ports reserved by another live process are
+skipped, entries of dead processes are pruned, and a server drops its own
+entries when its browser is quit.
+"""
+
+import json
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+try:
+    import fcntl
+except ImportError:  # Windows: reservations are only coordinated within this process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_PATH = os.path.join(tempfile.gettempdir(), "selenium-mcp-ports.json")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists but belongs to another user
+    return True
+
+
+class PortAllocator:
+    """Hands out free TCP ports and records them in a host-wide registry."""
+
+    def __init__(self, registry_path: str = REGISTRY_PATH, attempts: int = 50):
+        self.registry_path = registry_path
+        self.attempts = attempts
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _registry(self):
+        """Yield the registry dict while holding the host-wide lock; changes are written back."""
+        with self._lock, open(f"{self.registry_path}.lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(self.registry_path) as f:
+                        registry: Dict[str, dict] = json.load(f)
+                except (OSError, ValueError):
+                    registry = {}
+                before = dict(registry)
+                for port, entry in list(registry.items()):
+                    if not _pid_alive(entry.get("pid", 0)):
+                        del registry[port]
+                yield registry
+                if registry != before:
+                    tmp_path = f"{self.registry_path}.{os.getpid()}.tmp"
+                    with open(tmp_path, "w") as f:
+                        json.dump(registry, f, indent=2)
+                    os.replace(tmp_path, self.registry_path)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def reserve(self, owner: str = "") -> int:
+        """Return a free port reserved for this process.
+
+        Args:
+            owner: Free-form label stored with the reservation (e.g. the user data dir).
+
+        Raises:
+            RuntimeError: If no unreserved free port was found.
+        """
+        with self._registry() as registry:
+            for _ in range(self.attempts):
+                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                    s.bind(("127.0.0.1", 0))
+                    port = s.getsockname()[1]
+                if str(port) in registry:
+                    continue
+                registry[str(port)] = {"pid": os.getpid(), "owner": owner, "reserved_at": time.time()}
+                logger.debug(f"Reserved debug port {port} for {owner or 'pid ' + str(os.getpid())}")
+                return port
+        raise RuntimeError(f"No unreserved free port found after {self.attempts} attempts")
+
+    def release(self, port: int) -> None:
+        """Drop the reservation of port if this process holds it."""
+        with self._registry() as registry:
+            entry = registry.get(str(port))
+            if entry and entry.get("pid") == os.getpid():
+                del registry[str(port)]
+
+    def release_all(self) -> None:
+        """Drop every reservation held by this process."""
+        with self._registry() as registry:
+            for port, entry in list(registry.items()):
+                if entry.get("pid") == os.getpid():
+                    del registry[port]
+
+
+# Process-wide allocator used by the server and drivers
+port_allocator = PortAllocator()
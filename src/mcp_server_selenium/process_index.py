@@ -0,0 +1,129 @@
+"""Cached index of running Chrome processes by user data dir.
+
+Finding "the Chrome that uses this user data dir" used to mean reading every
+``/proc/*/cmdline`` once per question, up to three times per driver start.
+``ProcessIndex`` reads the process table once, keeps only processes started
+with ``--user-data-dir``, and serves all lookups from that snapshot until it
+is older than ``ttl`` seconds or explicitly invalidated (after launching or
+killing Chrome).
+"""
+
+import logging
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+_DIR_FLAG = "--user-data-dir="
+_PORT_FLAG = "--remote-debugging-port="
+# ps output joins argv with spaces; a flag value runs until the next " --"
+_PS_DIR_RE = re.compile(r"--user-data-dir=(.+?)(?= --|$)")
+_PORT_RE = re.compile(r"--remote-debugging-port=(\d+)")
+
+
+class ChromeProcess(NamedTuple):
+    """A process started with --user-data-dir."""
+
+    pid: int
+    user_data_dir: str
+    debug_port: Optional[int]
+    is_chrome: bool
+
+
+def _parse_args(pid: int, args: List[str]) -> Optional[ChromeProcess]:
+    user_data_dir = ""
+    port = None
+    for arg in args:
+        if arg.startswith(_DIR_FLAG):
+            user_data_dir = arg[len(_DIR_FLAG):]
+        elif arg.startswith(_PORT_FLAG) and arg[len(_PORT_FLAG):].isdigit():
+            port = int(arg[len(_PORT_FLAG):])
+    if not user_data_dir:
+        return None
+    cmdline = " ".join(args).lower()
+    return ChromeProcess(pid, user_data_dir, port, "chrome" in cmdline or "chromium" in cmdline)
+
+
+def _scan_proc() -> List[ChromeProcess]:
+    processes = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/cmdline", "rb") as f:
+                raw = f.read()
+        except (PermissionError, FileNotFoundError, ProcessLookupError):
+            continue
+        if _DIR_FLAG.encode() not in raw:
+            continue
+        args = raw.decode("utf-8", errors="replace").split("\0")
+        process = _parse_args(int(entry), args)
+        if process is not None:
+            processes.append(process)
+    return processes
+
+
+def _scan_ps() -> List[ChromeProcess]:
+    """macOS / other platforms: parse `ps` output (argv joined by spaces)."""
+    result = subprocess.run(["ps", "-axo", "pid=,args="], capture_output=True, text=True, timeout=3)
+    processes = []
+    for line in result.stdout.splitlines():
+        pid, _, cmdline = line.strip().partition(" ")
+        match = _PS_DIR_RE.search(cmdline)
+        if not pid.isdigit() or not match:
+            continue
+        port = _PORT_RE.search(cmdline)
+        lowered = cmdline.lower()
+        processes.append(ChromeProcess(
+            int(pid), match.group(1), int(port.group(1)) if port else None,
+            "chrome" in lowered or "chromium" in lowered,
+        ))
+    return processes
+
+
+class ProcessIndex:
+    """Snapshot of processes by user data dir, refreshed at most every ttl seconds."""
+
+    def __init__(self, ttl: float = 2.0):
+        self.ttl = ttl
+        self._by_dir: Dict[str, List[ChromeProcess]] = {}
+        self._scanned_at = 0.0
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """Force the next lookup to rescan (call after starting or killing Chrome)."""
+        with self._lock:
+            self._scanned_at = 0.0
+
+    def _snapshot(self) -> Dict[str, List[ChromeProcess]]:
+        with self._lock:
+            if time.monotonic() - self._scanned_at >= self.ttl:
+                start = time.perf_counter()
+                processes = _scan_proc() if sys.platform == "linux" else _scan_ps()
+                by_dir: Dict[str, List[ChromeProcess]] = {}
+                for process in processes:
+                    by_dir.setdefault(process.user_data_dir.rstrip("/"), []).append(process)
+                self._by_dir = by_dir
+                self._scanned_at = time.monotonic()
+                logger.debug(
+                    f"Indexed {len(processes)} processes with --user-data-dir "
+                    f"in {(time.perf_counter() - start) * 1000:.1f}ms"
+                )
+            return self._by_dir
+
+    def by_user_data_dir(self, user_data_dir: str) -> List[ChromeProcess]:
+        """Processes started with --user-data-dir=user_data_dir."""
+        return list(self._snapshot().get(user_data_dir.rstrip("/"), []))
+
+    def debug_ports(self, user_data_dir: str) -> List[int]:
+        """Remote debugging ports of the processes using user_data_dir."""
+        return [p.debug_port for p in self.by_user_data_dir(user_data_dir) if p.debug_port]
+
+
+# Process-wide index shared by all driver instances
+process_index = ProcessIndex()
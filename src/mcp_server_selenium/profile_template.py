@@ -0,0 +1,144 @@
+"""Clone fresh Chrome user data dirs from a pre-warmed template.
+
+A brand-new user data dir costs Chrome its first-run profile initialization
+(preferences, component data, databases) and starts with a cold HTTP cache.
+With ``--profile-template DIR`` every user data dir the server creates (the
+default one when ``--user_data_dir`` is not given, pooled sessions and
+standby spares) is cloned from DIR before Chrome starts. Existing, non-empty
+user data dirs are never touched.
+
+If DIR does not exist it is built once, the first time it is needed: Chrome
+is started on it, the ``--profile-template-url`` pages are loaded to fill the
+cache, and Chrome is closed cleanly. A profile prepared by hand (e.g. with
+logins) can be used as the template as well.
+
+Clones use ``cp --reflink=auto`` on Linux and ``cp -c`` (clonefile) on macOS,
+which share blocks with the template on copy-on-write filesystems (btrfs, XFS,
+APFS) and fall back to a regular copy elsewhere. Hard links are not used:
+Chrome updates its databases in place and would write through to the template.
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Callable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Files that belong to one running Chrome and must not be cloned
+_RUNTIME_FILES = ("SingletonLock", "SingletonSocket", "SingletonCookie", "DevToolsActivePort", ".selenium_debug_port")
+
+
+class ProfileTemplate:
+    """Builds the template user data dir once and clones it into new user data dirs."""
+
+    def __init__(self):
+        self.template_dir = ""
+        self.warmup_urls: List[str] = []
+        self.factory: Optional[Callable[[str], Any]] = None
+        self.clones = 0
+        self._lock = threading.Lock()
+
+    def configure(self, template_dir: str, warmup_urls: Sequence[str] = (),
+                  factory: Optional[Callable[[str], Any]] = None) -> None:
+        """Apply --profile-template / --profile-template-url; factory creates the driver that builds the template."""
+        self.template_dir = os.path.realpath(template_dir) if template_dir else ""
+        self.warmup_urls = list(warmup_urls)
+        self.factory = factory
+
+    def clone_into(self, user_data_dir: str) -> bool:
+        """Populate a new or empty user_data_dir from the template; returns True if it was cloned."""
+        if not self.template_dir:
+            return False
+        # The template itself and the scratch dir it is being built in
+        target = os.path.realpath(user_data_dir)
+        if target == self.template_dir or target.startswith(f"{self.template_dir}.building-"):
+            return False
+        if os.path.isdir(user_data_dir) and os.listdir(user_data_dir):
+            return False
+        if not self._ensure_built():
+            return False
+
+        start = time.monotonic()
+        try:
+            os.makedirs(user_data_dir, exist_ok=True)
+            _copy_tree(self.template_dir, user_data_dir)
+        except Exception as e:
+            logger.error(f"Failed to clone profile template {self.template_dir} into {user_data_dir}: {str(e)}")
+            shutil.rmtree(user_data_dir, ignore_errors=True)
+            return False
+        _remove_runtime_files(user_data_dir)
+        self.clones += 1
+        logger.info(f"Cloned profile template into {user_data_dir} in {time.monotonic() - start:.2f}s")
+        return True
+
+    def _ensure_built(self) -> bool:
+        with self._lock:
+            if os.path.isdir(self.template_dir):
+                return True
+            if self.factory is None:
+                logger.error(f"Profile template {self.template_dir} does not exist")
+                return False
+            return self._build()
+
+    def _build(self) -> bool:
+        """Start Chrome on a scratch dir, load the warm-up pages, close it and publish the dir."""
+        start = time.monotonic()
+        scratch_dir = f"{self.template_dir}.building-{os.getpid()}"
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+        logger.info(f"Building profile template {self.template_dir}")
+        instance = None
+        try:
+            instance = self.factory(scratch_dir)
+            driver = instance.ensure_driver_initialized()
+            for url in self.warmup_urls:
+                try:
+                    driver.get(url)
+                except Exception as e:
+                    logger.warning(f"Profile template warm-up of {url} failed: {str(e)}")
+            instance.close_browser()
+            _remove_runtime_files(scratch_dir)
+            os.makedirs(os.path.dirname(self.template_dir), exist_ok=True)
+            os.rename(scratch_dir, self.template_dir)
+        except Exception as e:
+            logger.error(f"Failed to build profile template {self.template_dir}: {str(e)}")
+            if instance is not None:
+                instance.close_browser()
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+            return False
+        logger.info(f"Built profile template {self.template_dir} in {time.monotonic() - start:.1f}s")
+        return True
+
+    def describe(self) -> dict:
+        """Return the template state as a JSON-serializable dict."""
+        return {
+            "template_dir": self.template_dir,
+            "built": bool(self.template_dir) and os.path.isdir(self.template_dir),
+            "clones": self.clones,
+        }
+
+
+def _copy_tree(src: str, dst: str) -> None:
+    if sys.platform.startswith("linux"):
+        subprocess.run(["cp", "-a", "--reflink=auto", f"{src}/.", dst], check=True, capture_output=True)
+    elif sys.platform == "darwin":
+        subprocess.run(["cp", "-Rpc", f"{src}/.", dst], check=True, capture_output=True)
+    else:
+        shutil.copytree(src, dst, symlinks=True, dirs_exist_ok=True)
+
+
+def _remove_runtime_files(user_data_dir: str) -> None:
+    for name in _RUNTIME_FILES:
+        path = os.path.join(user_data_dir, name)
+        if os.path.lexists(path):
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.debug(f"Could not remove {path}: {e}")
+
+
+profile_template = ProfileTemplate()
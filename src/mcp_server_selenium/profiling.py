@@ -0,0 +1,111 @@
+"""Opt-in cProfile capture of individual tool calls.
+
+Enabled with ``--profile-calls DIR`` or the ``SELENIUM_MCP_PROFILE_DIR``
+environment variable (optionally narrowed to some tools with
+``--profile-tool`` / ``SELENIUM_MCP_PROFILE_TOOLS=navigate,get_elements``).
+Each profiled call writes two files to DIR:
+
+- ``<time>-<tool>-<n>.prof``: the raw profile, for ``python -m pstats``,
+  snakeviz and similar viewers
+- ``<time>-<tool>-<n>.json``: the tool name, its arguments, wall time and the
+  functions with the highest cumulative time, so slow calls can be spotted
+  without opening every profile
+
+Only one call is profiled at a time; calls that start while another one is
+being profiled (including tools called by a profiled tool) run unprofiled.
+"""
+
+import cProfile
+import io
+import itertools
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable
+
+logger = logging.getLogger(__name__)
+
+# Number of functions listed in the JSON summary of a profile
+SUMMARY_FUNCTIONS = 25
+
+
+class CallProfiler:
+    """Profiles tool calls into per-call files when a directory is configured."""
+
+    def __init__(self):
+        self.directory = os.environ.get("SELENIUM_MCP_PROFILE_DIR", "")
+        tools = os.environ.get("SELENIUM_MCP_PROFILE_TOOLS", "")
+        self.tools = {name.strip() for name in tools.split(",") if name.strip()}
+        # cProfile cannot run two profilers at once on Python 3.12+
+        self._active = threading.Lock()
+        self._counter = itertools.count(1)
+
+    def configure(self, directory: str, tools: Iterable[str] = ()) -> None:
+        """Enable profiling into directory (empty disables it), optionally for some tools only."""
+        self.directory = directory
+        self.tools = set(tools)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            logger.info(f"Profiling {', '.join(sorted(self.tools)) or 'all'} tool calls into {directory}")
+
+    def enabled_for(self, tool_name: str) -> bool:
+        return bool(self.directory) and (not self.tools or tool_name in self.tools)
+
+    @contextmanager
+    def profile(self, tool_name: str, arguments: Dict[str, Any]):
+        """Profile the enclosed tool call if profiling is enabled for tool_name."""
+        if not self.enabled_for(tool_name) or not self._active.acquire(blocking=False):
+            yield
+            return
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+        finally:
+            self._active.release()
+            self._write(profiler, tool_name, arguments, time.perf_counter() - start)
+
+    def _write(self, profiler: cProfile.Profile, tool_name: str, arguments: Dict[str, Any], seconds: float) -> None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        base = os.path.join(self.directory, f"{stamp}-{tool_name}-{next(self._counter)}")
+        try:
+            profiler.dump_stats(f"{base}.prof")
+            with open(f"{base}.json", "w") as f:
+                json.dump({
+                    "tool": tool_name,
+                    "arguments": arguments,
+                    "wall_seconds": round(seconds, 6),
+                    "profile": f"{base}.prof",
+                    "top_cumulative": _summarize(profiler),
+                }, f, indent=2, default=repr)
+            logger.info(f"Wrote profile of {tool_name} ({seconds:.3f}s) to {base}.prof")
+        except OSError as e:
+            logger.error(f"Failed to write profile of {tool_name}: {str(e)}")
+
+
+def _summarize(profiler: cProfile.Profile) -> list:
+    """The functions with the highest cumulative time, as JSON-friendly dicts."""
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = []
+    for (filename, line, name), (_, calls, own, cumulative, _) in stats.stats.items():
+        rows.append({
+            "function": f"{os.path.basename(filename)}:{line}({name})",
+            "calls": calls,
+            "own_seconds": round(own, 6),
+            "cumulative_seconds": round(cumulative, 6),
+        })
+    rows.sort(key=lambda row: row["cumulative_seconds"], reverse=True)
+    return rows[:SUMMARY_FUNCTIONS]
+
+
+# Process-wide profiler used by auto_recover_stale_window
+profiler = CallProfiler()
@@ -0,0 +1,221 @@
+"""Resource usage of Chrome process trees and automatic browser recycling.
+
+``sample_chrome_tree()`` sums the RSS and CPU time of every process started
+with a user data dir plus all of their descendants (renderers, GPU and
+utility processes), from ``/proc/<pid>/stat`` on Linux or ``ps`` elsewhere.
+RSS is summed per process, so memory shared between Chrome processes is
+counted more than once; the figure is meant for spotting growth, not for
+exact accounting.
+
+With ``--max-browser-rss`` or ``--max-browser-cpu`` the ``resource_governor``
+thread samples every watched driver instance every ``--resource-check-interval``
+seconds. When a limit is crossed the instance is asked to recycle: the
+driver does it at the start of its next tool call (under the session lock), by
+replacing all tabs with one fresh tab on the current URL, or by restarting
+Chrome and reopening the URL. A tab recycle that does not bring the browser
+back under its limits is followed by a restart on the next check.
+"""
+
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+import weakref
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .process_index import process_index
+
+logger = logging.getLogger(__name__)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+class ResourceUsage(NamedTuple):
+    """Totals over one Chrome process tree at one point in time."""
+
+    pids: List[int]
+    rss_bytes: int
+    cpu_seconds: float
+    sampled_at: float  # time.monotonic()
+
+
+def _read_proc_stat(pid: str) -> Optional[Tuple[int, int, float]]:
+    """Return (ppid, rss bytes, cpu seconds) of a process from /proc/<pid>/stat."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            data = f.read()
+    except OSError:
+        return None
+    # The command name may contain spaces and parentheses; fields resume after the last ")"
+    fields = data[data.rindex(")") + 2:].split()
+    ppid, utime, stime, rss = int(fields[1]), int(fields[11]), int(fields[12]), int(fields[21])
+    return ppid, rss * _PAGE_SIZE, (utime + stime) / _CLOCK_TICKS
+
+
+def _process_table_proc() -> Dict[int, Tuple[int, int, float]]:
+    table = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            stat = _read_proc_stat(entry)
+            if stat is not None:
+                table[int(entry)] = stat
+    return table
+
+
+def _parse_cpu_time(value: str) -> float:
+    """Parse ps TIME ("[[dd-]hh:]mm:ss[.ss]") into seconds."""
+    days, _, clock = value.rpartition("-")
+    seconds = 0.0
+    for part in clock.split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds + int(days or 0) * 86400
+
+
+def _process_table_ps() -> Dict[int, Tuple[int, int, float]]:
+    result = subprocess.run(["ps", "-axo", "pid=,ppid=,rss=,time="], capture_output=True, text=True, timeout=3)
+    table = {}
+    for line in result.stdout.splitlines():
+        parts = line.split()
+        if len(parts) == 4 and parts[0].isdigit():
+            table[int(parts[0])] = (int(parts[1]), int(parts[2]) * 1024, _parse_cpu_time(parts[3]))
+    return table
+
+
+def _tree(roots: Iterable[int], table: Dict[int, Tuple[int, int, float]]) -> List[int]:
+    children: Dict[int, List[int]] = {}
+    for pid, (ppid, _, _) in table.items():
+        children.setdefault(ppid, []).append(pid)
+    members = set()
+    stack = [pid for pid in roots if pid in table]
+    while stack:
+        pid = stack.pop()
+        if pid not in members:
+            members.add(pid)
+            stack.extend(children.get(pid, []))
+    return sorted(members)
+
+
+def _process_table() -> Dict[int, Tuple[int, int, float]]:
+    return _process_table_proc() if sys.platform == "linux" else _process_table_ps()
+
+
+def chrome_tree_pids(user_data_dir: str) -> List[int]:
+    """Pids of the processes using user_data_dir and all of their descendants."""
+    process_index.invalidate()
+    roots = [p.pid for p in process_index.by_user_data_dir(user_data_dir)]
+    return _tree(roots, _process_table())
+
+
+def sample_chrome_tree(user_data_dir: str) -> ResourceUsage:
+    """Sum RSS and CPU time over the Chrome processes using user_data_dir and their descendants."""
+    process_index.invalidate()
+    roots = [p.pid for p in process_index.by_user_data_dir(user_data_dir)]
+    table = _process_table()
+    pids = _tree(roots, table)
+    return ResourceUsage(
+        pids=pids,
+        rss_bytes=sum(table[pid][1] for pid in pids),
+        cpu_seconds=sum(table[pid][2] for pid in pids),
+        sampled_at=time.monotonic(),
+    )
+
+
+class ResourceGovernor:
+    """Samples watched driver instances and asks them to recycle when a limit is crossed."""
+
+    def __init__(self):
+        self.max_rss_mb = 0
+        self.max_cpu_percent = 0.0
+        self.interval = 15.0
+        self.action = "tab"
+        self._instances: "weakref.WeakSet[Any]" = weakref.WeakSet()
+        self._previous: "weakref.WeakKeyDictionary[Any, ResourceUsage]" = weakref.WeakKeyDictionary()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def configure(self, max_rss_mb: int, max_cpu_percent: float, interval: float, action: str) -> None:
+        """Apply --max-browser-rss, --max-browser-cpu, --resource-check-interval and --recycle-action."""
+        self.max_rss_mb = max_rss_mb
+        self.max_cpu_percent = max_cpu_percent
+        self.interval = interval
+        self.action = action
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_rss_mb > 0 or self.max_cpu_percent > 0
+
+    def watch(self, instance: Any) -> None:
+        """Start sampling a driver instance whose browser is running."""
+        with self._lock:
+            self._instances.add(instance)
+            if self.enabled and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="resource-governor", daemon=True)
+                self._thread.start()
+
+    def unwatch(self, instance: Any) -> None:
+        with self._lock:
+            self._instances.discard(instance)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                instances = list(self._instances)
+            for instance in instances:
+                try:
+                    self.check(instance)
+                except Exception as e:
+                    logger.warning(f"Resource check of {instance.user_data_dir} failed: {str(e)}")
+
+    def sample(self, instance: Any) -> dict:
+        """Sample an instance's Chrome tree, record it on the instance and return it as a dict."""
+        usage = sample_chrome_tree(instance.user_data_dir)
+        with self._lock:
+            previous = self._previous.get(instance)
+            self._previous[instance] = usage
+        cpu_percent = None
+        if previous is not None and usage.sampled_at > previous.sampled_at:
+            delta = usage.cpu_seconds - previous.cpu_seconds
+            # A drop means Chrome was restarted in between
+            if delta >= 0:
+                cpu_percent = round(100 * delta / (usage.sampled_at - previous.sampled_at), 1)
+        instance.resource_usage = {
+            "processes": len(usage.pids),
+            "rss_mb": round(usage.rss_bytes / (1024 * 1024), 1),
+            "cpu_seconds": round(usage.cpu_seconds, 1),
+            "cpu_percent": cpu_percent,
+            "sampled_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        return instance.resource_usage
+
+    def check(self, instance: Any) -> None:
+        """Sample an instance and request a recycle if it is over a limit."""
+        usage = self.sample(instance)
+        reasons = []
+        if self.max_rss_mb and usage["rss_mb"] > self.max_rss_mb:
+            reasons.append(f"RSS {usage['rss_mb']:.0f} MB > {self.max_rss_mb} MB")
+        if self.max_cpu_percent and (usage["cpu_percent"] or 0) > self.max_cpu_percent:
+            reasons.append(f"CPU {usage['cpu_percent']:.0f}% > {self.max_cpu_percent:.0f}%")
+        if not reasons:
+            instance.last_recycle = ""
+            return
+        # Escalate to a restart when recycling the tabs was not enough
+        action = "restart" if self.action == "restart" or instance.last_recycle == "tab" else "tab"
+        instance.request_recycle(action, ", ".join(reasons))
+
+    def describe(self) -> dict:
+        """Return the configured limits as a JSON-serializable dict."""
+        return {
+            "enabled": self.enabled,
+            "max_rss_mb": self.max_rss_mb,
+            "max_cpu_percent": self.max_cpu_percent,
+            "check_interval": self.interval,
+            "recycle_action": self.action,
+        }
+
+
+# Process-wide governor shared by all driver instances
+resource_governor = ResourceGovernor()
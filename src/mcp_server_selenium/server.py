@@ -1,16 +1,30 @@
 import functools
+import inspect
 import logging
-import socket
-from typing import Optional, Union
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Union
 
+import anyio
 from mcp.server.fastmcp import FastMCP
-from .drivers.normal_chrome import NormalChromeDriver
-from .drivers.undetected_chrome import UndetectedChromeDriver
+from .executor import ToolExecutor
+from .metrics import metrics
+from .ports import port_allocator
+from .profile_template import profile_template
+from .profiling import profiler
+from .session_pool import SessionPool
+from .standby import StandbyBrowser
+from .warmup import BrowserWarmup
+
+if TYPE_CHECKING:
+    # Driver modules pull in selenium and undetected_chromedriver; they are
+    # imported on first use by get_driver_factory() to keep startup fast.
+    from .drivers.normal_chrome import NormalChromeDriver
+    from .drivers.undetected_chrome import UndetectedChromeDriver
 
 logger = logging.getLogger(__name__)
 
 # Global variable to store WebDriver instance
-driver_instance: Optional[Union[NormalChromeDriver, UndetectedChromeDriver]] = None
+driver_instance: Optional[Union["NormalChromeDriver", "UndetectedChromeDriver"]] = None
 
 # Global variable for Chrome user data directory
 user_data_dir: str = ""
@@ -19,38 +33,110 @@ user_data_dir: str = ""
 debug_port: int = 0
 
 
-def find_available_port(start: int = 20000, end: int = 30000) -> int:
-    """Find an available port in the given range."""
-    for port in range(start, end):
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.settimeout(0.1)
-                result = s.connect_ex(('127.0.0.1', port))
-                if result != 0:  # Port is NOT in use
-                    return port
-        except OSError:
-            continue
-    raise RuntimeError(f"No available port found in range {start}-{end}")
-
 # Global variable for driver type
 driver_type: str = "normal_chromedriver"
 
 # Global variable for Chrome profile
 profile: str = "Default"
 
+# Seconds a passed window-health check is trusted before tools probe the window again
+health_check_interval: float = 10.0
+
+# Chrome flag set (see launch_profiles), window size and extra flags for browsers we launch
+launch_profile: str = "default"
+window_size: str = ""
+chrome_args: List[str] = []
+
+# Worker pool that runs synchronous tool bodies off the event loop
+tool_executor = ToolExecutor()
+
+# When True, HTTP clients that do not pass a session_id get a pooled browser of their own
+client_affinity: bool = False
+
+
+def client_session_id() -> str:
+    """Return a session id derived from the MCP client of the current HTTP request.
+
+    Returns an empty string outside of an HTTP request (e.g. on stdio).
+    """
+    try:
+        request = mcp.get_context().request_context.request
+    except (LookupError, ValueError):
+        return ""
+    headers = getattr(request, "headers", None)
+    mcp_session_id = headers.get("mcp-session-id", "") if headers is not None else ""
+    return f"client-{mcp_session_id[:12]}" if mcp_session_id else ""
+
+
+def offload_to_executor(func, tool_name: str):
+    """Wrap a synchronous tool so FastMCP awaits it on the tool executor.
+
+    The call is queued on the lane of its ``session_id`` argument, so tools
+    on one browser run in order while other sessions and async tools keep
+    being served. With client affinity enabled, calls without a session_id
+    are pinned to a browser session owned by the calling HTTP client.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if client_affinity and kwargs.get("session_id") == "":
+            kwargs["session_id"] = client_session_id()
+        return await tool_executor.run(kwargs.get("session_id", ""), tool_name, func, *args, **kwargs)
+    return wrapper
+
+
+# Registered tool functions by tool name, as defined (before offloading); used by run_batch
+tool_functions: Dict[str, Callable] = {}
+
+
+class SeleniumMCP(FastMCP):
+    """FastMCP that runs synchronous tools on the tool executor instead of the event loop."""
+
+    def add_tool(self, fn, name: Optional[str] = None, **kwargs) -> None:
+        tool_functions[name or fn.__name__] = fn
+        if not inspect.iscoroutinefunction(fn):
+            fn = offload_to_executor(fn, name or fn.__name__)
+        super().add_tool(fn, name=name, **kwargs)
+
+    def run_http(self, host: str, port: int, max_connections: int) -> None:
+        """Serve the streamable HTTP transport so many MCP clients can share this server.
+
+        Connections beyond max_connections are answered with HTTP 503 by uvicorn.
+        """
+        import uvicorn
+
+        self.settings.host = host
+        self.settings.port = port
+        config = uvicorn.Config(
+            self.streamable_http_app(),
+            host=host,
+            port=port,
+            log_level=self.settings.log_level.lower(),
+            limit_concurrency=max_connections,
+        )
+        anyio.run(uvicorn.Server(config).serve)
+
+
 # Initialize FastMCP
-mcp = FastMCP(
+mcp = SeleniumMCP(
     name="mcp-selenium-sync",
 )
 
 
 def get_driver_factory(driver_type: str = "normal_chromedriver"):
-    """Get the appropriate driver factory based on driver type."""
+    """Get the appropriate driver factory based on driver type.
+
+    The driver module is imported here rather than at module level so that
+    selenium / undetected_chromedriver are only loaded once a browser is needed.
+    """
     if driver_type == "normal_chromedriver":
+        from .drivers.normal_chrome import NormalChromeDriver
         return NormalChromeDriver
+    elif driver_type == "cdp_chromedriver":
+        from .drivers.cdp_chrome import CDPChromeDriver
+        return CDPChromeDriver
     elif driver_type == "undetected_chrome_driver":
         # Check if undetected chrome driver is available
-        from .drivers.undetected_chrome import UC_AVAILABLE
+        from .drivers.undetected_chrome import UC_AVAILABLE, UndetectedChromeDriver
         if not UC_AVAILABLE:
             raise ImportError(
                 "undetected-chromedriver is not installed. "
@@ -61,6 +147,33 @@ def get_driver_factory(driver_type: str = "normal_chromedriver"):
         raise ValueError(f"Unsupported driver type: {driver_type}")
 
 
+def create_driver_instance(data_dir: str = "", profile_name: str = ""):
+    """Create a driver instance of the configured type without registering it globally."""
+    driver_class = get_driver_factory(driver_type)
+    instance = driver_class(user_data_dir=data_dir, profile=profile_name or profile)
+    if hasattr(instance, "health_check_interval"):
+        instance.health_check_interval = health_check_interval
+    if hasattr(instance, "launch_profile"):
+        instance.launch_profile = launch_profile
+        instance.window_size = window_size
+        instance.extra_chrome_args = list(chrome_args)
+    return instance
+
+
+def create_template_builder(data_dir: str):
+    """Create the driver that builds the --profile-template dir.
+
+    Always the normal driver with the configured launch flags: undetected
+    Chrome manages its own user data dir and does not use the template.
+    """
+    from .drivers.normal_chrome import NormalChromeDriver
+    instance = NormalChromeDriver(user_data_dir=data_dir, profile=profile)
+    instance.launch_profile = launch_profile
+    instance.window_size = window_size
+    instance.extra_chrome_args = list(chrome_args)
+    return instance
+
+
 def initialize_driver_instance(custom_user_data_dir: str = "", custom_debug_port: Optional[int] = None, custom_profile: str = ""):
     """Initialize the global driver instance based on driver type."""
     global driver_instance, user_data_dir, debug_port, driver_type, profile
@@ -70,39 +183,126 @@ def initialize_driver_instance(custom_user_data_dir: str = "", custom_debug_port
     port = custom_debug_port or debug_port
     profile_name = custom_profile or profile
     
-    # Get the appropriate driver class
-    driver_class = get_driver_factory(driver_type)
-    
     # Initialize the driver instance
-    driver_instance = driver_class(user_data_dir=data_dir, profile=profile_name)
+    driver_instance = create_driver_instance(data_dir, profile_name)
+    # --port applies to the default browser only; pooled sessions reserve their own ports
+    if port and hasattr(driver_instance, "requested_debug_port"):
+        driver_instance.requested_debug_port = port
     
     logger.info(f"Initialized {driver_type} driver instance")
     return driver_instance
 
 
-def ensure_driver_initialized():
+# Pool of named browser sessions; the default session ("") is driver_instance
+session_pool = SessionPool(factory=create_driver_instance)
+
+# Serializes tool calls on the default session
+default_session_lock = threading.RLock()
+
+# Optional pre-launched browser that replaces a dead default browser (--standby-browser)
+standby_browser = StandbyBrowser(factory=create_driver_instance)
+
+# Background launch of the default browser (--startup background)
+browser_warmup = BrowserWarmup()
+
+# Seconds a tool call waits for the background launch before giving up
+warmup_timeout: float = 60.0
+
+
+def start_browser_warmup():
+    """Launch the default browser on a background thread.
+
+    Returns a future that completes once the browser is ready. Tool calls on
+    the default session wait for it in ensure_driver_initialized().
+    """
+    def launch():
+        browser_warmup.set_phase("loading driver")
+        instance = initialize_driver_instance()
+        browser_warmup.set_phase("launching browser")
+        instance.ensure_driver_initialized()
+        return instance
+
+    return browser_warmup.start(launch)
+
+
+def get_driver_instance(session_id: str = ""):
+    """Return the driver instance that owns session_id (None if the default one is not created yet).
+
+    Raises:
+        RuntimeError: If session_id names a session that was closed.
+    """
+    if session_id:
+        return session_pool.lookup(session_id).driver_instance
+    return driver_instance
+
+
+def session_lock(session_id: str = ""):
+    """Return a context manager that serializes tool calls on session_id.
+
+    For named sessions it re-acquires the session if it was closed while the
+    call waited for its lock.
+    """
+    if session_id:
+        return session_pool.locked(session_id)
+    return default_session_lock
+
+
+def reset_driver_instance(session_id: str = "") -> None:
+    """Replace the driver of a session after its browser died.
+
+    A ready standby browser (or, for named sessions, a warm pool spare) takes
+    over right away; otherwise the next tool call starts a fresh browser.
+    """
+    global driver_instance
+    if session_id:
+        session_pool.reset(session_id)
+        return
+    old_instance = driver_instance
+    driver_instance = standby_browser.promote()
+    if old_instance is not None and driver_instance is not None:
+        threading.Thread(target=standby_browser.discard, args=(old_instance,), name="discard-browser", daemon=True).start()
+
+
+def ensure_driver_initialized(session_id: str = ""):
     """Ensure that the WebDriver is initialized.
     
-    This function checks if the global WebDriver instance is initialized.
+    This function checks if the WebDriver instance of the given session is initialized.
     If not, it initializes a new WebDriver instance.
     
+    Args:
+        session_id: Browser session to use. Empty means the default browser
+            configured on the command line; any other value is served by the session pool.
+    
     Returns:
         The initialized WebDriver instance.
         
     Raises:
-        RuntimeError: If the WebDriver fails to initialize.
+        RuntimeError: If the WebDriver fails to initialize, the named session was closed
+            or the background browser launch is still running after warmup_timeout.
     """
     global driver_instance
     
-    if driver_instance is None:
-        logger.info("Driver instance is not initialized, initializing now...")
-        driver_instance = initialize_driver_instance()
+    if session_id:
+        driver = session_pool.lookup(session_id).driver_instance.ensure_driver_initialized()
+    else:
+        # Let a background launch finish instead of starting a second browser;
+        # if it failed, the browser is launched again below
+        if browser_warmup.in_progress:
+            browser_warmup.wait(warmup_timeout)
+        
+        if driver_instance is None:
+            logger.info("Driver instance is not initialized, initializing now...")
+            driver_instance = initialize_driver_instance()
+        
+        # Ensure the actual selenium driver is initialized
+        driver = driver_instance.ensure_driver_initialized()
     
-    # Ensure the actual selenium driver is initialized
-    return driver_instance.ensure_driver_initialized()
+    # Count WebDriver round trips per tool (no-op once the driver is instrumented)
+    metrics.instrument_driver(driver)
+    return driver
 
 
-def recover_from_stale_window() -> None:
+def recover_from_stale_window(session_id: str = "") -> None:
     """Recover from a 'no such window' error by switching to a valid window.
 
     Call this from any tool's except block when the error message contains
@@ -110,10 +310,22 @@ def recover_from_stale_window() -> None:
     the file as a WARNING but the error is NOT returned to the MCP client —
     the tool should retry its operation after calling this.
     """
-    global driver_instance
-    if driver_instance is not None:
+    instance = get_driver_instance(session_id)
+    if instance is not None:
         logger.warning("Stale window detected — recovering silently")
-        driver_instance._recover_window_handle()
+        instance._recover_window_handle()
+
+
+def invalidate_window_health(session_id: str = "") -> None:
+    """Make the next tool call on session_id re-check its browser window."""
+    try:
+        instance = get_driver_instance(session_id)
+    except RuntimeError:
+        # The session was closed during the call; there is no window left to check
+        return
+    mark_unhealthy = getattr(instance, "mark_window_unhealthy", None)
+    if mark_unhealthy is not None:
+        mark_unhealthy()
 
 
 def is_stale_window_error(error_msg: str) -> bool:
@@ -124,6 +336,12 @@ def is_stale_window_error(error_msg: str) -> bool:
 def auto_recover_stale_window(func):
     """Decorator: silently recover from 'no such window' errors and retry once.
 
+    The call runs while holding the lock of the browser session named by the
+    tool's ``session_id`` argument, so calls on one browser are serialized
+    while different sessions run independently. Latency, errors, stale-window
+    retries and WebDriver commands of the call are recorded in ``metrics``,
+    and the call is profiled when ``--profile-calls`` is enabled.
+
     If the wrapped function raises an exception whose message indicates a stale
     window, the decorator will:
       1. Log the error to the log file (WARNING, not ERROR)
@@ -132,38 +350,69 @@ def auto_recover_stale_window(func):
       4. Retry the function exactly once
     If the retry also fails, the exception propagates normally.
     """
+    signature = inspect.signature(func)
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        try:
-            return func(*args, **kwargs)
-        except Exception as e:
-            if is_stale_window_error(str(e)):
-                logger.warning(
-                    f"Stale window in {func.__name__}() — recovering and retrying"
-                )
-                recover_from_stale_window()
+        arguments = signature.bind_partial(*args, **kwargs).arguments
+        session_id = arguments.get("session_id", "")
+        with session_lock(session_id), metrics.track(func.__name__) as call, \
+                profiler.profile(func.__name__, dict(arguments)):
+            try:
                 return func(*args, **kwargs)
-            raise
+            except Exception as e:
+                if is_stale_window_error(str(e)):
+                    logger.warning(
+                        f"Stale window in {func.__name__}() — recovering and retrying"
+                    )
+                    call.stale_retry()
+                    recover_from_stale_window(session_id)
+                    return func(*args, **kwargs)
+                invalidate_window_health(session_id)
+                raise
     return wrapper
 
 
-def get_driver():
-    """Get the current selenium driver instance."""
-    global driver_instance
+def get_driver(session_id: str = ""):
+    """Get the current selenium driver instance of a session."""
+    instance = get_driver_instance(session_id)
     
-    if driver_instance is None:
-        ensure_driver_initialized()
+    if instance is None:
+        ensure_driver_initialized(session_id)
+        instance = get_driver_instance(session_id)
     
-    if driver_instance is not None:
-        return driver_instance.driver
+    if instance is not None:
+        return instance.driver
     else:
         raise RuntimeError("Driver instance is not initialized")
 
 
+def get_cdp_session(session_id: str = ""):
+    """Return a CDP session for the current tab of a browser session.
+
+    The session is attached over the driver's long-lived DevTools connection
+    (see cdp.py) and cached there, so repeated calls cost no connection setup.
+    """
+    ensure_driver_initialized(session_id)
+    instance = get_driver_instance(session_id)
+    if not hasattr(instance, "cdp"):
+        raise RuntimeError(f"The {driver_type} driver does not provide a DevTools connection")
+    return instance.cdp().session(instance.current_target_id())
+
+
 def quit_driver():
-    """Quit the current driver instance."""
+    """Quit the current driver instance and close all pooled sessions."""
     global driver_instance
     
+    session_pool.close_all()
+    
     if driver_instance is not None:
-        driver_instance.quit()
+        if standby_browser.owns(driver_instance):
+            # A promoted standby runs on a throwaway profile; close it for good
+            standby_browser.discard(driver_instance)
+        else:
+            driver_instance.quit()
         driver_instance = None
+    
+    standby_browser.close()
+    port_allocator.release_all()
@@ -0,0 +1,296 @@
+"""Pool of named browser sessions for the selenium MCP server.
+
+The default session ("") is the browser configured on the command line and is
+owned by ``server.py``. Every other session key gets its own browser from this
+pool: a separate driver instance with its own Chrome user data dir (and thus
+its own debug port), its own lock, and an idle timer after which the browser
+is closed again.
+"""
+
+import logging
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserSession:
+    """A pooled browser plus the bookkeeping the pool keeps for it."""
+
+    def __init__(self, slot: int, user_data_dir: str, driver_instance: Any):
+        self.slot = slot
+        self.key = ""  # Empty while the session is an unassigned warm spare
+        self.user_data_dir = user_data_dir
+        self.driver_instance = driver_instance
+        # Re-entrant so tools that call other tools keep the same lock
+        self.lock = threading.RLock()
+        self.created_at = time.time()
+        self.last_used = self.created_at
+        # Set under the pool lock when the session leaves the pool; holders of
+        # a reference must then not use it (see SessionPool.locked)
+        self.closed = False
+
+    def touch(self) -> None:
+        self.last_used = time.time()
+
+    def describe(self) -> dict:
+        """Return a JSON-serializable summary of the session."""
+        driver = getattr(self.driver_instance, "driver", None)
+        return {
+            "session_id": self.key,
+            "slot": self.slot,
+            "user_data_dir": self.user_data_dir,
+            "debug_port": getattr(self.driver_instance, "debug_port", None),
+            "browser_started": driver is not None,
+            "idle_seconds": round(time.time() - self.last_used, 1),
+            "age_seconds": round(time.time() - self.created_at, 1),
+        }
+
+
+class SessionPool:
+    """Hands out one browser per session key, bounded by min/max pool size.
+
+    - ``min_size`` browsers are kept alive at all times; unassigned ones are
+      launched ahead of time as warm spares and handed to the next new key.
+    - ``max_size`` caps the number of named sessions; acquiring a new key
+      beyond that raises RuntimeError.
+    - Sessions idle for longer than ``idle_timeout`` seconds are closed by a
+      background reaper thread (busy sessions are never evicted).
+    """
+
+    def __init__(self, factory: Callable[[str], Any], min_size: int = 0, max_size: int = 4,
+                 idle_timeout: float = 600.0, reap_interval: float = 30.0):
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.reap_interval = reap_interval
+        self.base_user_data_dir = ""
+        self._sessions: Dict[str, BrowserSession] = {}
+        self._spares: List[BrowserSession] = []
+        self._next_slot = 1
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._reaper: Optional[threading.Thread] = None
+
+    def configure(self, min_size: int, max_size: int, idle_timeout: float, base_user_data_dir: str = "") -> None:
+        """Apply pool settings from the command line."""
+        if max_size < 0 or min_size < 0:
+            raise ValueError("Pool sizes must not be negative")
+        if min_size > max_size:
+            raise ValueError(f"Pool min size ({min_size}) is larger than max size ({max_size})")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        if base_user_data_dir:
+            self.base_user_data_dir = f"{base_user_data_dir.rstrip('/')}-pool"
+        else:
+            self.base_user_data_dir = f"/tmp/selenium-mcp-pool-{os.getpid()}"
+
+    def start(self) -> None:
+        """Launch the warm spares and the idle reaper thread."""
+        self._fill_spares()
+        if self._reaper is None and self.idle_timeout > 0:
+            self._reaper = threading.Thread(target=self._reap_loop, name="session-pool-reaper", daemon=True)
+            self._reaper.start()
+
+    def _new_session(self) -> BrowserSession:
+        """Create a session object for the next free slot (caller holds self._lock)."""
+        slot = self._next_slot
+        self._next_slot += 1
+        base = self.base_user_data_dir or f"/tmp/selenium-mcp-pool-{os.getpid()}"
+        data_dir = os.path.join(base, f"slot-{slot}")
+        return BrowserSession(slot, data_dir, self.factory(data_dir))
+
+    def _warm(self, session: BrowserSession) -> None:
+        """Start the browser of a spare while holding its lock."""
+        with session.lock:
+            if session.closed:
+                return
+            try:
+                session.driver_instance.ensure_driver_initialized()
+                logger.info(f"Warm spare browser ready in slot {session.slot}")
+            except Exception as e:
+                logger.error(f"Failed to warm spare browser in slot {session.slot}: {str(e)}")
+
+    def _fill_spares(self) -> None:
+        """Launch spares in the background until min_size browsers are alive."""
+        new_spares = []
+        with self._lock:
+            while len(self._sessions) + len(self._spares) < self.min_size:
+                session = self._new_session()
+                self._spares.append(session)
+                new_spares.append(session)
+        for session in new_spares:
+            threading.Thread(target=self._warm, args=(session,), name=f"session-pool-warm-{session.slot}", daemon=True).start()
+
+    def acquire(self, key: str) -> BrowserSession:
+        """Return the session for key, assigning a spare or creating one if needed.
+
+        Raises:
+            RuntimeError: If key is new and the pool already holds max_size sessions.
+        """
+        if not key:
+            raise ValueError("Named sessions need a non-empty session id")
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                if len(self._sessions) >= self.max_size:
+                    raise RuntimeError(
+                        f"Session pool is full ({self.max_size} sessions). "
+                        f"Close an existing session with close_session or retry later."
+                    )
+                session = self._spares.pop(0) if self._spares else self._new_session()
+                session.key = key
+                self._sessions[key] = session
+                logger.info(f"Assigned browser slot {session.slot} to session '{key}'")
+            session.touch()
+        return session
+
+    @contextmanager
+    def locked(self, key: str) -> Iterator[BrowserSession]:
+        """Acquire the session for key and hold its lock for the enclosed block.
+
+        A session closed while we waited for its lock is skipped and key is
+        acquired again, so the block never runs on a browser that was quit.
+        """
+        while True:
+            session = self.acquire(key)
+            session.lock.acquire()
+            if not session.closed:
+                break
+            session.lock.release()
+        try:
+            yield session
+        finally:
+            session.lock.release()
+
+    def get(self, key: str) -> Optional[BrowserSession]:
+        """Return the session for key without creating it."""
+        with self._lock:
+            return self._sessions.get(key)
+
+    def lookup(self, key: str) -> BrowserSession:
+        """Return the open session for key without creating it.
+
+        Tool code runs inside locked(), which already created the session;
+        use this instead of acquire() there so a session closed in the
+        meantime is not silently replaced by a fresh browser.
+
+        Raises:
+            RuntimeError: If key has no session or its session was closed.
+        """
+        session = self.get(key)
+        if session is None or session.closed:
+            raise RuntimeError(f"Session '{key}' was closed")
+        session.touch()
+        return session
+
+    def list_sessions(self) -> List[dict]:
+        """Summaries of all named sessions followed by the unassigned spares."""
+        with self._lock:
+            sessions = list(self._sessions.values()) + list(self._spares)
+        return [s.describe() for s in sessions]
+
+    def reset(self, key: str) -> None:
+        """Replace the driver instance of a session after its browser died.
+
+        A warm spare takes over the session right away if there is one;
+        otherwise the session moves to a fresh slot whose browser is launched
+        on next use. Either way the dead browser is closed in the background.
+
+        Raises:
+            RuntimeError: If key has no session or its session was closed.
+        """
+        session = self.lookup(key)
+        with self._lock:
+            # A fresh slot keeps the dead browser's cleanup away from the new user data dir
+            replacement = self._spares.pop(0) if self._spares else self._new_session()
+
+        # Waits for a spare to finish warming up
+        with replacement.lock:
+            dead = BrowserSession(session.slot, session.user_data_dir, session.driver_instance)
+            dead.key = key
+            session.slot, session.user_data_dir = replacement.slot, replacement.user_data_dir
+            session.driver_instance = replacement.driver_instance
+        logger.info(f"Session '{key}' moved to browser slot {session.slot}")
+        threading.Thread(target=self._close_session, args=(dead,), name=f"session-pool-close-{dead.slot}", daemon=True).start()
+        self._fill_spares()
+
+    def _close_session(self, session: BrowserSession) -> None:
+        """Quit the browser of a session and remove its user data dir."""
+        session.closed = True
+        instance = session.driver_instance
+        try:
+            instance.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting browser in slot {session.slot}: {str(e)}")
+        # NormalChromeDriver.quit() only disconnects; pooled browsers are ours to close
+        kill = getattr(instance, "_kill_chrome_with_user_data_dir", None)
+        if kill is not None:
+            try:
+                kill()
+            except Exception as e:
+                logger.warning(f"Error killing Chrome in slot {session.slot}: {str(e)}")
+        shutil.rmtree(session.user_data_dir, ignore_errors=True)
+        logger.info(f"Closed browser slot {session.slot} (session '{session.key}')")
+
+    def close(self, key: str) -> bool:
+        """Close the session for key. Returns False if there was no such session."""
+        with self._lock:
+            session = self._sessions.pop(key, None)
+            if session is None:
+                return False
+            session.closed = True
+        # Waits for a tool call in flight; callers waiting in locked() then re-acquire key
+        with session.lock:
+            self._close_session(session)
+        self._fill_spares()
+        return True
+
+    def evict_idle(self) -> None:
+        """Close named sessions idle for longer than idle_timeout."""
+        now = time.time()
+        evicted = []
+        with self._lock:
+            for key, session in list(self._sessions.items()):
+                if now - session.last_used < self.idle_timeout:
+                    continue
+                # Skip sessions with a tool call in flight
+                if not session.lock.acquire(blocking=False):
+                    continue
+                del self._sessions[key]
+                session.closed = True
+                evicted.append(session)
+        for session in evicted:
+            try:
+                logger.info(f"Evicting session '{session.key}' after {now - session.last_used:.0f}s idle")
+                self._close_session(session)
+            finally:
+                session.lock.release()
+        if evicted:
+            self._fill_spares()
+
+    def _reap_loop(self) -> None:
+        while not self._stop.wait(self.reap_interval):
+            try:
+                self.evict_idle()
+            except Exception as e:
+                logger.error(f"Session pool reaper failed: {str(e)}")
+
+    def close_all(self) -> None:
+        """Stop the reaper and close every pooled browser."""
+        self._stop.set()
+        with self._lock:
+            sessions = list(self._sessions.values()) + list(self._spares)
+            self._sessions.clear()
+            self._spares.clear()
+            for session in sessions:
+                session.closed = True
+        for session in sessions:
+            with session.lock:
+                self._close_session(session)
@@ -0,0 +1,134 @@
+"""Hot-spare browser for the default session.
+
+With ``--standby-browser`` a second Chrome + chromedriver is launched in the
+background and kept idle. When the default browser dies (e.g. ``navigate``
+sees "invalid session id"), ``reset_driver_instance()`` promotes the spare
+instead of cold-starting Chrome inside the failing tool call, and a new spare
+is launched asynchronously.
+
+The spare runs on its own throwaway user data dir, so after a promotion the
+default session no longer uses the profile given with ``--user_data_dir``.
+"""
+
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StandbyBrowser:
+    """Keeps one pre-launched driver instance ready to replace a dead one."""
+
+    def __init__(self, factory: Callable[[str], Any]):
+        self.factory = factory
+        self.enabled = False
+        self.base_user_data_dir = ""
+        self.promotions = 0
+        self.last_error: Optional[str] = None
+        self._spare: Any = None
+        self._launching = False
+        self._next_slot = 1
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def configure(self, enabled: bool, base_user_data_dir: str = "") -> None:
+        """Apply the --standby-browser setting from the command line."""
+        self.enabled = enabled
+        if base_user_data_dir:
+            self.base_user_data_dir = f"{base_user_data_dir.rstrip('/')}-standby"
+        else:
+            self.base_user_data_dir = f"/tmp/selenium-mcp-standby-{os.getpid()}"
+
+    def start(self) -> None:
+        """Launch the first spare in the background."""
+        if self.enabled:
+            self._launch_async()
+
+    def _launch_async(self) -> None:
+        with self._lock:
+            if self._closed or self._launching or self._spare is not None:
+                return
+            self._launching = True
+            data_dir = os.path.join(self.base_user_data_dir, f"spare-{self._next_slot}")
+            self._next_slot += 1
+        threading.Thread(target=self._launch, args=(data_dir,), name="standby-browser", daemon=True).start()
+
+    def _launch(self, data_dir: str) -> None:
+        start = time.time()
+        instance = None
+        try:
+            instance = self.factory(data_dir)
+            instance.ensure_driver_initialized()
+            logger.info(f"Standby browser ready in {time.time() - start:.1f}s ({data_dir})")
+        except Exception as e:
+            self.last_error = str(e)
+            logger.error(f"Failed to launch standby browser: {str(e)}")
+            if instance is not None:
+                self.discard(instance)
+            instance = None
+        with self._lock:
+            self._launching = False
+            if self._closed:
+                stale, instance = instance, None
+            else:
+                self._spare, stale = instance, None
+        if stale is not None:
+            self.discard(stale)
+
+    def promote(self) -> Any:
+        """Hand out the ready spare (None if there is none) and launch the next one."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            spare, self._spare = self._spare, None
+        if spare is not None:
+            self.promotions += 1
+            logger.info(f"Promoted standby browser ({spare.user_data_dir})")
+        self._launch_async()
+        return spare
+
+    def owns(self, instance: Any) -> bool:
+        """Whether instance runs on a user data dir created for a spare."""
+        data_dir = getattr(instance, "user_data_dir", "")
+        return bool(self.base_user_data_dir) and data_dir.startswith(self.base_user_data_dir + os.sep)
+
+    def discard(self, instance: Any) -> None:
+        """Quit a replaced instance; Chrome and the data dir of former spares are removed too."""
+        try:
+            instance.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting replaced browser: {str(e)}")
+        if not self.owns(instance):
+            return
+        kill = getattr(instance, "_kill_chrome_with_user_data_dir", None)
+        if kill is not None:
+            try:
+                kill()
+            except Exception as e:
+                logger.warning(f"Error killing replaced Chrome: {str(e)}")
+        shutil.rmtree(instance.user_data_dir, ignore_errors=True)
+
+    def describe(self) -> dict:
+        """Return the standby state as a JSON-serializable dict."""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "ready": self._spare is not None,
+                "launching": self._launching,
+                "promotions": self.promotions,
+                "last_error": self.last_error,
+            }
+
+    def close(self) -> None:
+        """Stop launching spares and close the idle one."""
+        with self._lock:
+            self._closed = True
+            spare, self._spare = self._spare, None
+        if spare is not None:
+            self.discard(spare)
+        if self.base_user_data_dir:
+            shutil.rmtree(self.base_user_data_dir, ignore_errors=True)
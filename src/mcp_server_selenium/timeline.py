@@ -0,0 +1,47 @@
+"""Per-phase timing of driver startup.
+
+Phases may run on several threads at once (e.g. Chrome booting while
+chromedriver is spawned); each one is recorded with its start and end offset
+so the log shows which phases overlapped and which one was on the critical path.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimeline:
+    """Collects (phase, thread, start, end) spans relative to a common start time."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._start = time.perf_counter()
+        self._spans: List[Tuple[str, str, float, float]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Record the duration of the enclosed block as one phase."""
+        begin = time.perf_counter() - self._start
+        try:
+            yield
+        finally:
+            end = time.perf_counter() - self._start
+            with self._lock:
+                self._spans.append((name, threading.current_thread().name, begin, end))
+
+    def summary(self) -> str:
+        with self._lock:
+            spans = sorted(self._spans, key=lambda span: span[2])
+        return "; ".join(
+            f"{name} {begin:.3f}-{end:.3f}s ({(end - begin) * 1000:.0f}ms, {thread})"
+            for name, thread, begin, end in spans
+        )
+
+    def log(self) -> None:
+        total = time.perf_counter() - self._start
+        logger.info(f"{self.name} startup took {total:.3f}s: {self.summary()}")
@@ -0,0 +1,157 @@
+"""
+Batch tool for Selenium MCP server.
+
+This module provides a tool that runs a sequence of other tools in one MCP call.
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+from typing import Any, Dict, List
+
+from ..metrics import metrics
+from ..server import mcp, session_lock, tool_functions
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on the number of steps in one batch
+MAX_BATCH_STEPS = 50
+
+# Session-management tools; a batch holds its session's lock, so closing
+# sessions from inside one would wait for the batch itself
+UNBATCHABLE_TOOLS = ("run_batch", "close_session", "list_sessions")
+
+
+class BatchStepError(Exception):
+    """Raised when a batch step is malformed or references an unknown result."""
+
+
+def _step_failed(result: Any) -> bool:
+    """Tools report most failures as a returned message rather than an exception."""
+    return isinstance(result, str) and result.startswith(("Error", "Failed"))
+
+
+def _resolve_ref(ref: dict, results: Dict[str, Any]) -> Any:
+    """Return the result of an earlier step, optionally indexed by a dotted path.
+
+    The path is applied to the result parsed as JSON, or to the text after the
+    first "Result: " for tools that prefix their JSON output.
+    """
+    key = str(ref["$ref"])
+    if key not in results:
+        raise BatchStepError(f"Reference to unknown or later step '{key}'")
+    value = results[key]
+    path = ref.get("path", "")
+    if not path:
+        return value
+
+    if isinstance(value, str):
+        text = value.split("Result: ", 1)[1] if "Result: " in value else value
+        try:
+            value = json.loads(text)
+        except ValueError:
+            raise BatchStepError(f"Result of step '{key}' is not JSON; cannot apply path '{path}'")
+    for part in path.split("."):
+        try:
+            value = value[int(part)] if isinstance(value, list) else value[part]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise BatchStepError(f"Path '{path}' not found in result of step '{key}'")
+    return value
+
+
+def _resolve_args(value: Any, results: Dict[str, Any]) -> Any:
+    """Replace every {"$ref": ...} object inside value with the referenced result."""
+    if isinstance(value, dict):
+        if "$ref" in value:
+            return _resolve_ref(value, results)
+        return {k: _resolve_args(v, results) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_resolve_args(v, results) for v in value]
+    return value
+
+
+def _call_tool(name: str, args: Dict[str, Any], session_id: str) -> Any:
+    if name in UNBATCHABLE_TOOLS:
+        raise BatchStepError(f"Tool '{name}' cannot run as a batch step")
+    fn = tool_functions.get(name)
+    if fn is None:
+        raise BatchStepError(f"Unknown tool '{name}'")
+    if "session_id" in args:
+        raise BatchStepError("Steps cannot set session_id; pass it to run_batch instead")
+    if "session_id" in inspect.signature(fn).parameters:
+        args["session_id"] = session_id
+    if inspect.iscoroutinefunction(fn):
+        # Batches run on a worker thread, which has no event loop of its own
+        return asyncio.run(fn(**args))
+    return fn(**args)
+
+
+@mcp.tool()
+def run_batch(steps: List[Dict[str, Any]], stop_on_error: bool = True, session_id: str = '') -> str:
+    """Run a sequence of tools in one call and return all of their results.
+
+    Saves a round trip per step for common sequences such as navigate ->
+    check_page_ready -> get_an_element -> click_to_element -> get_console_logs.
+    Steps run in order on the same browser session, and no other tool call on that
+    session can run in between.
+
+    Args:
+        steps: Ordered list of tool invocations. Each step is an object with:
+            - tool: Name of the tool to run, e.g. "navigate".
+            - args: Arguments for the tool (optional), e.g. {"url": "example.com"}.
+            - id: Name to reference the result by (optional; the step index always works).
+            Any argument value may be a reference to the result of an earlier step,
+            written as {"$ref": "<id or index>"} or {"$ref": "<id or index>", "path": "a.0.b"}
+            to pick a field out of a JSON result.
+        stop_on_error: Skip the remaining steps after the first failing step. Default is True.
+        session_id: Browser session to use. Empty uses the default browser; any other value gets its own browser from the session pool.
+            All steps run on this session.
+
+    Returns:
+        A JSON string with one entry per step: its index, id, tool, status ("ok",
+        "error" or "skipped") and the tool's result or error message.
+    """
+    if not steps:
+        return "Error: No steps given"
+    if len(steps) > MAX_BATCH_STEPS:
+        return f"Error: A batch may have at most {MAX_BATCH_STEPS} steps, got {len(steps)}"
+
+    results: Dict[str, Any] = {}
+    report = []
+    failed = False
+    logger.info(f"Running batch of {len(steps)} steps")
+
+    with session_lock(session_id), metrics.track("run_batch"):
+        for index, step in enumerate(steps):
+            name = step.get("tool", "") if isinstance(step, dict) else ""
+            step_id = str(step.get("id", index)) if isinstance(step, dict) else str(index)
+            entry = {"step": index, "id": step_id, "tool": name}
+            report.append(entry)
+
+            if failed and stop_on_error:
+                entry["status"] = "skipped"
+                continue
+
+            try:
+                if not name:
+                    raise BatchStepError("Step has no tool name")
+                args = _resolve_args(dict(step.get("args") or {}), results)
+                result = _call_tool(name, args, session_id)
+            except Exception as e:
+                logger.error(f"Batch step {index} ({name}) failed: {str(e)}")
+                entry["status"] = "error"
+                entry["error"] = str(e)
+                failed = True
+                continue
+
+            results[str(index)] = result
+            results[step_id] = result
+            entry["result"] = result
+            if _step_failed(result):
+                entry["status"] = "error"
+                failed = True
+            else:
+                entry["status"] = "ok"
+
+    return json.dumps(report, indent=2, default=str)
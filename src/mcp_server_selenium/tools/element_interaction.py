@@ -8,8 +8,7 @@ import json
 import logging
 import time
 
-from selenium.webdriver.common.by import By
-
+from ..element_query import StaleElementRef, element_refs, query_elements, resolve_ref
 # Import the global mcp instance from the main server module
 from ..server import mcp, ensure_driver_initialized, auto_recover_stale_window
 
@@ -18,7 +17,7 @@ logger = logging.getLogger(__name__)
 
 @mcp.tool()
 @auto_recover_stale_window
-def get_an_element(text: str = '', class_name: str = '', id: str = '', attributes: dict = {}, element_type: str = '', in_iframe_id: str = '', in_iframe_name: str = '', return_html: bool = False, xpath: str = '') -> str:
+def get_an_element(text: str = '', class_name: str = '', id: str = '', attributes: dict = {}, element_type: str = '', in_iframe_id: str = '', in_iframe_name: str = '', return_html: bool = False, xpath: str = '', session_id: str = '') -> str:
     """Get an element identified by text content, class name, or ID.
     
     This tool finds an element based on specified criteria. At least one 
@@ -35,13 +34,18 @@ def get_an_element(text: str = '', class_name: str = '', id: str = '', attribute
         in_iframe_name: Name of the iframe to search within. If provided and in_iframe_id is not provided, the function will switch to this iframe before searching.
         return_html: Return the HTML content of the element instead of JSON information.
         xpath: Direct XPath selector to find the element. When provided, other selection criteria are ignored.
+        session_id: Browser session to use. Empty uses the default browser; any other value gets its own browser from the session pool.
     
     Returns:
         A JSON string with information about the found element or an error message.
         If return_html is True, returns the HTML content of the element.
+        The result includes a "ref" that click_to_element and set_value_to_input_element
+        accept to act on the element without looking it up again.
     """
+    from selenium.webdriver.common.by import By
+    
     try:
-        driver = ensure_driver_initialized()
+        driver = ensure_driver_initialized(session_id)
     except RuntimeError as e:
         return f"Failed to initialize WebDriver: {str(e)}"
     
@@ -74,7 +78,6 @@ def get_an_element(text: str = '', class_name: str = '', id: str = '', attribute
         # If xpath is provided, use it directly
         if xpath != '':
             logger.info(f"Looking for elements with provided XPath: {xpath}")
-            elements = driver.find_elements(By.XPATH, xpath)
         else:
             # Build XPath conditions based on provided arguments
             conditions = []
@@ -100,10 +103,14 @@ def get_an_element(text: str = '', class_name: str = '', id: str = '', attribute
                 xpath += "[" + " and ".join(conditions) + "]"
             
             logger.info(f"Looking for elements with XPath: {xpath}")
-            elements = driver.find_elements(By.XPATH, xpath)
+        
+        # Count the matches and serialize the first one in a single round trip;
+        # its ref is only registered when it is the sole match
+        query = query_elements(driver, xpath, 0, 1, return_html, in_iframe_id, in_iframe_name,
+                               refs_only_if_unique=True)
         
         # Check if we found exactly one element
-        if len(elements) == 0:
+        if query["total"] == 0:
             criteria_str = []
             if text != '':
                 criteria_str.append(f"text='{text}'")
@@ -127,8 +134,8 @@ def get_an_element(text: str = '', class_name: str = '', id: str = '', attribute
                 
             return error_msg
         
-        if len(elements) > 1:
-            error_msg = f"Found {len(elements)} elements matching the criteria. Please provide more specific criteria."
+        if query["total"] > 1:
+            error_msg = f"Found {query['total']} elements matching the criteria. Please provide more specific criteria."
             logger.error(error_msg)
             
             # Switch back to original context before returning
@@ -137,63 +144,28 @@ def get_an_element(text: str = '', class_name: str = '', id: str = '', attribute
                 
             return error_msg
         
-        # Get the element
-        element = elements[0]
+        element = query["elements"][0]
         
         # If return_html is True, return the HTML content instead of JSON
         if return_html:
-            try:
-                # Get innerHTML or outerHTML
-                inner_html = element.get_attribute("innerHTML")
-                outer_html = element.get_attribute("outerHTML")
-                
-                # Switch back to original context
-                if not original_context:
-                    driver.switch_to.default_content()
-                
-                return json.dumps({
-                    "innerHTML": inner_html,
-                    "outerHTML": outer_html
-                })
-                
-            except Exception as html_e:
-                error_msg = f"Error getting HTML content: {str(html_e)}"
-                logger.error(error_msg)
-                
-                # Switch back to original context in case of error
-                if not original_context:
-                    driver.switch_to.default_content()
-                
-                return error_msg
-        
-        # Get element properties for standard JSON response
-        try:
-            tag_name = element.tag_name
-        except:
-            tag_name = "unknown"
-            
-        try:
-            element_id = element.get_attribute("id") or "no-id"
-        except:
-            element_id = "unknown"
-            
-        try:
-            element_class = element.get_attribute("class") or "no-class"
-        except:
-            element_class = "unknown"
-            
-        try:
-            element_text = element.text[:50] + "..." if len(element.text) > 50 else element.text
-        except:
-            element_text = "unknown"
+            # Switch back to original context
+            if not original_context:
+                driver.switch_to.default_content()
             
+            return json.dumps({
+                "innerHTML": element["innerHTML"],
+                "outerHTML": element["outerHTML"],
+                "ref": element["ref"]
+            })
+        
         # Return element info as JSON
         element_info = {
             "found": True,
-            "tag_name": tag_name,
-            "id": element_id,
-            "class": element_class,
-            "text": element_text,
+            "tag_name": element["tag_name"],
+            "id": element["id"],
+            "class": element["class"],
+            "text": element["text"],
+            "ref": element["ref"],
             "xpath": xpath,
             "in_iframe_id": in_iframe_id,
             "in_iframe_name": in_iframe_name
@@ -221,7 +193,7 @@ def get_an_element(text: str = '', class_name: str = '', id: str = '', attribute
 
 @mcp.tool()
 @auto_recover_stale_window
-def get_direct_children(text: str = '', class_name: str = '', id: str = '', attributes: dict = {}, element_type: str = '', in_iframe_id: str = '', in_iframe_name: str = '', return_html: bool = False, xpath: str = '', page: int = 1, page_size: int = 5) -> str:
+def get_direct_children(text: str = '', class_name: str = '', id: str = '', attributes: dict = {}, element_type: str = '', in_iframe_id: str = '', in_iframe_name: str = '', return_html: bool = False, xpath: str = '', page: int = 1, page_size: int = 5, session_id: str = '') -> str:
     """Get all direct child nodes of an element identified by text content, class name, or ID.
     
     This tool finds an element based on specified criteria and returns all its direct child nodes with pagination support.
@@ -239,13 +211,17 @@ def get_direct_children(text: str = '', class_name: str = '', id: str = '', attr
         xpath: Direct XPath selector to find the parent element. When provided, other selection criteria are ignored.
         page: Current page of child elements returned in the response (default: 1).
         page_size: Number of child elements to return in the response (default: 5).
+        session_id: Browser session to use. Empty uses the default browser; any other value gets its own browser from the session pool.
     
     Returns:
         A JSON string with information about the direct child elements or an error message.
         If return_html is True, returns the HTML content of the child elements.
+        Each child includes a "ref" accepted by click_to_element and set_value_to_input_element.
     """
+    from selenium.webdriver.common.by import By
+    
     try:
-        driver = ensure_driver_initialized()
+        driver = ensure_driver_initialized(session_id)
     except RuntimeError as e:
         return f"Failed to initialize WebDriver: {str(e)}"
     
@@ -261,7 +237,8 @@ def get_direct_children(text: str = '', class_name: str = '', id: str = '', attr
     try:
         # First, find the parent element using get_an_element
         parent_element_info = get_an_element(text, class_name, id, attributes, element_type, 
-                                           in_iframe_id, in_iframe_name, False, xpath)
+                                           in_iframe_id, in_iframe_name, False, xpath,
+                                           session_id=session_id)
         
         # Parse the JSON result to get parent element information
         try:
@@ -299,15 +276,13 @@ def get_direct_children(text: str = '', class_name: str = '', id: str = '', attr
                 logger.error(error_msg)
                 return error_msg
         
-        # Find the parent element
-        parent_element = driver.find_element(By.XPATH, parent_xpath)
-        
         # Get all direct child elements using XPath
         children_xpath = f"({parent_xpath})/*"
         logger.info(f"Looking for direct children with XPath: {children_xpath}")
-        all_children = driver.find_elements(By.XPATH, children_xpath)
+        query = query_elements(driver, children_xpath, (page - 1) * page_size, page_size, return_html,
+                               parent_iframe_id, parent_iframe_name)
         
-        total_children = len(all_children)
+        total_children = query["total"]
         total_pages = (total_children + page_size - 1) // page_size if total_children > 0 else 1
         
         # Check if we found any children
@@ -329,9 +304,8 @@ def get_direct_children(text: str = '', class_name: str = '', id: str = '', attr
                 
             return json.dumps(result)
         
-        # Calculate pagination indices
+        # Check the requested page against the total
         start_idx = (page - 1) * page_size
-        end_idx = min(start_idx + page_size, total_children)
         
         # Check if the requested page is valid
         if start_idx >= total_children:
@@ -353,84 +327,7 @@ def get_direct_children(text: str = '', class_name: str = '', id: str = '', attr
                 "children": []
             })
         
-        # Get the paginated children
-        paginated_children = all_children[start_idx:end_idx]
-        children_info = []
-        
-        # Process each child element
-        for i, child in enumerate(paginated_children):
-            # Generate a unique XPath for this specific child element
-            try:
-                unique_xpath = driver.execute_script("""
-                function getPathTo(element) {
-                    if (element.id !== '')
-                        return '//*[@id="' + element.id + '"]';
-                    if (element === document.body)
-                        return '/html/body';
-
-                    var ix = 0;
-                    var siblings = element.parentNode.childNodes;
-                    for (var i = 0; i < siblings.length; i++) {
-                        var sibling = siblings[i];
-                        if (sibling === element)
-                            return getPathTo(element.parentNode) + '/' + element.tagName.toLowerCase() + '[' + (ix + 1) + ']';
-                        if (sibling.nodeType === 1 && sibling.tagName === element.tagName)
-                            ix++;
-                    }
-                }
-                return getPathTo(arguments[0]);
-                """, child)
-            except:
-                # Fallback if JS execution fails
-                unique_xpath = f"{children_xpath}[{start_idx + i + 1}]"
-                
-            if return_html:
-                # Get HTML content for this child element
-                try:
-                    inner_html = child.get_attribute("innerHTML")
-                    outer_html = child.get_attribute("outerHTML")
-                    
-                    children_info.append({
-                        "innerHTML": inner_html,
-                        "outerHTML": outer_html,
-                        "uniqueXPath": unique_xpath
-                    })
-                except Exception as html_e:
-                    children_info.append({
-                        "error": f"Error getting HTML: {str(html_e)}",
-                        "innerHTML": "",
-                        "outerHTML": "",
-                        "uniqueXPath": unique_xpath
-                    })
-            else:
-                # Get standard element info
-                try:
-                    tag_name = child.tag_name
-                except:
-                    tag_name = "unknown"
-                    
-                try:
-                    child_id = child.get_attribute("id") or "no-id"
-                except:
-                    child_id = "unknown"
-                    
-                try:
-                    child_class = child.get_attribute("class") or "no-class"
-                except:
-                    child_class = "unknown"
-                    
-                try:
-                    child_text = child.text[:50] + "..." if len(child.text) > 50 else child.text
-                except:
-                    child_text = "unknown"
-                
-                children_info.append({
-                    "tag_name": tag_name,
-                    "id": child_id,
-                    "class": child_class,
-                    "text": child_text,
-                    "uniqueXPath": unique_xpath
-                })
+        children_info = query["elements"]
         
         # Return children info as JSON
         result = {
@@ -476,7 +373,7 @@ def get_direct_children(text: str = '', class_name: str = '', id: str = '', attr
 
 @mcp.tool()
 @auto_recover_stale_window
-def get_elements(text: str = '', class_name: str = '', id: str = '', attributes: dict = {}, element_type: str = '', in_iframe_id: str = '', in_iframe_name: str = '', page: int = 1, page_size: int = 3, return_html: bool = False, xpath: str = '') -> str:
+def get_elements(text: str = '', class_name: str = '', id: str = '', attributes: dict = {}, element_type: str = '', in_iframe_id: str = '', in_iframe_name: str = '', page: int = 1, page_size: int = 3, return_html: bool = False, xpath: str = '', session_id: str = '') -> str:
     """Get multiple elements identified by text content, class name, or ID with pagination.
     
     This tool finds elements based on specified criteria. At least one 
@@ -495,13 +392,17 @@ def get_elements(text: str = '', class_name: str = '', id: str = '', attributes:
         page_size: Number of elements to return in the response (default: 3).
         return_html: Return the HTML content of the elements instead of JSON information.
         xpath: Direct XPath selector to find the elements. When provided, other selection criteria are ignored.
+        session_id: Browser session to use. Empty uses the default browser; any other value gets its own browser from the session pool.
     
     Returns:
         A JSON string with information about the found elements or an error message.
         If return_html is True, includes HTML content of the elements.
+        Each element includes a "ref" accepted by click_to_element and set_value_to_input_element.
     """
+    from selenium.webdriver.common.by import By
+    
     try:
-        driver = ensure_driver_initialized()
+        driver = ensure_driver_initialized(session_id)
     except RuntimeError as e:
         return f"Failed to initialize WebDriver: {str(e)}"
     
@@ -540,7 +441,6 @@ def get_elements(text: str = '', class_name: str = '', id: str = '', attributes:
         # If xpath is provided, use it directly
         if xpath != '':
             logger.info(f"Looking for elements with provided XPath: {xpath}")
-            all_elements = driver.find_elements(By.XPATH, xpath)
             search_xpath = xpath
         else:
             # Build XPath conditions based on provided arguments
@@ -567,9 +467,11 @@ def get_elements(text: str = '', class_name: str = '', id: str = '', attributes:
                 search_xpath += "[" + " and ".join(conditions) + "]"
             
             logger.info(f"Looking for elements with XPath: {search_xpath}")
-            all_elements = driver.find_elements(By.XPATH, search_xpath)
         
-        total_elements = len(all_elements)
+        # Count the matches and serialize the requested page in a single round trip
+        query = query_elements(driver, search_xpath, (page - 1) * page_size, page_size, return_html,
+                               in_iframe_id, in_iframe_name)
+        total_elements = query["total"]
         total_pages = (total_elements + page_size - 1) // page_size if total_elements > 0 else 1
         
         # Check if we found any elements
@@ -605,9 +507,8 @@ def get_elements(text: str = '', class_name: str = '', id: str = '', attributes:
                 "elements": []
             })
         
-        # Calculate pagination indices
+        # Check the requested page against the total
         start_idx = (page - 1) * page_size
-        end_idx = min(start_idx + page_size, total_elements)
         
         # Check if the requested page is valid
         if start_idx >= total_elements:
@@ -628,84 +529,7 @@ def get_elements(text: str = '', class_name: str = '', id: str = '', attributes:
                 "elements": []
             })
         
-        # Get the paginated elements
-        paginated_elements = all_elements[start_idx:end_idx]
-        elements_info = []
-        
-        # Process each element
-        for i, element in enumerate(paginated_elements):
-            # Generate a unique XPath for this specific element
-            try:
-                unique_xpath = driver.execute_script("""
-                function getPathTo(element) {
-                    if (element.id !== '')
-                        return '//*[@id="' + element.id + '"]';
-                    if (element === document.body)
-                        return '/html/body';
-
-                    var ix = 0;
-                    var siblings = element.parentNode.childNodes;
-                    for (var i = 0; i < siblings.length; i++) {
-                        var sibling = siblings[i];
-                        if (sibling === element)
-                            return getPathTo(element.parentNode) + '/' + element.tagName.toLowerCase() + '[' + (ix + 1) + ']';
-                        if (sibling.nodeType === 1 && sibling.tagName === element.tagName)
-                            ix++;
-                    }
-                }
-                return getPathTo(arguments[0]);
-                """, element)
-            except:
-                # Fallback if JS execution fails
-                unique_xpath = f"{search_xpath}[{i + 1}]"
-                
-            if return_html:
-                # Get HTML content for this element
-                try:
-                    inner_html = element.get_attribute("innerHTML")
-                    outer_html = element.get_attribute("outerHTML")
-                    
-                    elements_info.append({
-                        "innerHTML": inner_html,
-                        "outerHTML": outer_html,
-                        "uniqueXPath": unique_xpath
-                    })
-                except Exception as html_e:
-                    elements_info.append({
-                        "error": f"Error getting HTML: {str(html_e)}",
-                        "innerHTML": "",
-                        "outerHTML": "",
-                        "uniqueXPath": unique_xpath
-                    })
-            else:
-                # Get standard element info
-                try:
-                    tag_name = element.tag_name
-                except:
-                    tag_name = "unknown"
-                    
-                try:
-                    element_id = element.get_attribute("id") or "no-id"
-                except:
-                    element_id = "unknown"
-                    
-                try:
-                    element_class = element.get_attribute("class") or "no-class"
-                except:
-                    element_class = "unknown"
-                    
-                try:
-                    element_text = element.text[:50] + "..." if len(element.text) > 50 else element.text
-                except:
-                    element_text = "unknown"
-                
-                elements_info.append({
-                    "tag_name": tag_name,
-                    "id": element_id,
-                    "class": element_class,
-                    "text": element_text,
-                    "uniqueXPath": unique_xpath
-                })
+        elements_info = query["elements"]
         
         # Return elements info as JSON
         result = {
@@ -748,13 +572,39 @@ def get_elements(text: str = '', class_name: str = '', id: str = '', attributes:
         })
 
 
+def _element_for_ref(driver, ref: str):
+    """Switch to the frame of an element ref and return its entry, its WebElement and the original_context flag.
+
+    Raises:
+        StaleElementRef: If the ref is unknown or its element is no longer in the page.
+    """
+    from selenium.webdriver.common.by import By
+    
+    entry = element_refs(driver).get(ref)
+    original_context = True
+    if entry.in_iframe_id or entry.in_iframe_name:
+        if entry.in_iframe_id:
+            iframe = driver.find_element(By.ID, entry.in_iframe_id)
+            driver.switch_to.frame(iframe)
+        else:
+            driver.switch_to.frame(entry.in_iframe_name)
+        original_context = False
+    try:
+        _, element = resolve_ref(driver, ref)
+    except Exception:
+        if not original_context:
+            driver.switch_to.default_content()
+        raise
+    return entry, element, original_context
+
+
 @mcp.tool()
 @auto_recover_stale_window
-def click_to_element(text: str = '', class_name: str = '', id: str = '', attributes: dict = {}, element_type: str = '', in_iframe_id: str = '', in_iframe_name: str = '', element_index: int = -1, xpath: str = '') -> str:
+def click_to_element(text: str = '', class_name: str = '', id: str = '', attributes: dict = {}, element_type: str = '', in_iframe_id: str = '', in_iframe_name: str = '', element_index: int = -1, xpath: str = '', ref: str = '', session_id: str = '') -> str:
     """Click on an element identified by text content, class name, or ID.
     
     This tool finds and clicks on an element based on specified criteria. At least one 
-    of text, class_name, id, attributes, element_type, or xpath must be provided. If multiple elements match the criteria, 
+    of text, class_name, id, attributes, element_type, xpath, or ref must be provided. If multiple elements match the criteria, 
     or if no elements are found, an error message is returned.
     
     Args:
@@ -767,12 +617,15 @@ def click_to_element(text: str = '', class_name: str = '', id: str = '', attribu
         in_iframe_name: Name of the iframe to search within. If provided and in_iframe_id is not provided, the function will switch to this iframe before searching.
         element_index: Index of the element to click if multiple elements match the criteria. Default is -1 (don't use this parameter).
         xpath: Direct XPath selector to find the element. When provided, other selection criteria are ignored.
+        ref: Element ref returned by get_an_element, get_elements or get_direct_children. When provided,
+            the element is clicked without looking it up again and all other selection criteria are ignored.
+        session_id: Browser session to use. Empty uses the default browser; any other value gets its own browser from the session pool.
     
     Returns:
         A message indicating whether the click was successful or an error message.
     """
     try:
-        driver = ensure_driver_initialized()
+        driver = ensure_driver_initialized(session_id)
     except RuntimeError as e:
         return f"Failed to initialize WebDriver: {str(e)}"
     
@@ -780,140 +633,85 @@ def click_to_element(text: str = '', class_name: str = '', id: str = '', attribu
         # Store current URL before the click
         current_url = driver.current_url
         
-        if element_index >= 0:
+        if ref != '':
+            element_data = None
+            position = f" {ref}"
+        elif element_index >= 0:
             # Use get_elements to get multiple elements if index is specified
             logger.info(f"Using element_index {element_index} to select from multiple matching elements")
             elements_info = get_elements(text, class_name, id, attributes, element_type, 
                                         in_iframe_id, in_iframe_name, 
                                         page=1, page_size=max(element_index+1, 3),
-                                        return_html=False, xpath=xpath)
+                                        return_html=False, xpath=xpath,
+                                        session_id=session_id)
             
             # Parse the JSON result
             try:
                 elements_data = json.loads(elements_info)
-                
-                # Check if elements were found
-                if not isinstance(elements_data, dict) or not elements_data.get("found", False):
-                    return elements_info  # Return the error message from get_elements
-                
-                total_elements = elements_data.get("total_elements", 0)
-                
-                if total_elements == 0:
-                    return f"No elements found matching the given criteria"
-                
-                if element_index >= total_elements:
-                    return f"Index {element_index} is out of bounds. Only {total_elements} elements were found."
-                
-                # Get all elements matching the criteria using XPath
-                elements_xpath = elements_data.get("xpath", "")
-                elements_iframe_id = elements_data.get("in_iframe_id", "")
-                elements_iframe_name = elements_data.get("in_iframe_name", "")
-                
-                # Switch to iframe if needed
-                original_context = True
-                if elements_iframe_id or elements_iframe_name:
-                    try:
-                        if elements_iframe_id:
-                            iframe = driver.find_element(By.ID, elements_iframe_id)
-                            driver.switch_to.frame(iframe)
-                        elif elements_iframe_name:
-                            driver.switch_to.frame(elements_iframe_name)
-                        original_context = False
-                    except Exception as iframe_e:
-                        return f"Error switching to iframe for clicking: {str(iframe_e)}"
-                
-                # Find all matching elements
-                all_elements = driver.find_elements(By.XPATH, elements_xpath)
-                
-                # Get the element at the specified index
-                target_element = all_elements[element_index]
-                
-                # Get element info for the log message
-                element_tag = target_element.tag_name
-                element_id = target_element.get_attribute("id") or "no-id"
-                element_class = target_element.get_attribute("class") or "no-class"
-                element_text = target_element.text[:50] + "..." if len(target_element.text) > 50 else target_element.text
-                
-                # Click the target element
-                target_element.click()
-                
-                # Wait a moment for any navigation to start
-                time.sleep(0.5)
-                
-                # Switch back to default content
-                if not original_context:
-                    driver.switch_to.default_content()
-                
-                # Check if the URL has changed, indicating navigation occurred
-                new_url = driver.current_url
-                if new_url != current_url:
-                    return f"Successfully clicked on element at index {element_index} which triggered navigation from {current_url} to {new_url}"
-                
-                # If no navigation occurred, return the standard success message
-                return f"Successfully clicked on {element_tag} element at index {element_index} with id='{element_id}', class='{element_class}', text='{element_text}'"
-                
-            except (json.JSONDecodeError, IndexError, Exception) as e:
-                return f"Error selecting element at index {element_index}: {str(e)}"
+            except json.JSONDecodeError:
+                return elements_info
+            
+            # Check if elements were found
+            if not isinstance(elements_data, dict) or not elements_data.get("found", False):
+                return elements_info  # Return the error message from get_elements
+            
+            total_elements = elements_data.get("total_elements", 0)
+            
+            if total_elements == 0:
+                return f"No elements found matching the given criteria"
+            
+            if element_index >= total_elements:
+                return f"Index {element_index} is out of bounds. Only {total_elements} elements were found."
+            
+            element_data = elements_data["elements"][element_index]
+            ref = element_data["ref"]
+            position = f" at index {element_index}"
         else:
-            # Use the original behavior when element_index is -1
             # Get element using the get_element function
             element_info = get_an_element(text, class_name, id, attributes, element_type, 
                                        in_iframe_id, in_iframe_name, 
-                                       return_html=False, xpath=xpath)
+                                       return_html=False, xpath=xpath,
+                                       session_id=session_id)
             
             # Parse the JSON result
             try:
                 element_data = json.loads(element_info)
-                
-                # Check if the element was found
-                if not isinstance(element_data, dict) or not element_data.get("found", False):
-                    return element_info  # Return the error message from get_element
-                    
-                single_tag_name = element_data.get("tag_name", "unknown")
-                single_element_id = element_data.get("id", "unknown")
-                single_element_class = element_data.get("class", "unknown")
-                single_element_text = element_data.get("text", "")
-                single_xpath = element_data.get("xpath", "")
-                single_iframe_id = element_data.get("in_iframe_id", "")
-                single_iframe_name = element_data.get("in_iframe_name", "")
-                
-                # Switch to iframe if needed
-                original_context = True
-                if single_iframe_id or single_iframe_name:
-                    try:
-                        if single_iframe_id:
-                            iframe = driver.find_element(By.ID, single_iframe_id)
-                            driver.switch_to.frame(iframe)
-                        elif single_iframe_name:
-                            driver.switch_to.frame(single_iframe_name)
-                        original_context = False
-                    except Exception as iframe_e:
-                        return f"Error switching to iframe for clicking: {str(iframe_e)}"
-                
-                # Find the element again using the same xpath
-                element = driver.find_element(By.XPATH, single_xpath)
-                
             except json.JSONDecodeError:
                 # get_element returned an error message, not JSON
                 return element_info
             
-            # Now click the element
-            element.click()
-            
-            # Wait a moment for any navigation to start
-            time.sleep(0.5)
-            
-            # Switch back to default content
-            if not original_context:
-                driver.switch_to.default_content()
-            
-            # Check if the URL has changed, indicating navigation occurred
-            new_url = driver.current_url
-            if new_url != current_url:
-                return f"Successfully clicked on {single_tag_name} element which triggered navigation from {current_url} to {new_url}"
+            # Check if the element was found
+            if not isinstance(element_data, dict) or not element_data.get("found", False):
+                return element_info  # Return the error message from get_element
             
-            # If no navigation occurred, return the standard success message
-            return f"Successfully clicked on {single_tag_name} element with id='{single_element_id}', class='{single_element_class}', text='{single_element_text}'"
+            ref = element_data["ref"]
+            position = ""
+        
+        # Reuse the WebElement found by the query (switches to its iframe if needed)
+        try:
+            entry, element, original_context = _element_for_ref(driver, ref)
+        except StaleElementRef as e:
+            return f"Error: {str(e)}"
+        
+        # Now click the element
+        element.click()
+        
+        # Wait a moment for any navigation to start
+        time.sleep(0.5)
+        
+        # Switch back to default content
+        if not original_context:
+            driver.switch_to.default_content()
+        
+        # Check if the URL has changed, indicating navigation occurred
+        new_url = driver.current_url
+        if new_url != current_url:
+            return f"Successfully clicked on {entry.tag_name} element{position} which triggered navigation from {current_url} to {new_url}"
+        
+        # If no navigation occurred, return the standard success message
+        if element_data is None:
+            return f"Successfully clicked on {entry.tag_name} element{position}"
+        return f"Successfully clicked on {entry.tag_name} element{position} with id='{element_data['id']}', class='{element_data['class']}', text='{element_data['text']}'"
     
     except Exception as e:
         error_msg = f"Error clicking element: {str(e)}"
@@ -939,11 +737,11 @@ def click_to_element(text: str = '', class_name: str = '', id: str = '', attribu
 
 @mcp.tool()
 @auto_recover_stale_window
-def set_value_to_input_element(text: str = '', class_name: str = '', id: str = '', attributes: dict = {}, element_type: str = '', input_value: str = '', in_iframe_id: str = '', in_iframe_name: str = '', xpath: str = '') -> str:
+def set_value_to_input_element(text: str = '', class_name: str = '', id: str = '', attributes: dict = {}, element_type: str = '', input_value: str = '', in_iframe_id: str = '', in_iframe_name: str = '', xpath: str = '', ref: str = '', session_id: str = '') -> str:
     """Set a value to an input element identified by text content, class name, or ID.
     
     This tool finds an input element based on specified criteria and sets the provided value. At least one 
-    of text, class_name, id, attributes, element_type, or xpath must be provided. If multiple elements match the criteria, 
+    of text, class_name, id, attributes, element_type, xpath, or ref must be provided. If multiple elements match the criteria, 
     or if no elements are found, an error message is returned.
     
     Args:
@@ -956,53 +754,43 @@ def set_value_to_input_element(text: str = '', class_name: str = '', id: str = '
         in_iframe_id: ID of the iframe to search within. If provided, the function will switch to this iframe before searching.
         in_iframe_name: Name of the iframe to search within. If provided and in_iframe_id is not provided, the function will switch to this iframe before searching.
         xpath: Direct XPath selector to find the element. When provided, other selection criteria are ignored.
+        ref: Element ref returned by get_an_element, get_elements or get_direct_children. When provided,
+            the element is used without looking it up again and all other selection criteria are ignored.
+        session_id: Browser session to use. Empty uses the default browser; any other value gets its own browser from the session pool.
     
     Returns:
         A message indicating whether setting the value was successful or an error message.
     """
     try:
-        driver = ensure_driver_initialized()
+        driver = ensure_driver_initialized(session_id)
     except RuntimeError as e:
         return f"Failed to initialize WebDriver: {str(e)}"
     
     try:
-        # Get element using the get_element function
-        element_info = get_an_element(text, class_name, id, attributes, element_type, in_iframe_id, in_iframe_name, False, xpath)
-        
-        # Parse the JSON result
-        try:
-            element_data = json.loads(element_info)
+        element_data = None
+        if ref == '':
+            # Get element using the get_element function
+            element_info = get_an_element(text, class_name, id, attributes, element_type, in_iframe_id, in_iframe_name, False, xpath, session_id=session_id)
+            
+            # Parse the JSON result
+            try:
+                element_data = json.loads(element_info)
+            except json.JSONDecodeError:
+                # get_element returned an error message, not JSON
+                return element_info
             
             # Check if the element was found
             if not isinstance(element_data, dict) or not element_data.get("found", False):
                 return element_info  # Return the error message from get_element
-                
-            tag_name = element_data.get("tag_name", "unknown")
-            element_id = element_data.get("id", "unknown")
-            element_class = element_data.get("class", "unknown")
-            xpath = element_data.get("xpath", "")
-            iframe_id = element_data.get("in_iframe_id", "")
-            iframe_name = element_data.get("in_iframe_name", "")
-            
-            # Switch to iframe if needed
-            original_context = True
-            if iframe_id or iframe_name:
-                try:
-                    if iframe_id:
-                        iframe = driver.find_element(By.ID, iframe_id)
-                        driver.switch_to.frame(iframe)
-                    elif iframe_name:
-                        driver.switch_to.frame(iframe_name)
-                    original_context = False
-                except Exception as iframe_e:
-                    return f"Error switching to iframe for setting value: {str(iframe_e)}"
             
-            # Find the element again using the same xpath
-            element = driver.find_element(By.XPATH, xpath)
-            
-        except json.JSONDecodeError:
-            # get_element returned an error message, not JSON
-            return element_info
+            ref = element_data["ref"]
+        
+        # Reuse the WebElement found by the query (switches to its iframe if needed)
+        try:
+            entry, element, original_context = _element_for_ref(driver, ref)
+        except StaleElementRef as e:
+            return f"Error: {str(e)}"
+        tag_name = entry.tag_name
         
         # Check if element is an input-like element that can accept values
         input_like_tags = ['input', 'textarea', 'select']
@@ -1025,7 +813,9 @@ def set_value_to_input_element(text: str = '', class_name: str = '', id: str = '
         if not original_context:
             driver.switch_to.default_content()
         
-        return f"Successfully set value '{input_value}' to {tag_name} element with id='{element_id}', class='{element_class}'. Current value: '{current_value}'"
+        if element_data is None:
+            return f"Successfully set value '{input_value}' to {tag_name} element {ref}. Current value: '{current_value}'"
+        return f"Successfully set value '{input_value}' to {tag_name} element with id='{element_data['id']}', class='{element_data['class']}'. Current value: '{current_value}'"
     
     except Exception as e:
         error_msg = f"Error setting value to element: {str(e)}"
@@ -1038,4 +828,4 @@ def set_value_to_input_element(text: str = '', class_name: str = '', id: str = '
         except:
             pass
             
-        return error_msg
\ No newline at end of file
+        return error_msg
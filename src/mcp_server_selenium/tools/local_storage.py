@@ -7,7 +7,7 @@ logger = logging.getLogger(__name__)
 
 @mcp.tool()
 @auto_recover_stale_window
-def local_storage_add(key: str, string_value: str = '', object_value: dict = {}, create_empty_string: bool = False, create_empty_object: bool = False) -> str:
+def local_storage_add(key: str, string_value: str = '', object_value: dict = {}, create_empty_string: bool = False, create_empty_object: bool = False, session_id: str = '') -> str:
     """Add or update a key-value pair in browser's local storage.
     
     This tool adds a new key-value pair to the browser's localStorage, or updates
@@ -20,12 +20,13 @@ def local_storage_add(key: str, string_value: str = '', object_value: dict = {},
                      When provided, this takes precedence over string_value.
         create_empty_string: Whether to create an empty string value if string_value is empty. Default is False.
         create_empty_object: Whether to create an empty object value if object_value is empty. Default is False.
+        session_id: Browser session to use. Empty uses the default browser; any other value gets its own browser from the session pool.
     
     Returns:
         A message indicating whether the operation was successful.
     """
     try:
-        driver = ensure_driver_initialized()
+        driver = ensure_driver_initialized(session_id)
     except RuntimeError as e:
         return f"Failed to initialize WebDriver: {str(e)}"
     
@@ -67,7 +68,7 @@ def local_storage_add(key: str, string_value: str = '', object_value: dict = {},
 
 @mcp.tool()
 @auto_recover_stale_window
-def local_storage_read(key: str) -> str:
+def local_storage_read(key: str, session_id: str = '') -> str:
     """Read a value from browser's local storage by key.
     
     This tool retrieves the value associated with the specified key from the browser's
@@ -75,12 +76,13 @@ def local_storage_read(key: str) -> str:
     
     Args:
         key: The key name of the local storage item to read.
+        session_id: Browser session to use. Empty uses the default browser; any other value gets its own browser from the session pool.
     
     Returns:
         The value associated with the key, or a message if the key doesn't exist.
     """
     try:
-        driver = ensure_driver_initialized()
+        driver = ensure_driver_initialized(session_id)
     except RuntimeError as e:
         return f"Failed to initialize WebDriver: {str(e)}"
     
@@ -102,7 +104,7 @@ def local_storage_read(key: str) -> str:
 
 @mcp.tool()
 @auto_recover_stale_window
-def local_storage_remove(key: str) -> str:
+def local_storage_remove(key: str, session_id: str = '') -> str:
     """Remove a key-value pair from browser's local storage.
     
     This tool removes the specified key and its associated value from the browser's
@@ -110,12 +112,13 @@ def local_storage_remove(key: str) -> str:
     
     Args:
         key: The key name of the local storage item to remove.
+        session_id: Browser session to use. Empty uses the default browser; any other value gets its own browser from the session pool.
     
     Returns:
         A message indicating whether the operation was successful.
     """
     try:
-        driver = ensure_driver_initialized()
+        driver = ensure_driver_initialized(session_id)
     except RuntimeError as e:
         return f"Failed to initialize WebDriver: {str(e)}"
     
@@ -148,18 +151,21 @@ def local_storage_remove(key: str) -> str:
 
 @mcp.tool()
 @auto_recover_stale_window
-def local_storage_read_all() -> str:
+def local_storage_read_all(session_id: str = '') -> str:
     """Read all key-value pairs from browser's local storage.
     
     This tool retrieves all items from the browser's localStorage and returns
     them as a dictionary. If localStorage is empty, it returns a message indicating
     that no items were found.
     
+    Args:
+        session_id: Browser session to use. Empty uses the default browser; any other value gets its own browser from the session pool.
+    
     Returns:
         A JSON string containing all localStorage items, or a message if localStorage is empty.
     """
     try:
-        driver = ensure_driver_initialized()
+        driver = ensure_driver_initialized(session_id)
     except RuntimeError as e:
         return f"Failed to initialize WebDriver: {str(e)}"
     
@@ -188,17 +194,20 @@ def local_storage_read_all() -> str:
 
 @mcp.tool()
 @auto_recover_stale_window
-def local_storage_remove_all() -> str:
+def local_storage_remove_all(session_id: str = '') -> str:
     """Remove all key-value pairs from browser's local storage.
     
     This tool clears all items from the browser's localStorage. If localStorage
     is already empty, it returns a message indicating that there was nothing to remove.
     
+    Args:
+        session_id: Browser session to use. Empty uses the default browser; any other value gets its own browser from the session pool.
+    
     Returns:
         A message indicating whether the operation was successful.
     """
     try:
-        driver = ensure_driver_initialized()
+        driver = ensure_driver_initialized(session_id)
     except RuntimeError as e:
         return f"Failed to initialize WebDriver: {str(e)}"
     
@@ -1,15 +1,17 @@
 import os
 import json
 import logging
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List
 from urllib.parse import urlparse
 from ..server import mcp, ensure_driver_initialized, auto_recover_stale_window
-from selenium import webdriver
+
+if TYPE_CHECKING:
+    from selenium import webdriver
 
 logger = logging.getLogger(__name__)
 
 
-def get_browser_logs(driver: webdriver.Chrome, log_type='browser'):
+def get_browser_logs(driver: "webdriver.Chrome", log_type='browser'):
     """Get logs from the browser and format them"""
     logs = []
     try:
@@ -35,7 +37,7 @@ def process_performance_log_entry(entry):
         return {}
 
 
-def get_performance_logs(driver: webdriver.Chrome):
+def get_performance_logs(driver: "webdriver.Chrome"):
     """Get raw performance logs from the driver
 
         ### 🔧 Background
@@ -149,7 +151,7 @@ def get_performance_logs(driver: webdriver.Chrome):
         logger.error(f"Error getting raw performance logs: {str(e)}")
         return []
 
-def get_network_logs_from_performance_logs(driver: webdriver.Chrome, filter_url_by_text: str = '', only_errors_log: bool = False) -> List[Dict[str, Any]]:
+def get_network_logs_from_performance_logs(driver: "webdriver.Chrome", filter_url_by_text: str = '', only_errors_log: bool = False) -> List[Dict[str, Any]]:
     """Get network logs using performance logging"""
     if driver is None:
         return []
@@ -228,7 +230,7 @@ def get_network_logs_from_performance_logs(driver: webdriver.Chrome, filter_url_
 
 @mcp.tool()
 @auto_recover_stale_window
-def get_console_logs(log_level: str = "") -> str:
+def get_console_logs(log_level: str = "", session_id: str = '') -> str:
     """Retrieve console logs from the browser with optional filtering by log level.
     
     This tool collects console logs that have been output in the browser's JavaScript console 
@@ -237,12 +239,13 @@ def get_console_logs(log_level: str = "") -> str:
     Args:
         log_level: The log level to filter by (e.g., "INFO", "WARNING", "ERROR", "SEVERE").
             When empty, returns all log levels.
+        session_id: Browser session to use. Empty uses the default browser; any other value gets its own browser from the session pool.
     
     Returns:
         A JSON string containing console log entries, including their type and message.
     """
     try:
-        driver = ensure_driver_initialized()
+        driver = ensure_driver_initialized(session_id)
     except RuntimeError as e:
         return f"Failed to initialize WebDriver: {str(e)}"
     
@@ -263,7 +266,7 @@ def get_console_logs(log_level: str = "") -> str:
 
 @mcp.tool()
 @auto_recover_stale_window
-def get_network_logs(filter_url_by_text: str = '', only_errors_log: bool = False) -> str:
+def get_network_logs(filter_url_by_text: str = '', only_errors_log: bool = False, session_id: str = '') -> str:
     """Retrieve network request logs from the browser.
     
     This tool collects all network activity (requests and responses) that has occurred
@@ -276,6 +279,7 @@ def get_network_logs(filter_url_by_text: str = '', only_errors_log: bool = False
             the network logs can be numerous.
         only_errors_log: When True, only returns network requests with error status codes (4xx/5xx)
             or other network failures. Default is False (returns all network logs).
+        session_id: Browser session to use. Empty uses the default browser; any other value gets its own browser from the session pool.
     
     Returns:
         A JSON string containing the network request logs:
@@ -316,7 +320,7 @@ def get_network_logs(filter_url_by_text: str = '', only_errors_log: bool = False
         * `Network.reportingApiReportAdded`, `Network.reportingApiReportUpdated`, `Network.reportingApiEndpointsChanged`
     """
     try:
-        driver = ensure_driver_initialized()
+        driver = ensure_driver_initialized(session_id)
     except RuntimeError as e:
         return f"Failed to initialize WebDriver: {str(e)}"
     
@@ -331,19 +335,20 @@ def get_network_logs(filter_url_by_text: str = '', only_errors_log: bool = False
 
 @mcp.tool()
 @auto_recover_stale_window
-def get_response(request_id: str) -> str:
+def get_response(request_id: str, session_id: str = '') -> str:
     """Retrieve the full response body for a given network request ID.
     
     Args:
         request_id: The ID of the network request to retrieve the response for.
             It is got from Network.responseReceived event in performance logs
             from get_network_logs tool.
+        session_id: Browser session to use. Empty uses the default browser; any other value gets its own browser from the session pool.
             
     Returns:
         A JSON string containing the response body and metadata, or an error message.
     """
     try:
-        driver = ensure_driver_initialized()
+        driver = ensure_driver_initialized(session_id)
     except RuntimeError as e:
         return f"Failed to initialize WebDriver: {str(e)}"
     
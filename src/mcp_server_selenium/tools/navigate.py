@@ -1,7 +1,5 @@
 import logging
 import time
-from venv import logger
-from selenium.common.exceptions import TimeoutException
 from ..server import mcp, ensure_driver_initialized, auto_recover_stale_window
 
 logger = logging.getLogger(__name__)
@@ -9,7 +7,7 @@ logger = logging.getLogger(__name__)
 
 @mcp.tool()
 @auto_recover_stale_window
-def navigate(url: str, timeout: int = 60) -> str:
+def navigate(url: str, timeout: int = 60, session_id: str = '') -> str:
     """Navigate to a specified URL with the Chrome browser.
     
     This tool navigates the browser to the provided URL. If the URL doesn't start with 
@@ -19,13 +17,16 @@ def navigate(url: str, timeout: int = 60) -> str:
         url: The URL to navigate to. Will add https:// if protocol is missing.
         timeout: Maximum time in seconds to wait for the navigation to complete.
             Default is 60 seconds. If page load takes longer, a network abort/cancel may occur.
+        session_id: Browser session to use. Empty uses the default browser; any other value gets its own browser from the session pool.
     
     Returns:
         A message confirming navigation started or reporting any issues.
     """
+    from selenium.common.exceptions import TimeoutException
+    
     global driver
     try:
-        driver = ensure_driver_initialized()
+        driver = ensure_driver_initialized(session_id)
     except RuntimeError as e:
         raise RuntimeError(str(e))
     
@@ -90,11 +91,11 @@ def navigate(url: str, timeout: int = 60) -> str:
             from .. import server
             
             # Reset the driver instance to force reinitialization
-            server.driver_instance = None
+            server.reset_driver_instance(session_id)
             
             # Attempt to reinitialize the driver
             try:
-                driver = ensure_driver_initialized()
+                driver = ensure_driver_initialized(session_id)
                 logger.info("WebDriver reinitialized successfully")
                 
                 # Try to navigate again
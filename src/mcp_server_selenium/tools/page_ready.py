@@ -7,7 +7,7 @@ logger = logging.getLogger(__name__)
 
 @mcp.tool()
 @auto_recover_stale_window
-def check_page_ready(wait_seconds: int = 0) -> str:
+def check_page_ready(wait_seconds: int = 0, session_id: str = '') -> str:
     """Check if the current page is fully loaded.
     
     This tool checks the document.readyState of the current page to determine if it has
@@ -16,12 +16,13 @@ def check_page_ready(wait_seconds: int = 0) -> str:
     Args:
         wait_seconds: Number of seconds to wait before checking the page's ready state.
             Default is 0 (check immediately).
+        session_id: Browser session to use. Empty uses the default browser; any other value gets its own browser from the session pool.
     
     Returns:
         A message indicating the current ready state of the page (complete, interactive, or loading).
     """
     try:
-        driver = ensure_driver_initialized()
+        driver = ensure_driver_initialized(session_id)
     except RuntimeError as e:
         raise RuntimeError(str(e))
     
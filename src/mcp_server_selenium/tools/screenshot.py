@@ -9,7 +9,7 @@ logger = logging.getLogger(__name__)
 
 @mcp.tool()
 @auto_recover_stale_window
-def take_screenshot(save_path: Optional[str] = None) -> str:
+def take_screenshot(save_path: Optional[str] = None, session_id: str = '') -> str:
     """Take a screenshot of the current browser window.
     
     This tool captures the current visible area of the browser window and saves it
@@ -18,12 +18,13 @@ def take_screenshot(save_path: Optional[str] = None) -> str:
     Args:
         save_path: Optional path where the screenshot should be saved. If not provided,
                   it will save to the current project directory.
+        session_id: Browser session to use. Empty uses the default browser; any other value gets its own browser from the session pool.
     
     Returns:
         The path to the saved screenshot file.
     """
     try:
-        driver = ensure_driver_initialized()
+        driver = ensure_driver_initialized(session_id)
     except RuntimeError as e:
         raise RuntimeError(str(e))
     
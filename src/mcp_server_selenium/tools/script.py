@@ -1,13 +1,13 @@
 import json
 import logging
-from ..server import mcp, ensure_driver_initialized, auto_recover_stale_window
+from ..server import mcp, ensure_driver_initialized, auto_recover_stale_window, get_cdp_session
 
 logger = logging.getLogger(__name__)
 
 
 @mcp.tool()
 @auto_recover_stale_window
-def run_javascript_in_console(javascript_code: str) -> str:
+def run_javascript_in_console(javascript_code: str, session_id: str = '') -> str:
     """Execute JavaScript code in the browser console.
     
     This tool allows you to run JavaScript code directly in the browser console.
@@ -21,6 +21,7 @@ def run_javascript_in_console(javascript_code: str) -> str:
     Args:
         javascript_code: The JavaScript code to execute. Can be single or multiple lines.
                         Use semicolons to separate statements or newlines for better readability.
+        session_id: Browser session to use. Empty uses the default browser; any other value gets its own browser from the session pool.
     
     Returns:
         The result of the JavaScript execution. If the script returns a value,
@@ -28,7 +29,7 @@ def run_javascript_in_console(javascript_code: str) -> str:
         will be returned.
     """
     try:
-        driver = ensure_driver_initialized()
+        driver = ensure_driver_initialized(session_id)
     except RuntimeError as e:
         raise RuntimeError(str(e))
     
@@ -62,7 +63,7 @@ def run_javascript_in_console(javascript_code: str) -> str:
 
 @mcp.tool()
 @auto_recover_stale_window
-def run_javascript_and_get_console_output(javascript_code: str) -> str:
+def run_javascript_and_get_console_output(javascript_code: str, session_id: str = '') -> str:
     """Execute JavaScript code and capture both the return value and console output.
     
     This tool runs JavaScript code and captures any console.log, console.warn, console.error
@@ -70,12 +71,13 @@ def run_javascript_and_get_console_output(javascript_code: str) -> str:
     
     Args:
         javascript_code: The JavaScript code to execute. Can include console.log statements.
+        session_id: Browser session to use. Empty uses the default browser; any other value gets its own browser from the session pool.
     
     Returns:
         A formatted string containing both the execution result and any console output.
     """
     try:
-        driver = ensure_driver_initialized()
+        driver = ensure_driver_initialized(session_id)
     except RuntimeError as e:
         raise RuntimeError(str(e))
     
@@ -133,4 +135,39 @@ def run_javascript_and_get_console_output(javascript_code: str) -> str:
     except Exception as e:
         error_msg = f"Error executing JavaScript: {str(e)}"
         logger.error(error_msg)
-        return error_msg
\ No newline at end of file
+        return error_msg
+
+
+@mcp.tool()
+@auto_recover_stale_window
+def run_cdp_command(method: str, params: str = '{}', session_id: str = '') -> str:
+    """Send a Chrome DevTools Protocol command to the current tab.
+    
+    The command goes over the server's persistent DevTools connection to the
+    browser, not through chromedriver.
+    
+    Args:
+        method: CDP method name, e.g. "Performance.getMetrics" or "Network.getCookies".
+        params: JSON object with the method's parameters. Default is "{}".
+        session_id: Browser session to use. Empty uses the default browser; any other value gets its own browser from the session pool.
+    
+    Returns:
+        The command's result as JSON, or an error message.
+    """
+    try:
+        command_params = json.loads(params or '{}')
+    except json.JSONDecodeError as e:
+        return f"Invalid params JSON: {str(e)}"
+    if not isinstance(command_params, dict):
+        return "params must be a JSON object"
+    
+    logger.info(f"Sending CDP command {method}")
+    
+    try:
+        cdp_session = get_cdp_session(session_id)
+        result = cdp_session.call(method, command_params, timeout=60)
+        return json.dumps(result, indent=2)
+    except Exception as e:
+        error_msg = f"Error running CDP command {method}: {str(e)}"
+        logger.error(error_msg)
+        return error_msg
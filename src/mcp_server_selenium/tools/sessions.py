@@ -0,0 +1,124 @@
+"""
+Session tools for Selenium MCP server.
+
+This module provides tools for inspecting the default browser and its resource
+usage, and for inspecting and closing pooled browser sessions.
+"""
+
+import json
+import logging
+
+import anyio
+
+from .. import server
+from ..resources import resource_governor
+from ..server import mcp, session_pool
+
+logger = logging.getLogger(__name__)
+
+
+@mcp.tool()
+async def get_browser_status() -> str:
+    """Report whether the default browser is ready and how far its launch has progressed.
+
+    With --startup background the server answers before Chrome is up; tools on the
+    default session wait for the launch to finish. Use this tool to check progress
+    without waiting.
+
+    Returns:
+        A JSON string with the launch phase ("not started", "starting",
+        "loading driver", "launching browser", "ready" or "failed"), the error of a failed launch,
+        the elapsed launch time, the time at which each phase was reached, and the
+        state of the standby browser and the profile template.
+    """
+    instance = server.driver_instance
+    status = server.browser_warmup.status()
+    status["browser_started"] = getattr(instance, "driver", None) is not None
+    status["debug_port"] = getattr(instance, "debug_port", None)
+    status["standby"] = server.standby_browser.describe()
+    status["profile_template"] = server.profile_template.describe()
+    return json.dumps(status, indent=2)
+
+
+@mcp.tool()
+def get_browser_resources(session_id: str = '') -> str:
+    """Report the memory and CPU use of a session's Chrome process tree.
+
+    Sums RSS and CPU time over Chrome and all of its child processes (renderers,
+    GPU, utility). With --max-browser-rss / --max-browser-cpu the server recycles
+    the tabs or restarts Chrome, keeping the current URL, when a limit is crossed.
+
+    Args:
+        session_id: Browser session to inspect. Empty inspects the default browser.
+
+    Returns:
+        A JSON string with the process count, RSS in MB, CPU percent since the
+        previous sample, the configured limits and the number of recycles so far.
+    """
+    try:
+        if session_id:
+            session = session_pool.get(session_id)
+            instance = session.driver_instance if session is not None else None
+        else:
+            instance = server.driver_instance
+        if instance is None or getattr(instance, "driver", None) is None:
+            return f"Browser for session '{session_id}' is not started" if session_id else "Default browser is not started"
+        if not hasattr(instance, "request_recycle"):
+            return f"Resource usage is not available for the {server.driver_type} driver"
+        return json.dumps({
+            "usage": resource_governor.sample(instance),
+            "limits": resource_governor.describe(),
+            "recycles": instance.recycles,
+            "last_recycle": instance.last_recycle,
+        }, indent=2)
+    except Exception as e:
+        error_msg = f"Error reading browser resources: {str(e)}"
+        logger.error(error_msg)
+        return error_msg
+
+
+@mcp.tool()
+async def list_sessions() -> str:
+    """List the browser sessions currently held by the session pool.
+
+    Every tool accepts a session_id argument. The default session (empty session_id)
+    is the browser configured on the command line; any other session_id is served by
+    a dedicated browser from the pool, created on first use and closed after it has
+    been idle for the configured timeout.
+
+    Returns:
+        A JSON string with the pool limits and one entry per named session or warm spare.
+    """
+    return json.dumps({
+        "min_size": session_pool.min_size,
+        "max_size": session_pool.max_size,
+        "idle_timeout": session_pool.idle_timeout,
+        "sessions": session_pool.list_sessions(),
+    }, indent=2)
+
+
+@mcp.tool()
+async def close_session(session_id: str) -> str:
+    """Close a named browser session and free its slot in the session pool.
+
+    Runs outside the worker lanes, so it does not wait behind calls on the default
+    browser; it waits only for a call in flight on the session being closed.
+
+    Args:
+        session_id: The session to close. The default session cannot be closed.
+
+    Returns:
+        A message indicating whether the session was closed.
+    """
+    if not session_id:
+        return "Error: The default session cannot be closed"
+
+    try:
+        # Quitting Chrome blocks; keep it off the event loop
+        if await anyio.to_thread.run_sync(session_pool.close, session_id):
+            return f"Session '{session_id}' closed"
+        return f"Session '{session_id}' not found"
+    except Exception as e:
+        error_msg = f"Error closing session '{session_id}': {str(e)}"
+        logger.error(error_msg)
+        return error_msg
@@ -0,0 +1,40 @@
+"""
+Server statistics tools for Selenium MCP server.
+
+This module exposes per-tool latency, error and WebDriver round-trip metrics,
+both as an MCP tool and as a Prometheus endpoint of the HTTP transport.
+"""
+
+import json
+import logging
+
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+
+from ..metrics import metrics
+from ..server import mcp, session_pool, tool_executor
+
+logger = logging.getLogger(__name__)
+
+
+@mcp.tool()
+async def get_server_stats() -> str:
+    """Get performance statistics of this MCP server.
+
+    Reports, per tool, the number of calls, raised errors, stale-window retries,
+    WebDriver HTTP commands and DevTools (CDP) commands issued and p50/p95/p99
+    latency over recent calls, plus the worker lanes and pooled browser sessions.
+
+    Returns:
+        A JSON string with the server statistics.
+    """
+    stats = metrics.snapshot()
+    stats["executor"] = tool_executor.stats()
+    stats["sessions"] = len(session_pool.list_sessions())
+    return json.dumps(stats, indent=2)
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def prometheus_metrics(request: Request) -> PlainTextResponse:
+    """Serve the metrics in Prometheus text format (HTTP transport only)."""
+    return PlainTextResponse(metrics.prometheus_text(), media_type="text/plain; version=0.0.4")
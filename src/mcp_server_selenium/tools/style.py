@@ -7,8 +7,6 @@ This module provides tools for getting style information from web page elements.
 import json
 import logging
 
-from selenium.webdriver.common.by import By
-
 # Import the global mcp instance from the main server module
 from ..server import mcp, ensure_driver_initialized, auto_recover_stale_window
 
@@ -17,7 +15,7 @@ logger = logging.getLogger(__name__)
 
 @mcp.tool()
 @auto_recover_stale_window
-def get_style_an_element(text: str = '', class_name: str = '', id: str = '', attributes: dict = {}, element_type: str = '', in_iframe_id: str = '', in_iframe_name: str = '', return_html: bool = False, xpath: str = '', all_styles: bool = True, computed_style: bool = True) -> str:
+def get_style_an_element(text: str = '', class_name: str = '', id: str = '', attributes: dict = {}, element_type: str = '', in_iframe_id: str = '', in_iframe_name: str = '', return_html: bool = False, xpath: str = '', all_styles: bool = True, computed_style: bool = True, session_id: str = '') -> str:
     """Get style information for an element identified by text content, class name, or ID.
     
     This tool finds an element based on specified criteria and returns its style information. At least one 
@@ -36,13 +34,16 @@ def get_style_an_element(text: str = '', class_name: str = '', id: str = '', att
         xpath: Direct XPath selector to find the element. When provided, other selection criteria are ignored.
         all_styles: When True, return actual styles the browser is applying (whether from inline, CSS file, or defaults) - equivalent to Styles tab in Chrome dev tools.
         computed_style: When True, return computed styles (what Computed tab shows in Chrome dev tool).
+        session_id: Browser session to use. Empty uses the default browser; any other value gets its own browser from the session pool.
     
     Returns:
         A JSON string with style information about the found element or an error message.
         If return_html is True, returns the HTML content of the element.
     """
+    from selenium.webdriver.common.by import By
+    
     try:
-        driver = ensure_driver_initialized()
+        driver = ensure_driver_initialized(session_id)
     except RuntimeError as e:
         return f"Failed to initialize WebDriver: {str(e)}"
     
@@ -0,0 +1,101 @@
+"""Background launch of the default browser.
+
+With ``--startup background`` the MCP server starts answering right away
+while Chrome is launched on a daemon thread. Tools that need the default
+browser wait on the warm-up future; ``get_browser_status`` reports progress.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserWarmup:
+    """Tracks a browser launch running on a background thread."""
+
+    def __init__(self):
+        self.phase = "not started"
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.history: List[dict] = []
+        self.future: Optional[Future] = None
+        self._lock = threading.Lock()
+
+    def set_phase(self, phase: str) -> None:
+        """Record the launch step currently in progress."""
+        with self._lock:
+            self.phase = phase
+            elapsed = time.time() - self.started_at if self.started_at else 0.0
+            self.history.append({"phase": phase, "at_seconds": round(elapsed, 3)})
+        logger.info(f"Browser warm-up: {phase}")
+
+    def start(self, launch: Callable[[], Any]) -> Future:
+        """Run launch() on a daemon thread; the returned future completes when it does."""
+        future: Future = Future()
+        with self._lock:
+            self.future = future
+            self.started_at = time.time()
+            # Cleared so status() counts the elapsed time of this launch, not a previous one
+            self.finished_at = None
+            self.error = None
+            self.history = []
+
+        def run():
+            future.set_running_or_notify_cancel()
+            try:
+                self.set_phase("starting")
+                result = launch()
+                self.set_phase("ready")
+                future.set_result(result)
+            except BaseException as e:
+                self.error = str(e)
+                self.set_phase("failed")
+                logger.error(f"Background browser launch failed: {str(e)}")
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    self.finished_at = time.time()
+
+        threading.Thread(target=run, name="browser-warmup", daemon=True).start()
+        return future
+
+    @property
+    def in_progress(self) -> bool:
+        return self.future is not None and not self.future.done()
+
+    def wait(self, timeout: float) -> None:
+        """Block until a running warm-up has finished.
+
+        Returns immediately when no warm-up was started. A failed warm-up does
+        not raise here; the caller falls back to launching the browser itself.
+
+        Raises:
+            RuntimeError: If the warm-up is still running after timeout seconds.
+        """
+        future = self.future
+        if future is None:
+            return
+        try:
+            future.exception(timeout=timeout)
+        except FutureTimeoutError:
+            raise RuntimeError(
+                f"Browser is still starting (phase: {self.phase}) after waiting {timeout:.0f}s; "
+                f"check get_browser_status and retry"
+            )
+
+    def status(self) -> dict:
+        """Return the warm-up progress as a JSON-serializable dict."""
+        with self._lock:
+            end = self.finished_at or time.time()
+            return {
+                "phase": self.phase,
+                "error": self.error,
+                "elapsed_seconds": round(end - self.started_at, 3) if self.started_at else None,
+                "history": list(self.history),
+            }
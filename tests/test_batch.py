@@ -0,0 +1,39 @@
+"""Tests for run_batch that need no browser."""
+
+import json
+import threading
+
+from mcp_server_selenium import server
+from mcp_server_selenium.tools.batch import run_batch
+
+
+class _FakeDriverInstance:
+    def __init__(self, user_data_dir: str):
+        self.user_data_dir = user_data_dir
+        self.driver = None
+
+    def quit(self) -> None:
+        pass
+
+
+def test_session_tools_are_rejected_as_steps(monkeypatch):
+    monkeypatch.setattr(server.session_pool, "factory", _FakeDriverInstance)
+    result = {}
+
+    def run():
+        result["report"] = run_batch(
+            steps=[{"tool": "close_session"}, {"tool": "list_sessions"}, {"tool": "run_batch"}],
+            stop_on_error=False,
+            session_id="s1",
+        )
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=5)
+    try:
+        assert not thread.is_alive(), "run_batch with a close_session step did not return"
+        report = json.loads(result["report"])
+        assert [step["status"] for step in report] == ["error", "error", "error"]
+        assert all("cannot run as a batch step" in step["error"] for step in report)
+    finally:
+        server.session_pool.close("s1")
@@ -0,0 +1,42 @@
+"""Tests for the tool worker pool."""
+
+import threading
+
+import pytest
+
+from mcp_server_selenium.executor import ToolBusyError, ToolExecutor
+
+
+def test_tool_limit_counts_running_calls_only():
+    executor = ToolExecutor(max_workers=4, tool_limits={"take_screenshot": 1})
+    release = threading.Event()
+    started = threading.Event()
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def screenshot():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        started.set()
+        release.wait(timeout=5)
+        with lock:
+            running[0] -= 1
+        return "ok"
+
+    try:
+        # Queued behind a busy call on its own lane, so it is not running yet
+        busy = executor.submit("a", "navigate", release.wait, 5)
+        queued = executor.submit("a", "take_screenshot", screenshot)
+        first = executor.submit("b", "take_screenshot", screenshot)
+        assert started.wait(timeout=5)
+        with pytest.raises(ToolBusyError):
+            executor.submit("c", "take_screenshot", screenshot)
+        release.set()
+        assert busy.result(timeout=5)
+        assert first.result(timeout=5) == "ok"
+        assert queued.result(timeout=5) == "ok"
+        assert peak[0] == 1
+    finally:
+        release.set()
+        executor.shutdown()
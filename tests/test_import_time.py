@@ -0,0 +1,15 @@
+"""Import-time regression tests for the selenium MCP server.
+
+The time budget is only checked by benchmarks/check_import_time.py; wall-clock
+limits are too noisy for the unit tests.
+
+Run from the project root:
+    python -m pytest tests
+"""
+
+from import_probe import deferred_modules_loaded, measure_once
+
+
+def test_import_does_not_load_deferred_modules():
+    loaded = deferred_modules_loaded(measure_once()["modules"])
+    assert not loaded, f"Imported at startup instead of on first use: {', '.join(loaded)}"
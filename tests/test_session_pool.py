@@ -0,0 +1,44 @@
+"""Tests for the session pool that need no browser."""
+
+import threading
+
+import pytest
+
+from mcp_server_selenium.session_pool import SessionPool
+
+
+class _FakeDriverInstance:
+    def __init__(self, user_data_dir: str):
+        self.user_data_dir = user_data_dir
+        self.driver = None
+        self.quit_called = threading.Event()
+
+    def ensure_driver_initialized(self):
+        return self.driver
+
+    def quit(self) -> None:
+        self.quit_called.set()
+
+
+def test_lookup_does_not_create_sessions():
+    pool = SessionPool(_FakeDriverInstance)
+    with pytest.raises(RuntimeError):
+        pool.lookup("s1")
+    with pool.locked("s1") as session:
+        assert pool.lookup("s1") is session
+    pool.close("s1")
+    with pytest.raises(RuntimeError):
+        pool.lookup("s1")
+    assert pool.get("s1") is None
+
+
+def test_reset_without_spare_quits_dead_browser():
+    pool = SessionPool(_FakeDriverInstance)
+    with pool.locked("s1") as session:
+        dead = session.driver_instance
+        pool.reset("s1")
+        assert session.driver_instance is not dead
+        # The dead browser's cleanup must not touch the new browser's profile
+        assert session.user_data_dir != dead.user_data_dir
+    assert dead.quit_called.wait(timeout=5)
+    pool.close_all()